@@ -0,0 +1,4 @@
+from .cpp_hints import omp_pragma, function_specifier
+from .python_emitter import PythonEmitter, UnsupportedIR
+
+__all__ = ['omp_pragma', 'function_specifier', 'PythonEmitter', 'UnsupportedIR']
@@ -0,0 +1,51 @@
+from typing import Optional
+
+from Frontend.DataStructure import FunctionInfo, LoopDependence, LoopKind, VariableType
+
+
+# IR operator -> OpenMP reduction identifier
+OMP_REDUCTION_SYMBOLS = {
+    'Add': '+',
+    'Mult': '*',
+    'BitOr': '|',
+    'BitAnd': '&',
+    'BitXor': '^',
+}
+
+
+# Types a constexpr function can take and return without heap allocation
+CONSTEXPR_TYPES = {VariableType.INT, VariableType.FLOAT, VariableType.BOOL}
+
+
+def omp_pragma(dependence: Optional[LoopDependence]) -> Optional[str]:
+    """OpenMP pragma for a loop proven safe, or None for sequential loops"""
+    if dependence is None or dependence.kind == LoopKind.SEQUENTIAL:
+        return None
+
+    pragma = "#pragma omp parallel for"
+    by_op = {}
+    for var, op in sorted(dependence.reductions.items()):
+        by_op.setdefault(OMP_REDUCTION_SYMBOLS[op], []).append(var)
+    for symbol, variables in by_op.items():
+        pragma += f" reduction({symbol}:{','.join(variables)})"
+    return pragma
+
+
+def function_specifier(func_info: FunctionInfo, constant_calls=()) -> Optional[str]:
+    """'constexpr' for pure functions over scalar types, or pure functions with
+    no known non-scalar type that a call site in ``constant_calls`` (see
+    ``PurityAnalyzer.constant_calls(..., scalar_only=True)``) invokes with
+    constant arguments, else None"""
+    if not func_info.is_pure or not _maybe_scalar(func_info.return_type):
+        return None
+    param_types = [p.var_type for p in func_info.parameters]
+    if not all(_maybe_scalar(t) for t in param_types):
+        return None
+    typed = func_info.return_type in CONSTEXPR_TYPES and all(t in CONSTEXPR_TYPES for t in param_types)
+    if typed or any(name == func_info.name for name, _ in constant_calls):
+        return "constexpr"
+    return None
+
+
+def _maybe_scalar(var_type) -> bool:
+    return var_type in CONSTEXPR_TYPES or var_type == VariableType.UNKNOWN
@@ -0,0 +1,426 @@
+from Frontend.DataStructure import LoopKind, VariableType
+from Frontend.IR.Ir_nodes import *
+from Frontend.dispatch_visitor import DispatchVisitor
+
+
+BINARY_SYMBOLS = {
+    'Add': '+', 'Sub': '-', 'Mult': '*', 'Div': '/', 'FloorDiv': '//',
+    'Mod': '%', 'Pow': '**', 'LShift': '<<', 'RShift': '>>',
+    'BitOr': '|', 'BitXor': '^', 'BitAnd': '&', 'MatMult': '@',
+}
+
+COMPARE_SYMBOLS = {
+    'Eq': '==', 'NotEq': '!=', 'Lt': '<', 'LtE': '<=', 'Gt': '>', 'GtE': '>=',
+    'Is': 'is', 'IsNot': 'is not', 'In': 'in', 'NotIn': 'not in',
+}
+
+BOOL_SYMBOLS = {'And': 'and', 'Or': 'or'}
+
+UNARY_SYMBOLS = {'UAdd': '+', 'USub': '-', 'Not': 'not ', 'Invert': '~'}
+
+# Starting value of a chunk's partial result
+REDUCTION_IDENTITY = {'Add': 0, 'Mult': 1, 'BitOr': 0, 'BitXor': 0, 'BitAnd': -1}
+
+BITWISE_OPS = {'BitOr', 'BitXor', 'BitAnd'}
+
+
+def reduction_identity(op, var_type):
+    """Identity of op with the accumulator's type, so a partial result keeps it"""
+    identity = REDUCTION_IDENTITY[op]
+    if var_type == VariableType.FLOAT:
+        return float(identity)
+    if var_type == VariableType.BOOL and op in BITWISE_OPS:
+        return bool(identity)
+    return identity
+
+# Memo table used for functions the purity analysis marks memoizable. Only
+# calls whose arguments are immutable values are cached: other objects hash by
+# identity, so a cached result would outlive a mutation of the argument
+MEMO_HELPER = [
+    "_MEMO_KEY_TYPES = (int, float, complex, bool, str, bytes, type(None))",
+    "",
+    "",
+    "def _memo_key(value):",
+    "    if type(value) in (tuple, frozenset):",
+    "        return all(_memo_key(item) for item in value)",
+    "    return type(value) in _MEMO_KEY_TYPES",
+    "",
+    "",
+    "def _memoize(func):",
+    "    table = {}",
+    "",
+    "    @functools.wraps(func)",
+    "    def wrapper(*args, **kwargs):",
+    "        key = (args, tuple(sorted(kwargs.items())))",
+    "        if not _memo_key(key):",
+    "            return func(*args, **kwargs)",
+    "        try:",
+    "            return table[key]",
+    "        except KeyError:",
+    "            result = table[key] = func(*args, **kwargs)",
+    "            return result",
+    "    return wrapper",
+    "",
+    "",
+]
+
+
+class UnsupportedIR(NotImplementedError):
+    """IR the emitter does not model (e.g. a statement IRBuilder lowered to None)"""
+
+
+class PythonEmitter(DispatchVisitor):
+    """Emits Python source from the IR.
+
+    With ``parallel=True``, loops inside functions that the loop dependence
+    analysis proved safe (``loop.dependence``) are split into chunks and run
+    through a ``concurrent.futures`` executor; reductions are computed per
+    chunk and combined in order. Loops writing ``a[i]`` into a shared
+    container stay sequential under process pools, which would write into
+    a pickled copy.
+
+    Given ``functions`` (name -> FunctionInfo), functions the purity
+    analysis marked memoizable are wrapped in a memo table.
+
+    A loop whose body cannot be emitted stays sequential, and a function
+    containing IR the emitter does not model is refused: it is emitted as
+    a stub raising NotImplementedError and listed in ``skipped`` with the
+    reason, rather than emitted with different behaviour. Module-level
+    statements it cannot emit are left out as a comment and listed in
+    ``skipped`` as ``<module statement N>``.
+    """
+
+    dispatch_prefixes = ("visit_", "expr_")
+
+    def __init__(self, parallel=False, executor="ProcessPoolExecutor", functions=None):
+        self.parallel = parallel
+        self.executor = executor
+        # FunctionInfo per name; memoizable ones get a memo table
+        self.functions = functions or {}
+        self.uses_memo = False
+        self.indent = 0
+        self.lines = []
+        self.helpers = []
+        self.current_function = None
+        self.local_names = set()
+        self.loop_count = 0
+        self.in_parallel_helper = False
+        self.uses_executor = False
+        self.skipped = {}  # function name -> why it was not emitted
+
+    def emit(self, module) -> str:
+        """Return Python source for an IRModule"""
+        self.visit(module)
+        imports = []
+        if self.uses_executor:
+            imports += ["import concurrent.futures", "import itertools", "import os"]
+        if self.uses_memo:
+            imports.append("import functools")
+        header = sorted(imports) + ["", ""] if imports else []
+        if self.uses_memo:
+            header += MEMO_HELPER
+        # __future__ imports must stay first
+        future = [line for line in self.lines if line.startswith("from __future__ ")]
+        body = [line for line in self.lines if not line.startswith("from __future__ ")]
+        return "\n".join(future + header + body) + "\n"
+
+    def _p(self, text):
+        self.lines.append("    " * self.indent + text)
+
+    def _block(self, stmts):
+        self.indent += 1
+        if not stmts:
+            self._p("pass")
+        for stmt in stmts:
+            self.visit(stmt)
+        self.indent -= 1
+
+    def generic_visit(self, node):
+        if node is None:
+            raise UnsupportedIR("contains a statement the IR does not model")
+        raise UnsupportedIR(f"contains {node.__class__.__name__}, which the emitter does not model")
+
+    # -------------------------
+    # Module / functions
+    # -------------------------
+    def visit_IRModule(self, node):
+        for i, stmt in enumerate(node.body, 1):
+            size = len(self.lines)
+            try:
+                self.visit(stmt)
+            except UnsupportedIR as e:
+                # Like a refused function: recorded, and the rest of the module is emitted
+                del self.lines[size:]
+                self.indent = 0
+                self.skipped[f"<module statement {i}>"] = str(e)
+                self._p(f"# statement {i} not emitted: {e}")
+
+    def visit_IRFunction(self, node):
+        outer = (self.current_function, self.local_names, self.lines, self.helpers)
+        self.current_function = node.func_name
+        self.local_names = set(node.params) | set(node.kwonly) | self._assigned_names(node.body)
+        self.local_names |= {name for name in (node.vararg, node.kwarg) if name}
+        self.lines, self.helpers = [], []
+
+        func_info = self.functions.get(node.func_name)
+        # The purity analysis does not see what a decorator does
+        memoize = func_info is not None and func_info.is_memoizable and not node.decorators
+        signature = f"def {node.func_name}(*args, **kwargs):"
+        indent = self.indent
+        try:
+            decorators = [f"@{self.expr(d)}" for d in node.decorators]
+            signature = f"def {node.func_name}({self._parameters(node)}):"
+            if memoize:
+                self._p("@_memoize")
+            for decorator in decorators:
+                self._p(decorator)
+            self._p(signature)
+            self._block(node.body)
+            if memoize:
+                self.uses_memo = True
+        except UnsupportedIR as e:
+            self.skipped[node.func_name] = str(e)
+            self.lines, self.helpers, self.indent = [], [], indent
+            self.in_parallel_helper = False
+            self._p(signature)
+            self._p(f"    raise NotImplementedError({f'{node.func_name} {e}'!r})")
+        body, helpers = self.lines, self.helpers
+
+        self.current_function, self.local_names, self.lines, self.helpers = outer
+        if self.lines and self.lines[-1] != "":
+            self.lines.append("")
+        self.lines.extend(helpers)
+        self.lines.extend(body)
+        self.lines.append("")
+
+    def _parameters(self, node):
+        """Parameter list of node with defaults, / and * markers and variadics"""
+        params = list(node.params)
+        first_default = len(params) - len(node.defaults)
+        for i, default in enumerate(node.defaults):
+            params[first_default + i] += f"={self.expr(default)}"
+        if node.posonly:
+            params.insert(node.posonly, "/")
+        if node.vararg:
+            params.append(f"*{node.vararg}")
+        elif node.kwonly:
+            params.append("*")
+        for name in node.kwonly:
+            if name in node.kw_defaults:
+                name += f"={self.expr(node.kw_defaults[name])}"
+            params.append(name)
+        if node.kwarg:
+            params.append(f"**{node.kwarg}")
+        return ", ".join(params)
+
+    def _assigned_names(self, stmts):
+        names = set()
+        stack = list(stmts)
+        while stack:
+            stmt = stack.pop()
+            if isinstance(stmt, (IRAssign, IRAugAssign)):
+                names |= self._bound_names(stmt.target)
+            elif isinstance(stmt, IRFunction):
+                names.add(stmt.func_name)
+            elif isinstance(stmt, IRImport):
+                names |= import_bindings(stmt)
+            elif isinstance(stmt, IRFor):
+                names |= self._bound_names(stmt.target)
+                stack.extend(stmt.body)
+            elif isinstance(stmt, IRIf):
+                stack.extend(stmt.then_body)
+                stack.extend(stmt.else_body)
+        return names
+
+    def _bound_names(self, target):
+        """Names bound by an assignment target, through tuple/list unpacking"""
+        if isinstance(target, IRVar):
+            return {target.name}
+        if isinstance(target, IRStarred):
+            return self._bound_names(target.value)
+        if isinstance(target, (IRTuple, IRList)):
+            return set().union(*(self._bound_names(e) for e in target.elements))
+        return set()
+
+    def _read_names(self, nodes):
+        names = set()
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, IRVar):
+                names.add(node.name)
+            elif isinstance(node, IRnode):
+                for value in vars(node).values():
+                    if isinstance(value, IRnode):
+                        stack.append(value)
+                    elif isinstance(value, list):
+                        stack.extend(value)
+        return names
+
+    # -------------------------
+    # Statements
+    # -------------------------
+    def visit_IRAssign(self, node):
+        self._p(f"{self.expr(node.target)} = {self.expr(node.value)}")
+
+    def visit_IRAugAssign(self, node):
+        self._p(f"{self.expr(node.target)} {BINARY_SYMBOLS[node.op]}= {self.expr(node.value)}")
+
+    def visit_IRExpr(self, node):
+        self._p(self.expr(node.value))
+
+    def visit_IRImport(self, node):
+        names = ", ".join(f"{name} as {asname}" if asname else name for name, asname in node.names)
+        if node.module is None and not node.level:
+            self._p(f"import {names}")
+        else:
+            self._p(f"from {'.' * node.level}{node.module or ''} import {names}")
+
+    def visit_IRGlobal(self, node):
+        self._p(f"global {', '.join(node.names)}")
+
+    def visit_IRReturn(self, node):
+        self._p(f"return {self.expr(node.value)}")
+
+    def visit_IRIf(self, node):
+        self._p(f"if {self.expr(node.test)}:")
+        self._block(node.then_body)
+        if node.else_body:
+            self._p("else:")
+            self._block(node.else_body)
+
+    def visit_IRFor(self, node):
+        dependence = getattr(node, "dependence", None)
+        if (self.parallel and dependence is not None
+                and dependence.kind != LoopKind.SEQUENTIAL
+                and self.current_function is not None
+                and not self.in_parallel_helper
+                and not (dependence.shared_writes and "Process" in self.executor)
+                and all(op in REDUCTION_IDENTITY for op in dependence.reductions.values())):
+            lines, size, helpers, indent = self.lines, len(self.lines), len(self.helpers), self.indent
+            try:
+                self._emit_parallel_for(node, dependence)
+                return
+            except UnsupportedIR:
+                # Not parallelizable after all: drop the partial output, emit it sequentially
+                self.lines, self.indent, self.in_parallel_helper = lines, indent, False
+                del self.lines[size:]
+                del self.helpers[helpers:]
+
+        self._p(f"for {self.expr(node.target)} in {self.expr(node.it)}:")
+        self._block(node.body)
+
+    def _emit_parallel_for(self, node, dependence):
+        self.loop_count += 1
+        self.uses_executor = True
+        n = self.loop_count
+        helper = f"_{self.current_function}_loop{n}"
+        # Every function local the body uses, not only those in the symbol table
+        # (names bound by unpacking are not); the helper would see them as globals
+        loop_locals = self._bound_names(node.target) | dependence.private_vars | set(dependence.reductions)
+        used = self._read_names(node.body) | dependence.shared_reads | dependence.shared_writes
+        shared = sorted((used - loop_locals) & self.local_names)
+        reductions = sorted(dependence.reductions.items())
+
+        # Chunk worker, emitted at module level so process pools can pickle it
+        saved = (self.lines, self.indent)
+        self.lines, self.indent = [], 0
+        self.in_parallel_helper = True
+        self._p(f"def {helper}({', '.join(['_chunk'] + shared)}):")
+        self.indent += 1
+        for var, op in reductions:
+            self._p(f"{var} = {reduction_identity(op, dependence.reduction_types.get(var))!r}")
+        self._p(f"for {self.expr(node.target)} in _chunk:")
+        self._block(node.body)
+        self._p("return (" + "".join(f"{var}, " for var, _ in reductions) + ")")
+        self.indent -= 1
+        self.in_parallel_helper = False
+        self.helpers.extend(self.lines + ["", ""])
+        self.lines, self.indent = saved
+
+        items, step = f"_items{n}", f"_step{n}"
+        self._p(f"{items} = list({self.expr(node.it)})")
+        self._p(f"{step} = max(1, -(-len({items}) // (os.cpu_count() or 1)))")
+        self._p(f"with concurrent.futures.{self.executor}() as _pool:")
+        self.indent += 1
+        args = [f"[{items}[_i:_i + {step}] for _i in range(0, len({items}), {step})]"]
+        args += [f"itertools.repeat({name})" for name in shared]
+        self._p(f"for _part in _pool.map({helper}, {', '.join(args)}):")
+        self.indent += 1
+        if not reductions:
+            self._p("pass")
+        for i, (var, op) in enumerate(reductions):
+            self._p(f"{var} = {var} {BINARY_SYMBOLS[op]} _part[{i}]")
+        self.indent -= 2
+
+    # -------------------------
+    # Expressions
+    # -------------------------
+    def expr(self, node):
+        handler = self._tables["expr_"].get(type(node))
+        if handler is None:
+            handler = self.handler_for(type(node), "expr_", "expr_unknown")
+        return handler(self, node)
+
+    def expr_IRVar(self, node):
+        return node.name
+
+    def expr_IRConst(self, node):
+        return repr(node.value)
+
+    def expr_IRBinary(self, node):
+        return f"({self.expr(node.left)} {BINARY_SYMBOLS[node.op]} {self.expr(node.right)})"
+
+    def expr_IRCompare(self, node):
+        parts = [self.expr(node.left)]
+        for op, comparator in zip(node.ops, node.comparators):
+            parts.append(f"{COMPARE_SYMBOLS[op]} {self.expr(comparator)}")
+        return f"({' '.join(parts)})"
+
+    def expr_IRBoolOp(self, node):
+        return "(" + f" {BOOL_SYMBOLS[node.op]} ".join(self.expr(v) for v in node.values) + ")"
+
+    def expr_IRUnary(self, node):
+        return f"({UNARY_SYMBOLS[node.op]}{self.expr(node.operand)})"
+
+    def expr_IRCall(self, node):
+        args = ", ".join(self.expr(arg) for arg in node.args + node.keywords)
+        return f"{self.expr(node.func)}({args})"
+
+    def expr_IRStarred(self, node):
+        return f"*{self.expr(node.value)}"
+
+    def expr_IRKeyword(self, node):
+        if node.arg is None:
+            return f"**{self.expr(node.value)}"
+        return f"{node.arg}={self.expr(node.value)}"
+
+    def expr_IRAttribute(self, node):
+        value = self.expr(node.value)
+        if isinstance(node.value, IRConst) and isinstance(node.value.value, int):
+            value = f"({value})"  # 3.to_bytes would lex as a float
+        return f"{value}.{node.attr}"
+
+    def expr_IRSubscript(self, node):
+        return f"{self.expr(node.value)}[{self.expr(node.index)}]"
+
+    def expr_IRList(self, node):
+        return "[" + ", ".join(self.expr(e) for e in node.elements) + "]"
+
+    def expr_IRTuple(self, node):
+        return "(" + "".join(f"{self.expr(e)}, " for e in node.elements) + ")"
+
+    def expr_IRSet(self, node):
+        if not node.elements:
+            return "set()"
+        return "{" + ", ".join(self.expr(e) for e in node.elements) + "}"
+
+    def expr_IRDict(self, node):
+        items = ", ".join(f"{self.expr(k)}: {self.expr(v)}" if k is not None else f"**{self.expr(v)}"
+                          for k, v in zip(node.keys, node.values))
+        return "{" + items + "}"
+
+    def expr_unknown(self, node):
+        if node is None:
+            raise UnsupportedIR("contains an expression the IR does not model")
+        raise UnsupportedIR(f"contains {node.__class__.__name__}, which the emitter does not model")
@@ -0,0 +1,9 @@
+from .streaming import StreamingPipeline, FileResult, SymbolSummary
+from .memory_watchdog import MemoryWatchdog, MemoryCeilingExceeded
+from .metrics import MetricsRegistry, MetricsExporter, PipelineMetrics
+
+__all__ = [
+    'StreamingPipeline', 'FileResult', 'SymbolSummary',
+    'MemoryWatchdog', 'MemoryCeilingExceeded',
+    'MetricsRegistry', 'MetricsExporter', 'PipelineMetrics'
+]
@@ -0,0 +1,3 @@
+from .streaming import main
+
+main()
@@ -0,0 +1,62 @@
+import argparse
+import json
+import os
+from typing import Dict, Iterable, Tuple
+
+from Frontend.SemanticAnalyzerComponet.cost_model import costs_to_json, find_regressions
+from .streaming import StreamingPipeline, iter_python_files
+
+
+def collect_costs(paths: Iterable[str]) -> Tuple[Dict[str, dict], Dict[str, str]]:
+    """Cost estimates for every function under paths, keyed ``path::function``
+    with path relative to the directory given (a file given keeps its name),
+    and the error of every file that could not be analyzed"""
+    costs, errors = {}, {}
+    pipeline = StreamingPipeline(cache_size=0)
+    for root in paths:
+        base = root if os.path.isdir(root) else os.path.dirname(root) or os.curdir
+        for result in pipeline.run(iter_python_files([root])):
+            path = os.path.relpath(result.path, base).replace(os.sep, "/")
+            if result.error:
+                errors[path] = result.error
+            for name, cost in costs_to_json(result.costs).items():
+                costs[f"{path}::{name}"] = cost
+    return costs, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate allocations per function and gate on regressions")
+    parser.add_argument("paths", nargs="+", help="files or directories")
+    parser.add_argument("--output", help="write the estimates as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier --output to compare against")
+    parser.add_argument("--metric", action="append",
+                        help="metric to gate on (default: allocations, loop_allocations, param_copies)")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="allowed relative increase before a metric counts as regressed")
+    args = parser.parse_args(argv)
+
+    costs, errors = collect_costs(args.paths)
+    # A file that failed to analyze has no estimates, so it cannot pass the gate
+    for path, error in sorted(errors.items()):
+        print(f"{path}: {error}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(costs, f, indent=2, sort_keys=True)
+
+    if not args.baseline:
+        for name, cost in sorted(costs.items(), key=lambda item: -item[1]["score"]):
+            print(f"{cost['score']:10.0f}  {name}  allocations={cost['allocations']:g}")
+        return 1 if errors else 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    metrics = tuple(args.metric) if args.metric else ("allocations", "loop_allocations", "param_copies")
+    regressions = find_regressions(baseline, costs, metrics, args.tolerance)
+    for name, metric, before, after in regressions:
+        print(f"{name}: {metric} {before:g} -> {after:g}")
+    print(f"{len(regressions)} regressions, {len(errors)} files failed")
+    return 1 if regressions or errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,359 @@
+import argparse
+import ast
+import contextlib
+import copy
+import ctypes
+import io
+import math
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from Frontend.Python_ast import parse_python
+from Frontend.IR.Ir_builder import IRBuilder
+from Frontend.IR.Ir_interpreter import IRCompiler
+from Frontend.IR.Ir_nodes import *
+
+
+# Functions whose argument is a sequence when a parameter is passed to them
+SEQUENCE_BUILTINS = {'len', 'sum', 'min', 'max', 'sorted', 'enumerate', 'reversed', 'list', 'tuple'}
+
+CTYPES_FOR = {int: ctypes.c_longlong, float: ctypes.c_double, bool: ctypes.c_bool}
+
+
+@dataclass
+class Mismatch:
+    """A runner disagreeing with the original Python on one input"""
+    function: str
+    runner: str
+    args: tuple
+    expected: object
+    actual: object
+
+
+@dataclass
+class FunctionComparison:
+    """Outcome of running one function through every runner"""
+    function: str
+    inputs: int
+    timings: Dict[str, float] = field(default_factory=dict)
+    mismatches: List[Mismatch] = field(default_factory=list)
+    skipped: Dict[str, str] = field(default_factory=dict)
+
+    def relative_speed(self, baseline: str = "python") -> Dict[str, float]:
+        """Speed of each runner relative to baseline (>1 is faster)"""
+        base = self.timings.get(baseline)
+        if not base:
+            return {}
+        return {runner: base / seconds for runner, seconds in self.timings.items() if seconds}
+
+
+class CppLibrary:
+    """Local C++ source compiled to a shared library; its ``extern "C"``
+    functions are called through ctypes, so only scalar signatures work.
+    """
+
+    def __init__(self, source: str, compiler: Optional[str] = None, flags: Sequence[str] = ("-O2",)):
+        compiler = compiler or shutil.which("c++") or shutil.which("g++") or shutil.which("clang++")
+        if compiler is None:
+            raise RuntimeError("no C++ compiler found")
+
+        self._dir = tempfile.mkdtemp(prefix="differential-")
+        src_path = os.path.join(self._dir, "module.cpp")
+        lib_path = os.path.join(self._dir, "module.so")
+        with open(src_path, "w") as f:
+            f.write(source)
+        proc = subprocess.run(
+            [compiler, *flags, "-shared", "-fPIC", "-o", lib_path, src_path],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            raise RuntimeError(f"C++ compilation failed:\n{proc.stderr}")
+        self._lib = ctypes.CDLL(lib_path)
+
+    def function(self, symbol: str, argtypes: Sequence = (), restype=ctypes.c_longlong) -> Callable:
+        """ctypes callable for symbol; AttributeError if it is not exported"""
+        func = getattr(self._lib, symbol)
+        func.argtypes = list(argtypes)
+        func.restype = restype
+        return func
+
+    def close(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+def sequence_params(function: IRFunction) -> set:
+    """Parameters the body uses as sequences (iterated, indexed or measured)"""
+    params = set(function.params)
+    found = set()
+    stack = [stmt for stmt in function.body if stmt is not None]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, IRFor) and isinstance(node.it, IRVar):
+            found.add(node.it.name)
+        elif isinstance(node, IRSubscript) and isinstance(node.value, IRVar):
+            found.add(node.value.name)
+        elif isinstance(node, IRAttribute) and isinstance(node.value, IRVar):
+            found.add(node.value.name)
+        elif (isinstance(node, IRCall) and isinstance(node.func, IRVar)
+                and node.func.name in SEQUENCE_BUILTINS):
+            found.update(arg.name for arg in node.args if isinstance(arg, IRVar))
+        for value in vars(node).values():
+            if isinstance(value, IRnode):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(v for v in value if isinstance(v, IRnode))
+    return found & params
+
+
+def generate_inputs(function: IRFunction, count: int, rng: random.Random) -> List[tuple]:
+    """Argument tuples for function: int lists for sequence params, small ints otherwise"""
+    sequences = sequence_params(function)
+    inputs = []
+    for _ in range(count):
+        args = []
+        for param in function.params:
+            if param in sequences:
+                args.append([rng.randint(-50, 50) for _ in range(rng.randint(0, 32))])
+            else:
+                args.append(rng.randint(-5, 20))
+        inputs.append(tuple(args))
+    return inputs
+
+
+def _same(expected, actual) -> bool:
+    if isinstance(expected, float) or isinstance(actual, float):
+        try:
+            return math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-12)
+        except TypeError:
+            return False
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        return (type(expected) is type(actual) and len(expected) == len(actual)
+                and all(_same(e, a) for e, a in zip(expected, actual)))
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(_same(expected[k], actual[k]) for k in expected)
+    return expected == actual
+
+
+def _outcome(func, args):
+    """("ok", result, args after the call, stdout) or ("raise", exception type)"""
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            result = func(*args)
+    except Exception as exc:
+        return ("raise", type(exc).__name__)
+    return ("ok", result, args, output.getvalue())
+
+
+def _same_outcome(expected, actual, compare_args: bool) -> bool:
+    if expected[0] != actual[0]:
+        return False
+    if expected[0] == "raise":
+        return expected[1] == actual[1]
+    return _same(expected[1], actual[1]) and (
+        not compare_args or (_same(expected[2], actual[2]) and expected[3] == actual[3])
+    )
+
+
+class DifferentialHarness:
+    """Runs the original Python, the IR and optional native code on the same inputs.
+
+    Runners, per function:
+      - ``python``: the source executed as-is (the reference)
+      - ``ir``: the IR from IRBuilder, compiled to closures
+      - ``ir+passes``: the same after ``passes`` were applied to a copy of
+        the IR; each pass takes an IRModule and returns one (or None when
+        it edits in place)
+      - ``cpp``: a native callable from ``cpp`` (name -> callable), e.g.
+        from CppLibrary.function, if given
+
+    Results, exception types and (except for cpp) argument mutations and
+    printed output must match the reference. Timings are the best of ``repeat`` runs over all
+    inputs.
+    """
+
+    def __init__(self, source: str, passes: Iterable[Callable] = (), cpp: Optional[Dict[str, Callable]] = None,
+                 count: int = 20, repeat: int = 3, seed: int = 0):
+        self.source = source
+        self.passes = list(passes)
+        self.cpp = cpp or {}
+        self.count = count
+        self.repeat = repeat
+        self.seed = seed
+
+        self.tree = parse_python(source)
+        self.ir = IRBuilder().build(self.tree)
+        self.namespace = {"__name__": "__differential__"}
+        exec(compile(self.tree, "<differential>", "exec"), self.namespace)
+
+        self.runners: Dict[str, Dict[str, Callable]] = {"python": self.namespace}
+        # runner -> function -> why it could not be compiled
+        self.skipped: Dict[str, Dict[str, str]] = {}
+        self.runners["ir"], self.skipped["ir"] = self._compile(self.ir)
+        if self.passes:
+            optimized = copy.deepcopy(self.ir)
+            for ir_pass in self.passes:
+                optimized = ir_pass(optimized) or optimized
+            self.runners["ir+passes"], self.skipped["ir+passes"] = self._compile(optimized)
+
+    def _compile(self, module):
+        """Globals of module compiled one statement at a time, and the
+        functions that failed to compile with the reason; module-level
+        statements that raise are recorded as ``<module statement i>``"""
+        compiler = IRCompiler(self._imported())
+        skipped = {}
+        for i, stmt in enumerate(module.body):
+            if stmt is None:
+                continue
+            try:
+                compiled = compiler.compile_statement(stmt)
+            except NotImplementedError as e:
+                if isinstance(stmt, IRFunction):
+                    skipped[stmt.func_name] = str(e)
+                continue
+            try:
+                compiled([])
+            except Exception as e:
+                # e.g. a call to a function that was skipped above
+                skipped[f"<module statement {i}>"] = f"raised {type(e).__name__}: {e}"
+        return compiler.env, skipped
+
+    def _imported(self) -> Dict[str, object]:
+        """Module-level imports from the reference run, so names of imports
+        the IR cannot compile (relative, star) still resolve"""
+        env = {}
+        for stmt in self.tree.body:
+            if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+                for alias in stmt.names:
+                    name = alias.asname or alias.name.split(".")[0]
+                    if name in self.namespace:
+                        env[name] = self.namespace[name]
+        return env
+
+    def functions(self) -> List[IRFunction]:
+        return [stmt for stmt in self.ir.body if isinstance(stmt, IRFunction)]
+
+    def run(self, names: Optional[Iterable[str]] = None,
+            inputs: Optional[Dict[str, List[tuple]]] = None) -> List[FunctionComparison]:
+        """Compare every (or the named) top-level function; inputs overrides generation"""
+        wanted = set(names) if names is not None else None
+        rng = random.Random(self.seed)
+        results = []
+        for function in self.functions():
+            if wanted is not None and function.func_name not in wanted:
+                continue
+            args_list = (inputs or {}).get(function.func_name) or generate_inputs(function, self.count, rng)
+            results.append(self.compare(function.func_name, args_list))
+        return results
+
+    def compare(self, name: str, args_list: List[tuple]) -> FunctionComparison:
+        comparison = FunctionComparison(function=name, inputs=len(args_list))
+        runners = {runner: env[name] for runner, env in self.runners.items() if name in env}
+        for runner, reasons in self.skipped.items():
+            if name in reasons:
+                runners.pop(runner, None)
+                comparison.skipped[runner] = reasons[name]
+        if name in self.cpp:
+            if all(type(arg) in CTYPES_FOR for args in args_list for arg in args):
+                runners["cpp"] = self.cpp[name]
+            else:
+                comparison.skipped["cpp"] = "non-scalar arguments"
+
+        reference = runners.pop("python")
+        expected = [_outcome(reference, copy.deepcopy(args)) for args in args_list]
+        for runner, func in runners.items():
+            for args, want in zip(args_list, expected):
+                got = _outcome(func, copy.deepcopy(args))
+                if not _same_outcome(want, got, compare_args=runner != "cpp"):
+                    comparison.mismatches.append(Mismatch(
+                        name, runner, args,
+                        want[1] if want[0] == "ok" else want,
+                        got[1] if got[0] == "ok" else got
+                    ))
+
+        comparison.timings["python"] = self._time(reference, args_list)
+        for runner, func in runners.items():
+            comparison.timings[runner] = self._time(func, args_list)
+        return comparison
+
+    def _time(self, func, args_list) -> float:
+        best = None
+        for _ in range(self.repeat):
+            copies = [copy.deepcopy(args) for args in args_list]
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                for args in copies:
+                    try:
+                        func(*args)
+                    except Exception:
+                        pass
+                elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best or 0.0
+
+    @staticmethod
+    def format(results: List[FunctionComparison]) -> str:
+        lines = []
+        for result in results:
+            status = "OK" if not result.mismatches else f"{len(result.mismatches)} MISMATCHES"
+            lines.append(f"{result.function} ({result.inputs} inputs): {status}")
+            speed = result.relative_speed()
+            for runner, seconds in result.timings.items():
+                lines.append(f"  {runner:<10} {seconds * 1000:9.3f} ms  x{speed.get(runner, 0):.2f}")
+            for runner, reason in result.skipped.items():
+                lines.append(f"  {runner:<10} skipped: {reason}")
+            for mismatch in result.mismatches[:5]:
+                lines.append(f"  {mismatch.runner}: args={mismatch.args!r} "
+                             f"expected={mismatch.expected!r} got={mismatch.actual!r}")
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare Python, IR and native runs of a module")
+    parser.add_argument("path", help="Python source file")
+    parser.add_argument("-f", "--function", action="append", help="function to compare (default: all)")
+    parser.add_argument("--count", type=int, default=20, help="generated inputs per function")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cpp", metavar="SOURCE",
+                        help='C++ file exporting extern "C" long long functions of the same names')
+    args = parser.parse_args(argv)
+
+    with open(args.path) as f:
+        source = f.read()
+
+    harness = DifferentialHarness(source, count=args.count, repeat=args.repeat, seed=args.seed)
+    library = None
+    if args.cpp:
+        with open(args.cpp) as f:
+            library = CppLibrary(f.read())
+        for function in harness.functions():
+            try:
+                harness.cpp[function.func_name] = library.function(
+                    function.func_name, [ctypes.c_longlong] * len(function.params)
+                )
+            except AttributeError:
+                pass
+
+    try:
+        results = harness.run(args.function)
+    finally:
+        if library is not None:
+            library.close()
+    for runner, reasons in harness.skipped.items():
+        for what, reason in reasons.items():
+            if what.startswith("<module"):
+                print(f"{runner}: {what} skipped: {reason}")
+    print(DifferentialHarness.format(results))
+    return 1 if any(result.mismatches for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
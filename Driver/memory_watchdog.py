@@ -0,0 +1,70 @@
+import gc
+import os
+import tracemalloc
+from typing import Callable, List
+
+
+class MemoryCeilingExceeded(MemoryError):
+    """Raised when memory stays above the ceiling after every shedding step"""
+
+
+class MemoryWatchdog:
+    """Enforces a memory ceiling by shedding caches before giving up.
+
+    ``source`` is either ``"rss"`` (resident set size of the process, cheap
+    to read) or ``"tracemalloc"`` (bytes currently allocated by Python,
+    exact but slows allocation down while tracing).
+    """
+
+    def __init__(self, limit_bytes: int, source: str = "rss"):
+        if source not in ("rss", "tracemalloc"):
+            raise ValueError(f"unknown memory source: {source}")
+        self.limit_bytes = limit_bytes
+        self.source = source
+        self.shedders: List[Callable[[], None]] = []
+        self.sheds = 0
+        self.peak = 0
+
+        if source == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def add_shedder(self, shed: Callable[[], None]):
+        """Register a step that frees memory; steps run in registration order"""
+        self.shedders.append(shed)
+
+    def current(self) -> int:
+        """Current memory use in bytes"""
+        if self.source == "tracemalloc":
+            return tracemalloc.get_traced_memory()[0]
+        return _current_rss()
+
+    def enforce(self):
+        """Shed until under the ceiling, or raise MemoryCeilingExceeded"""
+        used = self.current()
+        self.peak = max(self.peak, used)
+        if used <= self.limit_bytes:
+            return
+
+        for shed in self.shedders:
+            shed()
+            self.sheds += 1
+            gc.collect()
+            used = self.current()
+            if used <= self.limit_bytes:
+                return
+
+        raise MemoryCeilingExceeded(
+            f"{used} bytes in use after shedding, ceiling is {self.limit_bytes}"
+        )
+
+
+def _current_rss() -> int:
+    """Resident set size in bytes (current on Linux, peak elsewhere)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,389 @@
+import bisect
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds (Prometheus ``le`` bounds)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# SemanticAnalyzer attributes timed per component
+COMPONENTS = (
+    "type_inferencer", "variable_tracker", "function_analyzer", "control_flow_analyzer",
+    "mutation_tracker", "memory_analyzer", "purity_analyzer", "loop_dependence_analyzer",
+    "cost_model",
+)
+
+
+def _label_text(labelnames, labels, extra=""):
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, labels)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic count per label tuple.
+
+    New label tuples are inserted under ``lock`` (the registry's), which
+    exporters hold while iterating; updates of existing ones take no lock.
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), lock=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.lock = lock or threading.RLock()
+        self.values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: tuple = ()):
+        if labels not in self.values:
+            with self.lock:
+                self.values.setdefault(labels, 0.0)
+        self.values[labels] += amount
+
+    def value(self, labels: tuple = ()) -> float:
+        return self.values.get(labels, 0.0)
+
+    def samples(self):
+        for labels, value in sorted(self.values.items()):
+            yield self.name, _label_text(self.labelnames, labels), value
+
+    def snapshot(self):
+        return {",".join(labels): value for labels, value in sorted(self.values.items())}
+
+
+class Gauge(Counter):
+    """Current value per label tuple, or computed by ``callback`` at export"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], Dict[tuple, float]]] = None, lock=None):
+        super().__init__(name, help, labelnames, lock)
+        self.callback = callback
+
+    def set(self, value: float, labels: tuple = ()):
+        if labels not in self.values:
+            with self.lock:
+                self.values[labels] = value
+        else:
+            self.values[labels] = value
+
+    def samples(self):
+        if self.callback is not None:
+            self.values = dict(self.callback())
+        return super().samples()
+
+    def snapshot(self):
+        if self.callback is not None:
+            self.values = dict(self.callback())
+        return super().snapshot()
+
+
+class Histogram:
+    """Fixed-bucket histogram per label tuple.
+
+    ``observe`` is one bisect and three in-place updates; buckets are made
+    cumulative only when exported. New label tuples are inserted under
+    ``lock``, as for ``Counter``.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, lock=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.lock = lock or threading.RLock()
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self.series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, labels: tuple = ()):
+        series = self.series.get(labels)
+        if series is None:
+            with self.lock:
+                series = self.series.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0, 0])
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def quantile(self, q: float, labels: tuple = ()) -> Optional[float]:
+        """Upper bound of the bucket holding quantile q (None when empty)"""
+        series = self.series.get(labels)
+        if not series or not series[2]:
+            return None
+        rank, seen = q * series[2], 0
+        for bound, count in zip(self.buckets + (float("inf"),), series[0]):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def samples(self):
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket", _label_text(self.labelnames, labels, f'le="{le}"'), cumulative
+            yield f"{self.name}_sum", _label_text(self.labelnames, labels), total
+            yield f"{self.name}_count", _label_text(self.labelnames, labels), count
+
+    def snapshot(self):
+        return {
+            ",".join(labels): {
+                "count": count, "sum": total,
+                "p50": self.quantile(0.5, labels), "p95": self.quantile(0.95, labels),
+                "p99": self.quantile(0.99, labels),
+            }
+            for labels, (_, total, count) in sorted(self.series.items())
+        }
+
+
+class MetricsRegistry:
+    """Named metrics, exportable as Prometheus text or a JSON-able snapshot.
+
+    Exports hold ``lock``, which the metrics share for inserting new label
+    tuples, so they can run on another thread than the one recording.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        with self.lock:
+            if metric.name in self.metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()) -> Counter:
+        return self._register(Counter(name, help, labelnames, self.lock))
+
+    def gauge(self, name, help, labelnames=(), callback=None) -> Gauge:
+        return self._register(Gauge(name, help, labelnames, callback, self.lock))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets, self.lock))
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self.lock:
+            for metric in self.metrics.values():
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                for name, labels, value in metric.samples():
+                    lines.append(f"{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+
+class StageClock:
+    """Lap timer: ``lap(stage)`` adds the time since the previous lap to stage"""
+
+    def __init__(self):
+        self.laps: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self.laps[stage] = self.laps.get(stage, 0.0) + now - self._last
+        self._last = now
+
+
+def instrument_components(analyzer, totals: Dict[str, float]):
+    """Time the public methods of each analyzer component into totals.
+
+    Times are inclusive: a component calling another counts both, while
+    re-entering the same component (recursion) is only timed once. Bound
+    methods one component was handed before instrumenting (callbacks such
+    as ``call_resolver``) are replaced with their timed versions.
+    """
+    perf_counter = time.perf_counter
+    active = dict.fromkeys(COMPONENTS, False)
+
+    def wrap(component, method):
+        def timed(*args, **kwargs):
+            if active[component]:
+                return method(*args, **kwargs)
+            active[component] = True
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                active[component] = False
+                totals[component] = totals.get(component, 0.0) + perf_counter() - start
+        return timed
+
+    timed_methods = {}  # (id(instance), method name) -> timed wrapper
+    instances = [analyzer]
+    for component in COMPONENTS:
+        instance = getattr(analyzer, component, None)
+        if instance is None:
+            continue
+        instances.append(instance)
+        for attr in dir(type(instance)):
+            if attr.startswith("_"):
+                continue
+            method = getattr(instance, attr)
+            if callable(method):
+                timed = timed_methods[(id(instance), attr)] = wrap(component, method)
+                setattr(instance, attr, timed)
+
+    for owner in instances:
+        for attr, value in list(vars(owner).items()):
+            if inspect.ismethod(value):
+                timed = timed_methods.get((id(value.__self__), value.__name__))
+                if timed is not None:
+                    setattr(owner, attr, timed)
+
+
+class PipelineMetrics:
+    """Metrics recorded by StreamingPipeline.
+
+    Stage timings are recorded for every file. Per-component timing wraps
+    every component call, so it only runs on one file in
+    ``component_sample`` (0 disables it).
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, prefix: str = "translator",
+                 component_sample: int = 10):
+        self.registry = registry or MetricsRegistry()
+        self.component_sample = component_sample
+        self._analyzed = 0
+        self.started: Optional[float] = None
+        self.in_flight = 0
+        r, p = self.registry, prefix
+
+        self.files = r.counter(f"{p}_files_total", "Files processed by outcome", ("status",))
+        self.stage_seconds = r.histogram(f"{p}_stage_seconds", "Per-file time in each pipeline stage", ("stage",))
+        self.component_seconds = r.histogram(
+            f"{p}_component_seconds", "Per-file time in each semantic component (inclusive)", ("component",)
+        )
+        self.cache = r.counter(f"{p}_cache_requests_total", "Cache lookups by cache and result",
+                               ("cache", "result"))
+        self.busy_seconds = r.counter(f"{p}_worker_busy_seconds_total", "Time spent inside pipeline stages")
+        self.sources = []  # (cache name, object with cache_hits / cache_misses)
+
+        r.gauge(f"{p}_cache_hit_ratio", "Hits over lookups per cache", ("cache",), self._hit_ratios)
+        r.gauge(f"{p}_worker_utilization", "Busy time over wall time since the run started",
+                callback=lambda: {(): self.utilization()})
+        r.gauge(f"{p}_queue_depth", "Items between pipeline stages", ("queue",),
+                lambda: {("in_flight",): self.in_flight})
+
+    def sample_components(self) -> bool:
+        """Whether the next analyzed file gets per-component timing"""
+        self._analyzed += 1
+        return bool(self.component_sample) and self._analyzed % self.component_sample == 1 % self.component_sample
+
+    def start(self):
+        if self.started is None:
+            self.started = time.perf_counter()
+
+    def utilization(self) -> float:
+        if self.started is None:
+            return 0.0
+        elapsed = time.perf_counter() - self.started
+        return min(1.0, self.busy_seconds.value() / elapsed) if elapsed > 0 else 0.0
+
+    def add_cache_source(self, name: str, source):
+        """Export hits/misses of an object keeping ``cache_hits`` / ``cache_misses``"""
+        self.sources.append((name, source))
+
+    def _cache_counts(self) -> Dict[str, Tuple[float, float]]:
+        counts = {}
+        for (cache, result), value in self.cache.values.items():
+            hits, misses = counts.get(cache, (0.0, 0.0))
+            counts[cache] = (hits + value, misses) if result == "hit" else (hits, misses + value)
+        for name, source in self.sources:
+            counts[name] = (source.cache_hits, source.cache_misses)
+        return counts
+
+    def _hit_ratios(self):
+        return {
+            (cache,): hits / (hits + misses)
+            for cache, (hits, misses) in self._cache_counts().items() if hits + misses
+        }
+
+    def cache_lookup(self, cache: str, hit: bool):
+        self.cache.inc(1.0, (cache, "hit" if hit else "miss"))
+
+    def record_laps(self, laps: Dict[str, float]):
+        busy = 0.0
+        for stage, seconds in laps.items():
+            self.stage_seconds.observe(seconds, (stage,))
+            busy += seconds
+        self.busy_seconds.inc(busy)
+
+    def record_components(self, totals: Dict[str, float]):
+        for component, seconds in totals.items():
+            self.component_seconds.observe(seconds, (component,))
+
+    def record_file(self, status: str):
+        self.files.inc(1.0, (status,))
+
+
+class MetricsExporter:
+    """Writes ``metrics.prom`` (replaced atomically) and appends a JSON line to
+    ``metrics.jsonl`` every ``interval`` seconds from a daemon thread.
+
+        with MetricsExporter(registry, "out/metrics", interval=15):
+            run_batch()
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str, interval: float = 15.0):
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread and write a final snapshot"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except Exception:
+                # One failed export must not end the exporter
+                logger.exception("writing metrics to %s failed", self.directory)
+
+    def write(self):
+        prom_path = os.path.join(self.directory, "metrics.prom")
+        with open(prom_path + ".tmp", "w") as f:
+            f.write(self.registry.to_prometheus())
+        os.replace(prom_path + ".tmp", prom_path)
+
+        snapshot = {"timestamp": time.time(), "metrics": self.registry.snapshot()}
+        with open(os.path.join(self.directory, "metrics.jsonl"), "a") as f:
+            f.write(json.dumps(snapshot) + "\n")
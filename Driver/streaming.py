@@ -0,0 +1,401 @@
+import argparse
+import ast
+import contextlib
+import copy
+import hashlib
+import io
+import json
+import os
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from Frontend.DataStructure import FunctionInfo, TypeConstraint, VariableInfo, VariableType
+from Frontend.Python_ast import parse_python
+from Frontend.SemanticAnalyzerComponet import SemanticAnalyzer
+from Frontend.SemanticAnalyzerComponet.cost_model import FunctionCost
+from Frontend.IR.Ir_builder import IRBuilder
+from Frontend.IR.Ir_printer import IRPrinter
+from Frontend.Profile import ProfileData, load_profiles, profile_for
+from .memory_watchdog import MemoryWatchdog
+from .metrics import MetricsExporter, PipelineMetrics, StageClock, instrument_components
+
+
+@dataclass
+class SymbolSummary:
+    """Compact stand-in for VariableInfo when usage lists are not kept"""
+    name: str
+    var_type: VariableType
+    scope: str
+    memory_effect: Optional[str] = None
+    usage_count: int = 0
+    first_use: Optional[int] = None
+    last_use: Optional[int] = None
+
+
+@dataclass
+class FileResult:
+    """What is kept per file once its outputs have been flushed"""
+    path: str
+    functions: Dict[str, FunctionInfo] = field(default_factory=dict)
+    symbols: Dict[str, Union[VariableInfo, SymbolSummary]] = field(default_factory=dict)
+    type_constraints: Union[List[TypeConstraint], Dict[Tuple[str, str], int]] = field(default_factory=list)
+    summarized: bool = False
+    cached: bool = False
+    error: Optional[str] = None
+    ir: object = None
+    costs: Dict[str, FunctionCost] = field(default_factory=dict)
+
+
+@dataclass
+class _Analyzed:
+    path: str
+    key: str
+    analyzer: SemanticAnalyzer
+    ir: object
+    clock: StageClock = None
+    components: Optional[Dict[str, float]] = None
+
+
+def summarize_symbols(symbol_table: Dict[str, VariableInfo]) -> Dict[str, SymbolSummary]:
+    """Replace per-line usage lists with counts and first/last lines"""
+    summaries = {}
+    for var_name, var_info in symbol_table.items():
+        memory_effect = getattr(var_info, "memory_effect", None)
+        lines = var_info.usage_lines
+        summaries[var_name] = SymbolSummary(
+            name=var_name,
+            var_type=var_info.var_type,
+            scope=var_info.scope,
+            memory_effect=memory_effect.value if memory_effect else None,
+            usage_count=len(lines),
+            first_use=min(lines) if lines else None,
+            last_use=max(lines) if lines else None
+        )
+    return summaries
+
+
+def summarize_constraints(type_constraints: List[TypeConstraint]) -> Dict[Tuple[str, str], int]:
+    """Count constraints per (variable, type) instead of keeping each one"""
+    return dict(Counter((c.variable, c.constraint_type.value) for c in type_constraints))
+
+
+class StreamingPipeline:
+    """Processes a corpus one file at a time with bounded memory.
+
+    Each file goes through read -> parse/analyze/IR -> flush as a chain of
+    generators. The AST is dropped as soon as the IR and semantic facts
+    exist, outputs are written and released before the next file is read,
+    and only a ``FileResult`` is handed back to the caller.
+
+    With a ``symbol_db`` (see ``Frontend.symbol_database``) calls into other
+    indexed modules are resolved while analyzing.
+
+    With ``profiles`` (source path -> ``ProfileData``, see
+    ``Frontend.Profile``) the loop analyses only run on the functions
+    covering ``hot_coverage`` of each file's profiled weight; memory
+    effects and purity still cover every scope.
+
+    With ``metrics`` (a ``PipelineMetrics``) per-stage and per-component
+    latencies, outcomes, cache hit rates, utilization and queue depth are
+    recorded; export them with ``MetricsExporter``.
+
+    Reports of identical sources are cached (``cache_size`` entries; with a
+    ``symbol_db`` only for the same module and database state); with a
+    ``memory_limit`` the watchdog first drops that cache, then switches to
+    summarized results, before raising ``MemoryCeilingExceeded``.
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, summarize: bool = False,
+                 memory_limit: Optional[int] = None, memory_source: str = "rss",
+                 cache_size: int = 128, dump_ast: bool = False, keep_ir: bool = False,
+                 symbol_db=None, profiles: Optional[Dict[str, ProfileData]] = None,
+                 hot_coverage: float = 0.9, metrics: Optional[PipelineMetrics] = None):
+        self.output_dir = output_dir
+        self.summarize = summarize
+        self.cache_size = cache_size
+        self.dump_ast = dump_ast
+        self.keep_ir = keep_ir
+        self.symbol_db = symbol_db
+        self.profiles = profiles or {}
+        self.hot_coverage = hot_coverage
+        self.metrics = metrics
+        if metrics is not None and symbol_db is not None:
+            metrics.add_cache_source("symbol_db", symbol_db)
+        self._cache: "OrderedDict[str, Tuple[str, str, FileResult]]" = OrderedDict()
+
+        self.watchdog = None
+        if memory_limit is not None:
+            self.watchdog = MemoryWatchdog(memory_limit, memory_source)
+            self.watchdog.add_shedder(self.clear_cache)
+            self.watchdog.add_shedder(self._enable_summaries)
+
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    def clear_cache(self):
+        """Drop cached reports"""
+        self._cache.clear()
+
+    def _enable_summaries(self):
+        self.summarize = True
+
+    # PUBLIC API
+    def run(self, paths: Iterable[str]) -> Iterator[FileResult]:
+        """Process paths lazily, yielding one FileResult per file"""
+        if self.metrics is not None:
+            self.metrics.start()
+        for result in self._flush(self._analyze(self._read(paths))):
+            yield result
+            if self.watchdog:
+                self.watchdog.enforce()
+
+    # -------------------------
+    # Stages
+    # -------------------------
+    def _read(self, paths):
+        for path in paths:
+            clock = StageClock()
+            try:
+                with open(path, "r") as f:
+                    code = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                yield self._failed(FileResult(path=path, error=f"{type(e).__name__}: {e}"), clock)
+                continue
+            clock.lap("read")
+            if self.metrics is not None:
+                self.metrics.in_flight += 1
+            yield path, code, clock
+            del code
+
+    def _analyze(self, sources):
+        for source in sources:
+            if isinstance(source, FileResult):
+                yield source
+                continue
+
+            path, code, clock = source
+            profile = profile_for(self.profiles, path)
+            module = self.symbol_db.module_for_path(path) if self.symbol_db is not None else None
+            key = hashlib.sha1(code.encode()).hexdigest()
+            if profile is not None:
+                key += hashlib.sha1(json.dumps(profile.to_json()).encode()).hexdigest()
+            if self.symbol_db is not None:
+                # Resolved calls depend on the module and on what the database holds
+                key += f":{module}:{path.endswith('__init__.py')}:{self.symbol_db.generation}"
+            hit = key in self._cache
+            if self.metrics is not None:
+                self.metrics.cache_lookup("report", hit)
+            if hit:
+                self._cache.move_to_end(key)
+                yield _Analyzed(path, key, None, None, clock)
+                continue
+
+            try:
+                item = self._analyze_file(path, key, code, profile, module, clock)
+            except Exception as e:
+                # One bad file must not end a corpus run
+                item = self._failed(FileResult(path=path, error=f"{type(e).__name__}: {e}"),
+                                    clock, in_flight=True)
+            del source, code
+            yield item
+            # Nothing of this file stays referenced while the watchdog runs
+            del item
+
+    def _analyze_file(self, path, key, code, profile, module, clock) -> _Analyzed:
+        tree = parse_python(code)
+        clock.lap("parse")
+
+        if self.dump_ast:
+            self._write(path, "ast.txt", ast.dump(tree, indent=4))
+            clock.lap("output")
+
+        if self.symbol_db is not None:
+            analyzer = SemanticAnalyzer(self.symbol_db, module, path.endswith("__init__.py"))
+        else:
+            analyzer = SemanticAnalyzer()
+        components = None
+        if self.metrics is not None and self.metrics.sample_components():
+            components = {}
+            instrument_components(analyzer, components)
+        clock.lap("semantic")
+
+        analyzer.visit(tree)
+        if profile is not None:
+            analyzer.apply_profile(profile, self.hot_coverage)
+        clock.lap("semantic")
+        analyzer.analyze_memory_effects()
+        clock.lap("memory")
+        analyzer.analyze_purity()
+        clock.lap("purity")
+        ir = IRBuilder().build(tree)
+        del tree
+        clock.lap("ir_build")
+        analyzer.analyze_loops(ir)
+        clock.lap("loops")
+        analyzer.analyze_costs(ir)
+        clock.lap("costs")
+
+        return _Analyzed(path, key, analyzer, ir, clock, components)
+
+    def _flush(self, items):
+        for item in items:
+            if isinstance(item, FileResult):
+                yield item
+                continue
+
+            try:
+                result = self._flush_item(item)
+            except Exception as e:
+                result = self._failed(FileResult(path=item.path, error=f"{type(e).__name__}: {e}"),
+                                      item.clock, in_flight=True)
+            del item
+            yield result
+            del result
+
+    def _flush_item(self, item) -> FileResult:
+        if item.analyzer is None:
+            report, ir_text, cached = self._cache[item.key]
+            self._write(item.path, "report.txt", report)
+            self._write(item.path, "ir.txt", ir_text)
+            item.clock.lap("output")
+            self._record(item.clock, None, "cached")
+            # Callers may mutate results; never hand out the cached objects
+            return replace(
+                cached, path=item.path, cached=True,
+                functions=copy.deepcopy(cached.functions),
+                symbols=copy.deepcopy(cached.symbols),
+                type_constraints=copy.deepcopy(cached.type_constraints),
+                costs=copy.deepcopy(cached.costs)
+            )
+
+        analyzer = item.analyzer
+        report = analyzer.generate_report()
+        ir_text = self._render_ir(item.ir)
+        self._write(item.path, "report.txt", report)
+        self._write(item.path, "ir.txt", ir_text)
+
+        if self.summarize:
+            result = FileResult(
+                path=item.path,
+                functions=analyzer.functions,
+                symbols=summarize_symbols(analyzer.symbol_table),
+                type_constraints=summarize_constraints(analyzer.type_constraints),
+                summarized=True
+            )
+        else:
+            result = FileResult(
+                path=item.path,
+                functions=analyzer.functions,
+                symbols=analyzer.symbol_table,
+                type_constraints=analyzer.type_constraints
+            )
+        result.costs = dict(analyzer.function_costs)
+        if self.keep_ir:
+            result.ir = item.ir
+
+        if self.cache_size > 0:
+            self._cache[item.key] = (report, ir_text, result)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        item.clock.lap("output")
+        self._record(item.clock, item.components, "ok")
+        return result
+
+    def _failed(self, result: FileResult, clock: StageClock, in_flight: bool = False) -> FileResult:
+        if self.metrics is not None:
+            if in_flight:
+                self.metrics.in_flight -= 1
+            self.metrics.record_laps(clock.laps)
+            self.metrics.record_file("error")
+        return result
+
+    def _record(self, clock, components, status):
+        if self.metrics is None:
+            return
+        self.metrics.in_flight -= 1
+        self.metrics.record_laps(clock.laps)
+        if components:
+            self.metrics.record_components(components)
+        self.metrics.record_file(status)
+
+    # -------------------------
+    # Output
+    # -------------------------
+    def _render_ir(self, ir):
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            IRPrinter().visit(ir)
+        return buffer.getvalue()
+
+    def _write(self, path, suffix, text):
+        if not self.output_dir:
+            return
+        name = os.path.normpath(path).lstrip(os.sep).replace(os.sep, "__")
+        with open(os.path.join(self.output_dir, f"{name}.{suffix}"), "w") as f:
+            f.write(text)
+
+
+def iter_python_files(paths: Iterable[str]) -> Iterator[str]:
+    """Expand directories into the .py files below them, lazily"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(".py"):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a Python corpus through the analyzer")
+    parser.add_argument("paths", nargs="+", help="files or directories")
+    parser.add_argument("--out", help="directory for per-file reports and IR")
+    parser.add_argument("--summarize", action="store_true",
+                        help="keep usage/constraint summaries instead of full lists")
+    parser.add_argument("--memory-limit", type=int, metavar="MB", help="memory ceiling")
+    parser.add_argument("--memory-source", choices=["rss", "tracemalloc"], default="rss")
+    parser.add_argument("--dump-ast", action="store_true", help="also write ast.dump per file")
+    parser.add_argument("--profile", action="append", default=[],
+                        help="cProfile dump, saved profile JSON or line-hit file (repeatable)")
+    parser.add_argument("--hot-coverage", type=float, default=0.9,
+                        help="share of profiled weight whose functions get the full analysis")
+    parser.add_argument("--metrics-dir", help="write metrics.prom and metrics.jsonl here")
+    parser.add_argument("--metrics-interval", type=float, default=15.0, metavar="SECONDS",
+                        help="how often metrics are exported")
+    args = parser.parse_args(argv)
+
+    profiles = {}
+    for path in args.profile:
+        profiles.update(load_profiles(path))
+
+    pipeline = StreamingPipeline(
+        output_dir=args.out,
+        summarize=args.summarize,
+        memory_limit=args.memory_limit * 1024 * 1024 if args.memory_limit else None,
+        memory_source=args.memory_source,
+        dump_ast=args.dump_ast,
+        profiles=profiles,
+        hot_coverage=args.hot_coverage,
+        metrics=PipelineMetrics() if args.metrics_dir else None
+    )
+
+    exporter = None
+    if args.metrics_dir:
+        exporter = MetricsExporter(pipeline.metrics.registry, args.metrics_dir, args.metrics_interval)
+        exporter.start()
+
+    processed = failed = 0
+    try:
+        for result in pipeline.run(iter_python_files(args.paths)):
+            processed += 1
+            if result.error:
+                failed += 1
+                print(f"{result.path}: {result.error}")
+    finally:
+        if exporter is not None:
+            exporter.stop()
+    print(f"{processed} files processed, {failed} failed")
@@ -2,12 +2,18 @@
 class ReportGenerator:
     """Generates human-readable reports"""
     
-    def __init__(self, symbol_table, functions, aliases, mutated_vars, type_constraints):
+    def __init__(self, symbol_table, functions, aliases, mutated_vars, type_constraints,
+                 loop_dependences=None, purity_reasons=None, hot_functions=None,
+                 function_costs=None):
         self.symbol_table = symbol_table
         self.functions = functions
         self.aliases = aliases
         self.mutated_vars = mutated_vars
         self.type_constraints = type_constraints
+        self.loop_dependences = loop_dependences if loop_dependences is not None else []
+        self.purity_reasons = purity_reasons if purity_reasons is not None else {}
+        self.hot_functions = hot_functions if hot_functions is not None else []
+        self.function_costs = function_costs if function_costs is not None else {}
     
     def generate_report(self) -> str:
         """Generate complete analysis report"""
@@ -19,6 +25,12 @@ class ReportGenerator:
         lines.extend(self._generate_functions_section())
         lines.extend(self._generate_aliasing_section())
         lines.extend(self._generate_mutations_section())
+        if self.loop_dependences:
+            lines.extend(self._generate_loops_section())
+        if self.hot_functions:
+            lines.extend(self._generate_hot_functions_section())
+        if self.function_costs:
+            lines.extend(self._generate_cost_section())
         
         lines.append("\n" + "="*70)
         return "\n".join(lines)
@@ -58,6 +70,12 @@ class ReportGenerator:
                 lines.append(f"  Modifies: {func_info.modifies_params}")
             if func_info.calls_functions:
                 lines.append(f"  Calls: {func_info.calls_functions}")
+            if func_info.is_pure is not None:
+                lines.append(f"  Pure: {func_info.is_pure}")
+                if func_name in self.purity_reasons:
+                    lines.append(f"  Side Effect: {self.purity_reasons[func_name]}")
+                if func_info.is_memoizable:
+                    lines.append(f"  Memoizable: True")
         
         return lines
     
@@ -86,4 +104,62 @@ class ReportGenerator:
         else:
             lines.append("  None detected")
         
-        return lines
\ No newline at end of file
+        return lines
+    
+    def _generate_loops_section(self):
+        """Generate loop parallelism section"""
+        lines = ["\n\n🔁 LOOPS", "-"*70]
+        
+        for loop, dependence in self.loop_dependences:
+            target = getattr(loop.target, "name", "?")
+            lines.append(f"\nLoop: for {target} (line {loop.lineno})")
+            lines.append(f"  Kind: {dependence.kind.value}")
+            if dependence.reductions:
+                reductions = ", ".join(f"{var} ({op})" for var, op in sorted(dependence.reductions.items()))
+                lines.append(f"  Reductions: {reductions}")
+            if dependence.private_vars:
+                lines.append(f"  Private: {sorted(dependence.private_vars)}")
+            if dependence.reason:
+                lines.append(f"  Reason: {dependence.reason}")
+            for call in dependence.hoistable_calls:
+                lines.append(f"  Hoistable call: {call.func.name}(...) at line {call.lineno}")
+        
+        return lines
+    
+    def _generate_hot_functions_section(self):
+        """Generate profile hotness section"""
+        lines = ["\n\n🔥 HOT FUNCTIONS", "-"*70]
+        
+        for prof in self.hot_functions:
+            lines.append(f"\nFunction: {prof.name}")
+            if prof.calls:
+                lines.append(f"  Calls: {prof.calls}")
+            if prof.time:
+                lines.append(f"  Own Time: {prof.time * 1000:.3f} ms")
+            if prof.line_hits:
+                lines.append(f"  Line Hits: {prof.line_hits}")
+            scope = f"function:{prof.name}"
+            for var_name, var_info in self.symbol_table.items():
+                memory_effect = getattr(var_info, 'memory_effect', None)
+                if var_info.scope == scope and memory_effect:
+                    lines.append(f"  {var_name}: {memory_effect.value}")
+        
+        return lines
+    
+    def _generate_cost_section(self):
+        """Generate estimated cost hotspot section"""
+        lines = ["\n\n💰 COST HOTSPOTS", "-"*70]
+        
+        ranked = sorted(self.function_costs.values(), key=lambda cost: (-cost.score, cost.name))
+        for rank, cost in enumerate(ranked, 1):
+            lines.append(f"\n{rank}. {cost.name} (score {cost.score:.0f})")
+            lines.append(f"  Allocations: {cost.allocations:g} ({cost.loop_allocations:g} in loops)")
+            if cost.refcount_ops:
+                lines.append(f"  Refcount Ops: {cost.refcount_ops:g}")
+            if cost.param_copies:
+                lines.append(f"  Parameter Copies: {cost.param_copies}")
+            lines.append(f"  Work: {cost.work:g} (max loop depth {cost.max_loop_depth})")
+            for line, what, weight in cost.sites[:3]:
+                lines.append(f"  Site: {what} at line {line} (x{weight:g})")
+        
+        return lines
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Set, Optional
+from typing import Dict, List, Set, Optional
 from enum import Enum
 
 class VariableType(Enum):
@@ -23,6 +23,11 @@ class MemoryEffect(Enum):
     HEAP_GC = "heap_gc"          
     REFERENCE = "reference"
 
+class LoopKind(Enum):
+    PARALLEL = "parallel"
+    PARALLEL_REDUCTION = "parallel_reduction"
+    SEQUENTIAL = "sequential"
+
 @dataclass
 class VariableInfo:
  
@@ -47,10 +52,30 @@ class FunctionInfo:
     modifies_params: Set[str] = field(default_factory=set) 
     has_side_effects: bool = False
     calls_functions: List[str] = field(default_factory=list)
+    is_pure: Optional[bool] = None  # None until purity analysis has run
+    is_memoizable: bool = False
+    local_names: Set[str] = field(default_factory=set)
+    global_names: Set[str] = field(default_factory=set)  # declared global/nonlocal
+    mutated_names: Set[str] = field(default_factory=set)  # mutated in place or rebound global
+    impure_calls: List[str] = field(default_factory=list)
+    read_names: Set[str] = field(default_factory=set)  # every name loaded in the body
+    borrowed_names: Set[str] = field(default_factory=set)  # locals bound to objects it did not create
+    global_reads: Set[str] = field(default_factory=set)  # non-constant globals read, callees included
 
 @dataclass
 class TypeConstraint:
     variable: str
     constraint_type: VariableType
     reason: str  
-    confidence: float = 1.0 
\ No newline at end of file
+    confidence: float = 1.0
+
+@dataclass
+class LoopDependence:
+    kind: LoopKind
+    reductions: Dict[str, str] = field(default_factory=dict)  # variable -> IR op name
+    reduction_types: Dict[str, VariableType] = field(default_factory=dict)  # INT / FLOAT / BOOL
+    private_vars: Set[str] = field(default_factory=set)
+    shared_reads: Set[str] = field(default_factory=set)
+    shared_writes: Set[str] = field(default_factory=set)  # containers written as name[i]
+    hoistable_calls: List = field(default_factory=list)  # loop-invariant pure IRCall nodes
+    reason: Optional[str] = None
@@ -1,24 +1,63 @@
-import ast
 from Frontend.IR.Ir_nodes import *
-class IRBuilder(ast.NodeVisitor):
+from Frontend.dispatch_visitor import ASTDispatchVisitor
+class IRBuilder(ASTDispatchVisitor):
 
     def build(self, tree):
         return self.visit(tree)
+
+    def visit(self, node):
+        ir = super().visit(node)
+        if isinstance(ir, IRnode) and hasattr(node, "lineno"):
+            ir.lineno = node.lineno
+            ir.end_lineno = node.end_lineno
+            ir.col_offset = node.col_offset
+            ir.end_col_offset = node.end_col_offset
+        return ir
     
     def visit_Module(self, node):
         body = [self.visit(stmt) for stmt in node.body]
         return IRModule(body)
 
     def visit_FunctionDef(self, node):
-        params = [arg.arg for arg in node.args.args]
+        args = node.args
+        params = [arg.arg for arg in args.posonlyargs + args.args]
         body = [self.visit(stmt) for stmt in node.body]
-        return IRFunction(node.name, params, body)
+        return IRFunction(
+            node.name, params, body,
+            defaults=[self.visit(d) for d in args.defaults],
+            vararg=args.vararg.arg if args.vararg else None,
+            kwonly=[arg.arg for arg in args.kwonlyargs],
+            kw_defaults={arg.arg: self.visit(d) for arg, d in zip(args.kwonlyargs, args.kw_defaults)
+                         if d is not None},
+            kwarg=args.kwarg.arg if args.kwarg else None,
+            posonly=len(args.posonlyargs),
+            decorators=[self.visit(d) for d in node.decorator_list]
+        )
 
     def visit_Assign(self, node):
         target = self.visit(node.targets[0])
         value = self.visit(node.value)
         return IRAssign(target, value)
 
+    def visit_AugAssign(self, node):
+        target = self.visit(node.target)
+        value = self.visit(node.value)
+        op = type(node.op).__name__
+        return IRAugAssign(op, target, value)
+
+    def visit_Expr(self, node):
+        return IRExpr(self.visit(node.value))
+
+    def visit_Import(self, node):
+        return IRImport([(alias.name, alias.asname) for alias in node.names])
+
+    def visit_ImportFrom(self, node):
+        names = [(alias.name, alias.asname) for alias in node.names]
+        return IRImport(names, node.module, node.level)
+
+    def visit_Global(self, node):
+        return IRGlobal(list(node.names))
+
     def visit_Name(self, node):
         return IRVar(node.id)
 
@@ -31,6 +70,52 @@ class IRBuilder(ast.NodeVisitor):
         op = type(node.op).__name__
         return IRBinary(op, left, right)
 
+    def visit_Compare(self, node):
+        left = self.visit(node.left)
+        ops = [type(op).__name__ for op in node.ops]
+        comparators = [self.visit(c) for c in node.comparators]
+        return IRCompare(ops, left, comparators)
+
+    def visit_BoolOp(self, node):
+        values = [self.visit(v) for v in node.values]
+        return IRBoolOp(type(node.op).__name__, values)
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.operand)
+        return IRUnary(type(node.op).__name__, operand)
+
+    def visit_Call(self, node):
+        func = self.visit(node.func)
+        args = [self.visit(arg) for arg in node.args]
+        keywords = [self.visit(kw) for kw in node.keywords]
+        return IRCall(func, args, keywords)
+
+    def visit_keyword(self, node):
+        return IRKeyword(node.arg, self.visit(node.value))
+
+    def visit_Starred(self, node):
+        return IRStarred(self.visit(node.value))
+
+    def visit_Attribute(self, node):
+        return IRAttribute(self.visit(node.value), node.attr)
+
+    def visit_Subscript(self, node):
+        return IRSubscript(self.visit(node.value), self.visit(node.slice))
+
+    def visit_List(self, node):
+        return IRList([self.visit(e) for e in node.elts])
+
+    def visit_Tuple(self, node):
+        return IRTuple([self.visit(e) for e in node.elts])
+
+    def visit_Set(self, node):
+        return IRSet([self.visit(e) for e in node.elts])
+
+    def visit_Dict(self, node):
+        keys = [self.visit(k) if k is not None else None for k in node.keys]
+        values = [self.visit(v) for v in node.values]
+        return IRDict(keys, values)
+
     def visit_If(self, node):
         test = self.visit(node.test)
         then_body = [self.visit(stmt) for stmt in node.body]
@@ -44,5 +129,6 @@ class IRBuilder(ast.NodeVisitor):
         return IRFor(target, iterable, body)
 
     def visit_Return(self, node):
-        value = self.visit(node.value) if node.value else None
+        # A bare return returns None; a value the IR does not model stays None
+        value = self.visit(node.value) if node.value else IRConst(None)
         return IRReturn(value)
@@ -0,0 +1,495 @@
+import builtins
+import importlib
+import operator
+from typing import Callable, Dict
+
+from Frontend.IR.Ir_nodes import *
+from Frontend.dispatch_visitor import DispatchVisitor
+
+
+BINARY_OPS = {
+    'Add': operator.add, 'Sub': operator.sub, 'Mult': operator.mul,
+    'Div': operator.truediv, 'FloorDiv': operator.floordiv, 'Mod': operator.mod,
+    'Pow': operator.pow, 'LShift': operator.lshift, 'RShift': operator.rshift,
+    'BitOr': operator.or_, 'BitXor': operator.xor, 'BitAnd': operator.and_,
+    'MatMult': operator.matmul,
+}
+
+INPLACE_OPS = {
+    'Add': operator.iadd, 'Sub': operator.isub, 'Mult': operator.imul,
+    'Div': operator.itruediv, 'FloorDiv': operator.ifloordiv, 'Mod': operator.imod,
+    'Pow': operator.ipow, 'LShift': operator.ilshift, 'RShift': operator.irshift,
+    'BitOr': operator.ior, 'BitXor': operator.ixor, 'BitAnd': operator.iand,
+    'MatMult': operator.imatmul,
+}
+
+COMPARE_OPS = {
+    'Eq': operator.eq, 'NotEq': operator.ne, 'Lt': operator.lt, 'LtE': operator.le,
+    'Gt': operator.gt, 'GtE': operator.ge, 'Is': operator.is_, 'IsNot': operator.is_not,
+    'In': lambda a, b: a in b, 'NotIn': lambda a, b: a not in b,
+}
+
+UNARY_OPS = {
+    'UAdd': operator.pos, 'USub': operator.neg, 'Not': operator.not_, 'Invert': operator.invert,
+}
+
+
+class _Unbound:
+    def __repr__(self):
+        return "<unbound>"
+
+
+_UNBOUND = _Unbound()
+
+
+class IRCompiler(DispatchVisitor):
+    """Compiles IR into nested Python closures, once.
+
+    Every expression becomes a ``f(frame) -> value`` closure and every
+    statement a ``f(frame) -> None | (value,)`` closure, where a 1-tuple
+    signals ``return``. Locals live in a flat list indexed by slots fixed
+    at compile time, so running a function does no dispatch or name
+    lookup on IR nodes. Nested functions reading locals of an enclosing
+    function have no cells to read them from and are refused.
+    """
+
+    dispatch_prefixes = ("visit_", "expr_")
+
+    def __init__(self, env: Dict[str, object] = None):
+        # Module globals; compiled functions are stored here as they are defined
+        self.env = env if env is not None else {}
+        self.slots: Dict[str, int] = {}
+        self.params = set()
+        self.global_names = set()
+        # Locals of the functions enclosing the one being compiled
+        self.enclosing = set()
+
+    def compile_module(self, module) -> Dict[str, object]:
+        """Compile and run module-level code; return the module globals"""
+        # Statements IRBuilder did not lower are skipped and relative imports
+        # raise; callers seed what those bind through env (see compile_statement)
+        for stmt in module.body:
+            if stmt is not None:
+                self.compile_statement(stmt)([])
+        return self.env
+
+    def compile_statement(self, stmt) -> Callable:
+        """Compile one module-level statement; run the result with an empty frame"""
+        self.slots, self.params, self.global_names, self.enclosing = {}, set(), set(), set()
+        return self.visit(stmt)
+
+    def generic_visit(self, node):
+        if node is None:
+            raise NotImplementedError("cannot compile a statement the IR does not model")
+        raise NotImplementedError(f"cannot compile {node.__class__.__name__}")
+
+    def expr_unknown(self, node):
+        if node is None:
+            raise NotImplementedError("cannot compile an expression the IR does not model")
+        raise NotImplementedError(f"cannot compile {node.__class__.__name__}")
+
+    # -------------------------
+    # Statements
+    # -------------------------
+    def _block(self, stmts):
+        compiled = [self.visit(stmt) for stmt in stmts]
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def run(frame):
+            for stmt in compiled:
+                result = stmt(frame)
+                if result is not None:
+                    return result
+            return None
+        return run
+
+    def visit_IRFunction(self, node):
+        if node.vararg or node.kwonly or node.kwarg:
+            raise NotImplementedError("cannot compile *args, keyword-only or **kwargs parameters")
+        # Decorators and defaults are evaluated in the enclosing scope
+        decorators = [self.expr(d) for d in node.decorators]
+        defaults = [self.expr(d) for d in node.defaults]
+        outer = (self.slots, self.params, self.global_names, self.enclosing)
+        self.enclosing = (self.enclosing | set(self.slots)) - self.global_names
+        self.global_names = {n for stmt in self._walk_stmts(node.body)
+                             if isinstance(stmt, IRGlobal) for n in stmt.names}
+        names = list(node.params)
+        for name in sorted(self._assigned(node.body)):
+            if name not in names and name not in self.global_names:
+                names.append(name)
+        self.slots = {name: i for i, name in enumerate(names)}
+        self.params = set(node.params)
+
+        body = self._block(node.body) if node.body else (lambda frame: None)
+        self.slots, self.params, self.global_names, self.enclosing = outer
+        # A nested def binds a local of the enclosing function
+        store = self._store(IRVar(node.func_name))
+
+        name, arity, size = node.func_name, len(node.params), len(names)
+        padding = [_UNBOUND] * (size - arity)
+        required = arity - len(defaults)
+
+        def make(default_values):
+            def function(*args):
+                if len(args) != arity:
+                    if not required <= len(args) <= arity:
+                        raise TypeError(f"{name}() takes {arity} arguments ({len(args)} given)")
+                    args += tuple(default_values[len(args) - required:])
+                result = body(list(args) + padding)
+                return result[0] if result is not None else None
+            function.__name__ = name
+            return function
+
+        function = make([])
+
+        def define(frame):
+            applied = [decorator(frame) for decorator in decorators]
+            result = make([d(frame) for d in defaults]) if defaults else function
+            for decorator in reversed(applied):
+                result = decorator(result)
+            store(frame, result)
+        return define
+
+    def _walk_stmts(self, stmts):
+        for stmt in stmts:
+            yield stmt
+            if isinstance(stmt, IRFor):
+                yield from self._walk_stmts(stmt.body)
+            elif isinstance(stmt, IRIf):
+                yield from self._walk_stmts(stmt.then_body)
+                yield from self._walk_stmts(stmt.else_body)
+
+    def _assigned(self, stmts):
+        names = set()
+        for stmt in self._walk_stmts(stmts):
+            target = getattr(stmt, "target", None)
+            if isinstance(target, IRVar):
+                names.add(target.name)
+            elif isinstance(stmt, IRFunction):
+                names.add(stmt.func_name)
+            elif isinstance(stmt, IRImport):
+                names |= import_bindings(stmt)
+        return names
+
+    def _store(self, target):
+        """Closure (frame, value) -> None storing into target"""
+        if isinstance(target, IRVar):
+            if target.name in self.slots:
+                i = self.slots[target.name]
+
+                def store(frame, value):
+                    frame[i] = value
+                return store
+            env, name = self.env, target.name
+
+            def store(frame, value):
+                env[name] = value
+            return store
+
+        if isinstance(target, IRSubscript):
+            container, index = self.expr(target.value), self.expr(target.index)
+
+            def store(frame, value):
+                container(frame)[index(frame)] = value
+            return store
+
+        if isinstance(target, IRAttribute):
+            obj, attr = self.expr(target.value), target.attr
+
+            def store(frame, value):
+                setattr(obj(frame), attr, value)
+            return store
+
+        raise NotImplementedError(f"cannot assign to {target.__class__.__name__}")
+
+    def visit_IRAssign(self, node):
+        value = self.expr(node.value)
+        if isinstance(node.target, IRVar) and node.target.name in self.slots:
+            i = self.slots[node.target.name]
+
+            def assign(frame):
+                frame[i] = value(frame)
+            return assign
+
+        store = self._store(node.target)
+
+        def assign(frame):
+            store(frame, value(frame))
+        return assign
+
+    def visit_IRAugAssign(self, node):
+        current, value, store = self.expr(node.target), self.expr(node.value), self._store(node.target)
+        op = INPLACE_OPS[node.op]
+
+        def aug_assign(frame):
+            store(frame, op(current(frame), value(frame)))
+        return aug_assign
+
+    def visit_IRExpr(self, node):
+        value = self.expr(node.value)
+
+        def expr_stmt(frame):
+            value(frame)
+        return expr_stmt
+
+    def visit_IRImport(self, node):
+        if node.level or any(name == "*" for name, _ in node.names):
+            raise NotImplementedError("cannot compile relative or star imports")
+        bindings = []
+        for name, asname in node.names:
+            if node.module is None:
+                # `import a.b` binds a; `import a.b as c` binds a.b
+                bound = name if asname else name.split(".")[0]
+                bindings.append((self._store(IRVar(asname or bound)), name, bound, None))
+            else:
+                bindings.append((self._store(IRVar(asname or name)), node.module, node.module, name))
+
+        def import_(frame):
+            for store, module, bound, attr in bindings:
+                importlib.import_module(module)
+                value = importlib.import_module(bound)
+                if attr is not None:
+                    try:
+                        value = getattr(value, attr)
+                    except AttributeError:
+                        value = importlib.import_module(f"{module}.{attr}")
+                store(frame, value)
+        return import_
+
+    def visit_IRGlobal(self, node):
+        return lambda frame: None
+
+    def visit_IRReturn(self, node):
+        value = self.expr(node.value)
+        return lambda frame: (value(frame),)
+
+    def visit_IRIf(self, node):
+        test = self.expr(node.test)
+        then_body = self._block(node.then_body)
+        if not node.else_body:
+            def if_(frame):
+                if test(frame):
+                    return then_body(frame)
+            return if_
+
+        else_body = self._block(node.else_body)
+
+        def if_else(frame):
+            if test(frame):
+                return then_body(frame)
+            return else_body(frame)
+        return if_else
+
+    def visit_IRFor(self, node):
+        it, body, store = self.expr(node.it), self._block(node.body), self._store(node.target)
+        if isinstance(node.target, IRVar) and node.target.name in self.slots:
+            i = self.slots[node.target.name]
+
+            def for_slot(frame):
+                for item in it(frame):
+                    frame[i] = item
+                    result = body(frame)
+                    if result is not None:
+                        return result
+            return for_slot
+
+        def for_(frame):
+            for item in it(frame):
+                store(frame, item)
+                result = body(frame)
+                if result is not None:
+                    return result
+        return for_
+
+    # -------------------------
+    # Expressions
+    # -------------------------
+    def expr(self, node) -> Callable:
+        handler = self._tables["expr_"].get(type(node))
+        if handler is None:
+            handler = self.handler_for(type(node), "expr_", "expr_unknown")
+        return handler(self, node)
+
+    def expr_IRConst(self, node):
+        value = node.value
+        return lambda frame: value
+
+    def expr_IRVar(self, node):
+        name = node.name
+        if name not in self.slots and name in self.enclosing and name not in self.global_names:
+            raise NotImplementedError(f"cannot compile a closure over {name}")
+        if name in self.slots:
+            i = self.slots[name]
+            if name in self.params:
+                # Parameters are bound on entry and never unbound
+                return lambda frame: frame[i]
+
+            def load(frame):
+                value = frame[i]
+                if value is _UNBOUND:
+                    raise UnboundLocalError(f"local variable '{name}' referenced before assignment")
+                return value
+            return load
+
+        env, builtin_names = self.env, vars(builtins)
+
+        def load_global(frame):
+            try:
+                return env[name]
+            except KeyError:
+                try:
+                    return builtin_names[name]
+                except KeyError:
+                    raise NameError(f"name '{name}' is not defined") from None
+        return load_global
+
+    def expr_IRBinary(self, node):
+        op, left = BINARY_OPS[node.op], self.expr(node.left)
+        if isinstance(node.right, IRConst):
+            right = node.right.value
+            return lambda frame: op(left(frame), right)
+        right = self.expr(node.right)
+        return lambda frame: op(left(frame), right(frame))
+
+    def expr_IRCompare(self, node):
+        left = self.expr(node.left)
+        if len(node.ops) == 1:
+            op, comparator = COMPARE_OPS[node.ops[0]], node.comparators[0]
+            if isinstance(comparator, IRConst):
+                right = comparator.value
+                return lambda frame: op(left(frame), right)
+            right = self.expr(comparator)
+            return lambda frame: op(left(frame), right(frame))
+
+        pairs = [(COMPARE_OPS[op], self.expr(c)) for op, c in zip(node.ops, node.comparators)]
+
+        def compare_chain(frame):
+            current = left(frame)
+            for op, right in pairs:
+                value = right(frame)
+                if not op(current, value):
+                    return False
+                current = value
+            return True
+        return compare_chain
+
+    def expr_IRBoolOp(self, node):
+        values = [self.expr(v) for v in node.values]
+        if node.op == 'And':
+            def and_(frame):
+                result = True
+                for value in values:
+                    result = value(frame)
+                    if not result:
+                        return result
+                return result
+            return and_
+
+        def or_(frame):
+            result = False
+            for value in values:
+                result = value(frame)
+                if result:
+                    return result
+            return result
+        return or_
+
+    def expr_IRUnary(self, node):
+        op, operand = UNARY_OPS[node.op], self.expr(node.operand)
+        return lambda frame: op(operand(frame))
+
+    def expr_IRCall(self, node):
+        func = self.expr(node.func)
+        if node.keywords or any(isinstance(arg, IRStarred) for arg in node.args):
+            args, keywords = self._elements(node.args), self._keywords(node.keywords)
+            return lambda frame: func(frame)(*args(frame), **keywords(frame))
+
+        args = [self.expr(arg) for arg in node.args]
+        if len(args) == 1:
+            arg = args[0]
+            return lambda frame: func(frame)(arg(frame))
+        return lambda frame: func(frame)(*[arg(frame) for arg in args])
+
+    def _elements(self, nodes):
+        """Closure building the list of values of nodes, expanding IRStarred"""
+        parts = [(isinstance(e, IRStarred), self.expr(e.value if isinstance(e, IRStarred) else e))
+                 for e in nodes]
+
+        def elements(frame):
+            values = []
+            for starred, part in parts:
+                if starred:
+                    values.extend(part(frame))
+                else:
+                    values.append(part(frame))
+            return values
+        return elements
+
+    def _keywords(self, keywords):
+        """Closure building the keyword dict of a call, expanding **value"""
+        parts = [(kw.arg, self.expr(kw.value)) for kw in keywords]
+
+        def build(frame):
+            result = {}
+            for arg, value in parts:
+                if arg is None:
+                    mapping = value(frame)
+                    if not hasattr(mapping, "keys"):
+                        raise TypeError(f"argument after ** must be a mapping, not {type(mapping).__name__}")
+                    for key in mapping.keys():
+                        if key in result:
+                            raise TypeError(f"got multiple values for keyword argument '{key}'")
+                        result[key] = mapping[key]
+                elif arg in result:
+                    raise TypeError(f"got multiple values for keyword argument '{arg}'")
+                else:
+                    result[arg] = value(frame)
+            return result
+        return build
+
+    def expr_IRAttribute(self, node):
+        value, attr = self.expr(node.value), node.attr
+        return lambda frame: getattr(value(frame), attr)
+
+    def expr_IRSubscript(self, node):
+        value, index = self.expr(node.value), self.expr(node.index)
+        return lambda frame: value(frame)[index(frame)]
+
+    def expr_IRList(self, node):
+        if any(isinstance(e, IRStarred) for e in node.elements):
+            return self._elements(node.elements)
+        elements = [self.expr(e) for e in node.elements]
+        return lambda frame: [e(frame) for e in elements]
+
+    def expr_IRTuple(self, node):
+        if any(isinstance(e, IRStarred) for e in node.elements):
+            elements = self._elements(node.elements)
+            return lambda frame: tuple(elements(frame))
+        elements = [self.expr(e) for e in node.elements]
+        return lambda frame: tuple(e(frame) for e in elements)
+
+    def expr_IRSet(self, node):
+        if any(isinstance(e, IRStarred) for e in node.elements):
+            elements = self._elements(node.elements)
+            return lambda frame: set(elements(frame))
+        elements = [self.expr(e) for e in node.elements]
+        return lambda frame: {e(frame) for e in elements}
+
+    def expr_IRDict(self, node):
+        items = [(self.expr(k) if k is not None else None, self.expr(v))
+                 for k, v in zip(node.keys, node.values)]
+
+        def dict_(frame):
+            result = {}
+            for k, v in items:
+                if k is None:
+                    result.update(v(frame))
+                else:
+                    result[k(frame)] = v(frame)
+            return result
+        return dict_
+
+def compile_ir(module) -> Dict[str, object]:
+    """Compile an IRModule; return its globals (functions included)"""
+    return IRCompiler().compile_module(module)
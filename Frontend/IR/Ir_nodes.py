@@ -1,15 +1,29 @@
 class IRnode():
-    pass
+    # Source span, filled in by IRBuilder from the originating AST node
+    lineno = None
+    end_lineno = None
+    col_offset = None
+    end_col_offset = None
+    # Execution count from a profile (IRFunction, IRFor), see Frontend.Profile
+    hotness = None
 
 class IRModule(IRnode):
     def __init__(self, body):
         self.body = body
 
 class IRFunction(IRnode):
-    def __init__(self, func_name , params , body):
+    def __init__(self, func_name , params , body, defaults=None, vararg=None,
+                 kwonly=None, kw_defaults=None, kwarg=None, posonly=0, decorators=None):
         self.func_name = func_name
-        self.params = params
+        self.params = params  # positional parameters, positional-only ones first
         self.body = body
+        self.defaults = defaults or []  # values of the last len(defaults) params
+        self.vararg = vararg  # name of *args, or None
+        self.kwonly = kwonly or []  # keyword-only parameter names
+        self.kw_defaults = kw_defaults or {}  # keyword-only name -> value, if it has one
+        self.kwarg = kwarg  # name of **kwargs, or None
+        self.posonly = posonly  # how many of params are positional-only
+        self.decorators = decorators or []  # outermost first
 
 class IRAssign(IRnode):
     def __init__(self, target , value):
@@ -45,3 +59,90 @@ class IRIf(IRnode):
 class IRReturn(IRnode):
     def __init__(self, value):
         self.value = value
+
+class IRAugAssign(IRnode):
+    def __init__(self, op, target, value):
+        self.op = op
+        self.target = target
+        self.value = value
+
+class IRExpr(IRnode):
+    def __init__(self, value):
+        self.value = value
+
+class IRCompare(IRnode):
+    def __init__(self, ops, left, comparators):
+        self.ops = ops
+        self.left = left
+        self.comparators = comparators
+
+class IRBoolOp(IRnode):
+    def __init__(self, op, values):
+        self.op = op
+        self.values = values
+
+class IRUnary(IRnode):
+    def __init__(self, op, operand):
+        self.op = op
+        self.operand = operand
+
+class IRCall(IRnode):
+    def __init__(self, func, args, keywords=None):
+        self.func = func
+        self.args = args  # may contain IRStarred
+        self.keywords = keywords or []  # IRKeyword list
+
+class IRStarred(IRnode):
+    # *value in a call, a display or an assignment target
+    def __init__(self, value):
+        self.value = value
+
+class IRKeyword(IRnode):
+    # arg=value in a call; arg is None for **value
+    def __init__(self, arg, value):
+        self.arg = arg
+        self.value = value
+
+class IRAttribute(IRnode):
+    def __init__(self, value, attr):
+        self.value = value
+        self.attr = attr
+
+class IRSubscript(IRnode):
+    def __init__(self, value, index):
+        self.value = value
+        self.index = index
+
+class IRList(IRnode):
+    def __init__(self, elements):
+        self.elements = elements
+
+class IRTuple(IRnode):
+    def __init__(self, elements):
+        self.elements = elements
+
+class IRSet(IRnode):
+    def __init__(self, elements):
+        self.elements = elements
+
+class IRDict(IRnode):
+    def __init__(self, keys, values):
+        self.keys = keys  # None for a **value entry
+        self.values = values
+
+class IRImport(IRnode):
+    # import a.b as c (module is None) / from .module import name as alias
+    def __init__(self, names, module=None, level=0):
+        self.names = names  # (name, asname or None) pairs
+        self.module = module
+        self.level = level  # leading dots of a relative import
+
+def import_bindings(node):
+    """Names an IRImport binds"""
+    if node.module is None and not node.level:
+        return {asname or name.split(".")[0] for name, asname in node.names}
+    return {asname or name for name, asname in node.names if name != "*"}
+
+class IRGlobal(IRnode):
+    def __init__(self, names):
+        self.names = names
@@ -1,22 +1,22 @@
 from Frontend.IR.Ir_nodes import *
+from Frontend.dispatch_visitor import DispatchVisitor
+
+class IRPrinter(DispatchVisitor):
+    dispatch_prefixes = ("visit_", "expr_")
 
-class IRPrinter:
     def __init__(self):
         self.indent = 0
 
     def _p(self, text):
         print("  " * self.indent + text)
 
-    def visit(self, node):
-        if node is None:
-            return
-        method = "visit_" + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        visitor(node)
-
     def generic_visit(self, node):
         self._p(f"<unknown {node.__class__.__name__}>")
 
+    def visit_NoneType(self, node):
+        # Statements the IR builder could not lower
+        pass
+
     # -------------------------
     # Module
     # -------------------------
@@ -28,8 +28,21 @@ class IRPrinter:
     # Function
     # -------------------------
     def visit_IRFunction(self, node):
-        params = ", ".join(node.params)
-        self._p(f"func {node.func_name}({params})")
+        params = list(node.params)
+        first_default = len(params) - len(node.defaults)
+        for i, default in enumerate(node.defaults):
+            params[first_default + i] += f"={self.expr(default)}"
+        if node.posonly:
+            params.insert(node.posonly, "/")
+        if node.vararg or node.kwonly:
+            params.append(f"*{node.vararg or ''}")
+        params += [f"{name}={self.expr(node.kw_defaults[name])}" if name in node.kw_defaults else name
+                   for name in node.kwonly]
+        if node.kwarg:
+            params.append(f"**{node.kwarg}")
+        for decorator in node.decorators:
+            self._p(f"@{self.expr(decorator)}")
+        self._p(f"func {node.func_name}({', '.join(params)})")
         self.indent += 1
         for stmt in node.body:
             self.visit(stmt)
@@ -41,6 +54,22 @@ class IRPrinter:
     def visit_IRAssign(self, node):
         self._p(f"{self.expr(node.target)} = {self.expr(node.value)}")
 
+    def visit_IRAugAssign(self, node):
+        self._p(f"{self.expr(node.target)} {node.op}= {self.expr(node.value)}")
+
+    def visit_IRExpr(self, node):
+        self._p(self.expr(node.value))
+
+    def visit_IRImport(self, node):
+        names = ", ".join(f"{name} as {asname}" if asname else name for name, asname in node.names)
+        if node.module is None and not node.level:
+            self._p(f"import {names}")
+        else:
+            self._p(f"from {'.' * node.level}{node.module or ''} import {names}")
+
+    def visit_IRGlobal(self, node):
+        self._p(f"global {', '.join(node.names)}")
+
     def visit_IRReturn(self, node):
         self._p(f"return {self.expr(node.value)}")
 
@@ -69,10 +98,63 @@ class IRPrinter:
     # Expressions
     # -------------------------
     def expr(self, node):
-        if isinstance(node, IRVar):
-            return node.name
-        if isinstance(node, IRConst):
-            return repr(node.value)
-        if isinstance(node, IRBinary):
-            return f"({self.expr(node.left)} {node.op} {self.expr(node.right)})"
+        handler = self._tables["expr_"].get(type(node))
+        if handler is None:
+            handler = self.handler_for(type(node), "expr_", "expr_unknown")
+        return handler(self, node)
+
+    def expr_IRVar(self, node):
+        return node.name
+
+    def expr_IRConst(self, node):
+        return repr(node.value)
+
+    def expr_IRBinary(self, node):
+        return f"({self.expr(node.left)} {node.op} {self.expr(node.right)})"
+
+    def expr_IRCompare(self, node):
+        parts = [self.expr(node.left)]
+        for op, comparator in zip(node.ops, node.comparators):
+            parts.append(f"{op} {self.expr(comparator)}")
+        return f"({' '.join(parts)})"
+
+    def expr_IRBoolOp(self, node):
+        return "(" + f" {node.op} ".join(self.expr(v) for v in node.values) + ")"
+
+    def expr_IRUnary(self, node):
+        return f"({node.op} {self.expr(node.operand)})"
+
+    def expr_IRCall(self, node):
+        args = ", ".join(self.expr(arg) for arg in node.args + node.keywords)
+        return f"{self.expr(node.func)}({args})"
+
+    def expr_IRStarred(self, node):
+        return f"*{self.expr(node.value)}"
+
+    def expr_IRKeyword(self, node):
+        if node.arg is None:
+            return f"**{self.expr(node.value)}"
+        return f"{node.arg}={self.expr(node.value)}"
+
+    def expr_IRAttribute(self, node):
+        return f"{self.expr(node.value)}.{node.attr}"
+
+    def expr_IRSubscript(self, node):
+        return f"{self.expr(node.value)}[{self.expr(node.index)}]"
+
+    def expr_IRList(self, node):
+        return "[" + ", ".join(self.expr(e) for e in node.elements) + "]"
+
+    def expr_IRTuple(self, node):
+        return "(" + ", ".join(self.expr(e) for e in node.elements) + ")"
+
+    def expr_IRSet(self, node):
+        return "{" + ", ".join(self.expr(e) for e in node.elements) + "}"
+
+    def expr_IRDict(self, node):
+        items = ", ".join(f"{self.expr(k)}: {self.expr(v)}" if k is not None else f"**{self.expr(v)}"
+                          for k, v in zip(node.keys, node.values))
+        return "{" + items + "}"
+
+    def expr_unknown(self, node):
         return "<expr>"
@@ -0,0 +1,9 @@
+from .profile_data import (
+    FunctionProfile, ProfileData, ProfileRecorder, annotate_ir,
+    load_pstats, load_line_hits, load_profiles, save_profiles, profile_for
+)
+
+__all__ = [
+    'FunctionProfile', 'ProfileData', 'ProfileRecorder', 'annotate_ir',
+    'load_pstats', 'load_line_hits', 'load_profiles', 'save_profiles', 'profile_for'
+]
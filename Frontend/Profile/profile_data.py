@@ -0,0 +1,241 @@
+import json
+import os
+import pstats
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Frontend.IR.Ir_nodes import *
+
+
+@dataclass
+class FunctionProfile:
+    name: str
+    lineno: Optional[int] = None  # first line of the code object
+    calls: int = 0
+    time: float = 0.0  # own time in seconds, excluding callees
+    line_hits: int = 0  # sum of line hits inside the function
+
+
+@dataclass
+class ProfileData:
+    """Execution counts for one source file"""
+    functions: Dict[str, FunctionProfile] = field(default_factory=dict)
+    line_hits: Dict[int, int] = field(default_factory=dict)
+
+    def function(self, name: str) -> FunctionProfile:
+        if name not in self.functions:
+            self.functions[name] = FunctionProfile(name)
+        return self.functions[name]
+
+    def rank(self, scope_ranges: Dict[str, Tuple[int, int]]) -> List[FunctionProfile]:
+        """Profiles of the functions in scope_ranges, hottest first.
+
+        Functions are weighed by own time when the profile has timings,
+        else by calls, else by line hits inside their span.
+        """
+        ranked = []
+        for scope, (start, end) in scope_ranges.items():
+            if not scope.startswith("function:"):
+                continue
+            name = scope.split(":", 1)[1]
+            prof = self.functions.get(name) or FunctionProfile(name, start)
+            if self.line_hits:
+                prof.line_hits = sum(hits for line, hits in self.line_hits.items() if start <= line <= end)
+            ranked.append(prof)
+
+        key = self._weight_key(ranked)
+        return sorted(ranked, key=lambda prof: (-key(prof), prof.name))
+
+    def hot_functions(self, scope_ranges: Dict[str, Tuple[int, int]],
+                      coverage: float = 0.9) -> List[FunctionProfile]:
+        """Smallest hottest-first prefix of rank() covering ``coverage`` of the weight"""
+        ranked = self.rank(scope_ranges)
+        key = self._weight_key(ranked)
+        total = sum(key(prof) for prof in ranked)
+        hot, covered = [], 0.0
+        for prof in ranked:
+            if covered >= coverage * total or key(prof) == 0:
+                break
+            hot.append(prof)
+            covered += key(prof)
+        return hot
+
+    @staticmethod
+    def _weight_key(profiles):
+        if any(prof.time for prof in profiles):
+            return lambda prof: prof.time
+        if any(prof.calls for prof in profiles):
+            return lambda prof: prof.calls
+        return lambda prof: prof.line_hits
+
+    def to_json(self) -> dict:
+        return {
+            "functions": {name: asdict(prof) for name, prof in sorted(self.functions.items())},
+            "lines": {str(line): hits for line, hits in sorted(self.line_hits.items())},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ProfileData":
+        return cls(
+            functions={name: FunctionProfile(**prof) for name, prof in data.get("functions", {}).items()},
+            line_hits={int(line): hits for line, hits in data.get("lines", {}).items()},
+        )
+
+
+def annotate_ir(ir_module, profile: ProfileData):
+    """Set ``hotness`` on IRFunction (calls) and IRFor (header line hits) nodes.
+
+    Loops without line hits inherit the calls of their function.
+    """
+    def visit(stmts, inherited):
+        for stmt in stmts:
+            if isinstance(stmt, IRFunction):
+                prof = profile.functions.get(stmt.func_name)
+                stmt.hotness = prof.calls if prof else 0
+                visit(stmt.body, stmt.hotness)
+            elif isinstance(stmt, IRFor):
+                stmt.hotness = profile.line_hits.get(stmt.lineno, inherited) if profile.line_hits else inherited
+                visit(stmt.body, stmt.hotness)
+            elif isinstance(stmt, IRIf):
+                visit(stmt.then_body, inherited)
+                visit(stmt.else_body, inherited)
+
+    visit(ir_module.body, None)
+
+
+# -------------------------
+# Loading
+# -------------------------
+def load_pstats(stats) -> Dict[str, ProfileData]:
+    """Per-file profiles from a cProfile dump (path) or a pstats.Stats object"""
+    if not isinstance(stats, pstats.Stats):
+        stats = pstats.Stats(stats)
+    profiles: Dict[str, ProfileData] = {}
+    for (filename, lineno, name), (_, calls, own_time, _, _) in stats.stats.items():
+        if filename == "~" or filename.startswith("<"):
+            continue
+        prof = profiles.setdefault(os.path.abspath(filename), ProfileData()).function(name)
+        prof.lineno = prof.lineno or lineno
+        prof.calls += calls
+        prof.time += own_time
+    return profiles
+
+
+def load_line_hits(path: str) -> Dict[str, ProfileData]:
+    """Per-file profiles from a text file of ``<source path>:<line> <hits>`` lines"""
+    profiles: Dict[str, ProfileData] = {}
+    with open(path) as f:
+        for row in f:
+            row = row.strip()
+            if not row or row.startswith("#"):
+                continue
+            location, hits = row.rsplit(None, 1)
+            filename, line = location.rsplit(":", 1)
+            line_hits = profiles.setdefault(os.path.abspath(filename), ProfileData()).line_hits
+            line_hits[int(line)] = line_hits.get(int(line), 0) + int(hits)
+    return profiles
+
+
+def load_profiles(path: str) -> Dict[str, ProfileData]:
+    """Load a cProfile dump, a JSON file from save_profiles, or line hits"""
+    try:
+        return load_pstats(path)
+    except (TypeError, ValueError, EOFError):
+        pass
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return {filename: ProfileData.from_json(prof) for filename, prof in data.items()}
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        pass
+    return load_line_hits(path)
+
+
+def save_profiles(profiles: Dict[str, ProfileData], path: str):
+    with open(path, "w") as f:
+        json.dump({filename: prof.to_json() for filename, prof in sorted(profiles.items())}, f, indent=2)
+
+
+def profile_for(profiles: Dict[str, ProfileData], path: str) -> Optional[ProfileData]:
+    return profiles.get(os.path.abspath(path))
+
+
+# -------------------------
+# Recording
+# -------------------------
+class ProfileRecorder:
+    """Records calls and own time (``sys.setprofile``), and optionally
+    line hits (``sys.settrace``), for code in the given source files.
+
+        with ProfileRecorder([path], lines=True) as recorder:
+            run_workload()
+        profiles = recorder.profiles
+    """
+
+    def __init__(self, paths: Iterable[str], lines: bool = False):
+        self.files = {os.path.abspath(p) for p in paths}
+        self.lines = lines
+        self.profiles: Dict[str, ProfileData] = {}
+        # [FunctionProfile, start, time spent in callees, frame] per active call
+        self._stack: List[list] = []
+
+    def __enter__(self):
+        if self.lines:
+            sys.settrace(self._trace)
+        else:
+            sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, *exc):
+        if self.lines:
+            sys.settrace(None)
+        else:
+            sys.setprofile(None)
+        self._stack.clear()
+
+    def _tracked(self, frame) -> Optional[ProfileData]:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename not in self.files:
+            return None
+        return self.profiles.setdefault(filename, ProfileData())
+
+    def _enter(self, frame, data):
+        code = frame.f_code
+        prof = data.function(code.co_name)
+        prof.lineno = prof.lineno or code.co_firstlineno
+        prof.calls += 1
+        self._stack.append([prof, time.perf_counter(), 0.0, frame])
+
+    def _leave(self, frame):
+        if not self._stack or self._stack[-1][3] is not frame:
+            return
+        prof, start, callees, _ = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        prof.time += elapsed - callees
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def _profile(self, frame, event, arg):
+        if event == "call":
+            data = self._tracked(frame)
+            if data is not None:
+                self._enter(frame, data)
+        elif event == "return":
+            self._leave(frame)
+
+    def _trace(self, frame, event, arg):
+        data = self._tracked(frame)
+        if data is None:
+            return None
+        self._enter(frame, data)
+        line_hits = data.line_hits
+
+        def local(frame, event, arg):
+            if event == "line":
+                line_hits[frame.f_lineno] = line_hits.get(frame.f_lineno, 0) + 1
+            elif event == "return":
+                self._leave(frame)
+            return local
+        return local
@@ -0,0 +1,4 @@
+from .interval_tree import IntervalTree
+from .query_index import QueryIndex
+
+__all__ = ['IntervalTree', 'QueryIndex']
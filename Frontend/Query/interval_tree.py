@@ -0,0 +1,66 @@
+from typing import Any, Iterable, List, Tuple
+
+
+class _Node:
+    __slots__ = ("center", "left", "right", "by_start", "by_end")
+
+    def __init__(self, center, left, right, by_start, by_end):
+        self.center = center
+        self.left = left
+        self.right = right
+        self.by_start = by_start
+        self.by_end = by_end
+
+
+class IntervalTree:
+    """Static centered interval tree over closed integer ranges"""
+
+    def __init__(self, intervals: Iterable[Tuple[int, int, Any]]):
+        self._root = self._build([iv for iv in intervals if iv[0] <= iv[1]])
+
+    def _build(self, intervals):
+        """Build the tree bottom-up from (start, end, payload) triples"""
+        if not intervals:
+            return None
+
+        points = sorted(p for start, end, _ in intervals for p in (start, end))
+        center = points[len(points) // 2]
+
+        left, right, here = [], [], []
+        for iv in intervals:
+            if iv[1] < center:
+                left.append(iv)
+            elif iv[0] > center:
+                right.append(iv)
+            else:
+                here.append(iv)
+
+        return _Node(
+            center,
+            self._build(left),
+            self._build(right),
+            sorted(here, key=lambda iv: iv[0]),
+            sorted(here, key=lambda iv: iv[1], reverse=True)
+        )
+
+    def at(self, point: int) -> List[Any]:
+        """Return payloads of every interval containing point"""
+        found = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                for start, _, payload in node.by_start:
+                    if start > point:
+                        break
+                    found.append(payload)
+                node = node.left
+            elif point > node.center:
+                for _, end, payload in node.by_end:
+                    if end < point:
+                        break
+                    found.append(payload)
+                node = node.right
+            else:
+                found.extend(payload for _, _, payload in node.by_start)
+                break
+        return found
@@ -0,0 +1,151 @@
+from typing import Dict, List, Optional, Tuple
+
+from Frontend.DataStructure import VariableInfo, VariableType
+from Frontend.IR.Ir_nodes import IRnode
+from .interval_tree import IntervalTree
+
+
+class QueryIndex:
+    """Position and type lookups over a finished analysis.
+
+    Everything is precomputed once so hover / go-to-definition style
+    queries never rescan the symbol table or the usage lists.
+    """
+
+    def __init__(self, symbols: Dict[Tuple[str, str], VariableInfo],
+                 scope_ranges: Dict[str, Tuple[int, int]], ir_tree=None):
+        # Keyed by (scope, name): a name bound in several functions has one
+        # entry per function
+        self.symbols = symbols
+        self.scope_ranges = scope_ranges
+
+        self._scope_tree = IntervalTree(
+            (start, end, scope) for scope, (start, end) in scope_ranges.items()
+        )
+
+        self._by_type: Dict[VariableType, List[Tuple[str, str]]] = {}
+        self._by_scope: Dict[str, List[str]] = {}
+        self._by_name: Dict[str, List[str]] = {}
+        self._usages_by_line: Dict[int, List[str]] = {}
+        self._defs_by_line: Dict[int, List[str]] = {}
+        live_ranges = []
+
+        for (scope, var_name), var_info in symbols.items():
+            self._by_type.setdefault(var_info.var_type, []).append((scope, var_name))
+            self._by_scope.setdefault(scope, []).append(var_name)
+            self._by_name.setdefault(var_name, []).append(scope)
+
+            for line in var_info.usage_lines:
+                names = self._usages_by_line.setdefault(line, [])
+                if var_name not in names:
+                    names.append(var_name)
+
+            first = var_info.first_assignment_line
+            if first is not None:
+                self._defs_by_line.setdefault(first, []).append(var_name)
+                last = max(var_info.usage_lines, default=first)
+                live_ranges.append((first, max(first, last), var_name))
+
+        self._live_tree = IntervalTree(live_ranges)
+
+        self._node_tree = IntervalTree(
+            (node.lineno, node.end_lineno, (depth, node))
+            for node, depth in self._collect_nodes(ir_tree)
+        ) if ir_tree is not None else IntervalTree(())
+
+    def _collect_nodes(self, root):
+        """Yield (node, depth) for every positioned IR node"""
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if node.lineno is not None:
+                yield node, depth
+            for value in vars(node).values():
+                if isinstance(value, IRnode):
+                    stack.append((value, depth + 1))
+                elif isinstance(value, list):
+                    stack.extend((v, depth + 1) for v in value if isinstance(v, IRnode))
+
+    # -------------------------
+    # Scopes
+    # -------------------------
+    def scopes_at(self, line: int) -> List[str]:
+        """Scopes enclosing line, outermost first"""
+        scopes = self._scope_tree.at(line)
+        scopes.sort(key=lambda s: (self.scope_ranges[s][0], -self.scope_ranges[s][1]))
+        return scopes
+
+    def scope_at(self, line: int) -> Optional[str]:
+        """Innermost scope enclosing line"""
+        scopes = self.scopes_at(line)
+        return scopes[-1] if scopes else None
+
+    # -------------------------
+    # IR nodes
+    # -------------------------
+    def nodes_at(self, line: int, col: Optional[int] = None) -> List[IRnode]:
+        """IR nodes covering a source position, outermost first"""
+        hits = self._node_tree.at(line)
+        if col is not None:
+            hits = [h for h in hits if self._covers_column(h[1], line, col)]
+        hits.sort(key=lambda h: h[0])
+        return [node for _, node in hits]
+
+    def node_at(self, line: int, col: Optional[int] = None) -> Optional[IRnode]:
+        """Innermost IR node covering a source position"""
+        nodes = self.nodes_at(line, col)
+        return nodes[-1] if nodes else None
+
+    def _covers_column(self, node, line, col):
+        if line == node.lineno and col < node.col_offset:
+            return False
+        if line == node.end_lineno and col >= node.end_col_offset:
+            return False
+        return True
+
+    # -------------------------
+    # Symbols
+    # -------------------------
+    def usages_at(self, line: int) -> List[str]:
+        """Variables used on line"""
+        return list(self._usages_by_line.get(line, ()))
+
+    def definitions_at(self, line: int) -> List[str]:
+        """Variables first assigned on line"""
+        return list(self._defs_by_line.get(line, ()))
+
+    def live_at(self, line: int) -> List[str]:
+        """Variables defined at or before line and still used at or after it"""
+        return list(dict.fromkeys(self._live_tree.at(line)))
+
+    def symbols_of_type(self, var_type: VariableType, scope: Optional[str] = None) -> List[str]:
+        """Variables of a given type, optionally restricted to one scope"""
+        entries = self._by_type.get(var_type, ())
+        if scope is None:
+            return list(dict.fromkeys(name for _, name in entries))
+        return [name for s, name in entries if s == scope]
+
+    def symbols_in_scope(self, scope: str) -> List[str]:
+        """Variables declared in scope"""
+        return list(self._by_scope.get(scope, ()))
+
+    def lookup(self, var_name: str, scope: Optional[str] = None) -> Optional[VariableInfo]:
+        """Entry var_name resolves to from scope: its own, else the module's.
+        Without a scope: the module's, else the first scope binding it"""
+        if scope is not None and (scope, var_name) in self.symbols:
+            return self.symbols[(scope, var_name)]
+        if ("global", var_name) in self.symbols:
+            return self.symbols[("global", var_name)]
+        scopes = self._by_name.get(var_name)
+        if scope is None and scopes:
+            return self.symbols[(scopes[0], var_name)]
+        return None
+
+    def definition_of(self, var_name: str, scope: Optional[str] = None) -> Optional[int]:
+        """Line a variable is first assigned (go-to-definition)"""
+        var_info = self.lookup(var_name, scope)
+        return var_info.first_assignment_line if var_info else None
+
+    def hover(self, var_name: str, scope: Optional[str] = None) -> Optional[VariableInfo]:
+        """Analysis facts for a variable (hover)"""
+        return self.lookup(var_name, scope)
@@ -1,6 +1,6 @@
 
 import ast
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple
 
 from Frontend.DataStructure import (
     VariableInfo, FunctionInfo, TypeConstraint,
@@ -12,20 +12,43 @@ from .function_analyzer import FunctionAnalyzer
 from .control_flow_analyzer import ControlFlowAnalyzer
 from .mutation_tracker import MutationTracker
 from .memory_analyzer import MemoryAnalyzer
+from .loop_dependence import LoopDependenceAnalyzer
+from .purity_analyzer import PurityAnalyzer
+from .cost_model import CostModel
 from Explain.Report import ReportGenerator
+from Frontend.Query import QueryIndex
+from Frontend.Profile import annotate_ir
+from Frontend.dispatch_visitor import ASTDispatchVisitor
 
 
-class SemanticAnalyzer(ast.NodeVisitor):
-    """Main semantic analyzer"""
+class SemanticAnalyzer(ASTDispatchVisitor):
+    """Main semantic analyzer
     
-    def __init__(self):
+    Set ``iterative = True`` (class or instance) to analyze very deeply
+    nested code without hitting the recursion limit; it is slower than
+    the default recursive traversal.
+    """
+    
+    def __init__(self, symbol_db=None, module_name: Optional[str] = None,
+                 is_package: bool = False):
         # Data storage
         self.symbol_table: Dict[str, VariableInfo] = {}
+        # The same facts per (scope, name), for names bound in several scopes
+        self.scoped_symbols: Dict[Tuple[str, str], VariableInfo] = {}
         self.functions: Dict[str, FunctionInfo] = {}
         self.type_constraints: List[TypeConstraint] = []
         self.mutated_vars: Set[str] = set()
         self.aliases: Dict[str, Set[str]] = {}
         self.loop_variables: Set[str] = set()
+        self.scope_ranges: Dict[str, Tuple[int, int]] = {}
+        self.imports: Dict[str, Tuple[str, Optional[str]]] = {}
+        self.loop_dependences: List = []
+        self.hot_functions: List = []
+        self.function_costs: Dict = {}
+        self.profile = None
+        # Scopes the optional analyses run on; None means every scope
+        self.hot_scopes: Optional[Set[str]] = None
+        self.module_name = module_name
         
         # Context
         self.current_scope_name = "global"
@@ -39,18 +62,26 @@ class SemanticAnalyzer(ast.NodeVisitor):
             self.symbol_table,
             self.type_constraints,
             lambda: self.current_scope_name,
-            self.type_inferencer
+            self.type_inferencer,
+            self.scoped_symbols
         )
         
         self.function_analyzer = FunctionAnalyzer(
             self.symbol_table,
             self.functions,
-            self.mutated_vars
+            self.mutated_vars,
+            self.imports,
+            symbol_db,
+            module_name,
+            is_package,
+            self.scoped_symbols
         )
+        self.type_inferencer.call_resolver = self.function_analyzer.resolve_call
         
         self.control_flow_analyzer = ControlFlowAnalyzer(
             self.symbol_table,
-            self.loop_variables
+            self.loop_variables,
+            self.scoped_symbols
         )
         
         self.mutation_tracker = MutationTracker(
@@ -66,32 +97,67 @@ class SemanticAnalyzer(ast.NodeVisitor):
             lambda var: self.mutation_tracker.has_aliases(var)
         )
         
+        self.purity_analyzer = PurityAnalyzer(
+            self.functions,
+            self.aliases,
+            self.function_analyzer.lookup_qualified,
+            self.function_analyzer.is_constant_global
+        )
+        
+        self.loop_dependence_analyzer = LoopDependenceAnalyzer(
+            self.symbol_table,
+            self.mutated_vars,
+            lambda var: self.mutation_tracker.has_aliases(var),
+            self.functions
+        )
+        
+        self.cost_model = CostModel(self.symbol_table, self.functions)
+        
         self.report_generator = ReportGenerator(
             self.symbol_table,
             self.functions,
             self.aliases,
             self.mutated_vars,
-            self.type_constraints
+            self.type_constraints,
+            self.loop_dependences,
+            self.purity_analyzer.reasons,
+            self.hot_functions,
+            self.function_costs
         )
     
     # Visitor methods
+    def visit_Module(self, node: ast.Module):
+        end = max((stmt.end_lineno for stmt in node.body), default=1)
+        self.scope_ranges["global"] = (1, end)
+        self.generic_visit(node)
+    
     def visit_Assign(self, node: ast.Assign):
         self.variable_tracker.handle_assign(node, self.mutation_tracker)
+        self.function_analyzer.record_assignment(node.targets, self.current_function, node.value)
         self.generic_visit(node)
     
     def visit_AugAssign(self, node: ast.AugAssign):
         self.variable_tracker.handle_aug_assign(node, self.mutated_vars)
+        self.function_analyzer.record_assignment([node.target], self.current_function)
         self.generic_visit(node)
     
+    def visit_Global(self, node: ast.Global):
+        self.function_analyzer.handle_global(node, self.current_function)
+    
+    def visit_Nonlocal(self, node: ast.Nonlocal):
+        self.function_analyzer.handle_global(node, self.current_function)
+    
     def visit_Name(self, node: ast.Name):
         self.variable_tracker.handle_name_usage(node)
         self.generic_visit(node)
     
     def visit_FunctionDef(self, node: ast.FunctionDef):
         func_name = node.name
+        outer_function = self.current_function
         self.current_function = func_name
         self.current_scope_name = f"function:{func_name}"
         self.scope_stack.append(self.current_scope_name)
+        self.scope_ranges[self.current_scope_name] = (node.lineno, node.end_lineno)
         
         self.function_analyzer.handle_function_def(
             node, lambda: self.current_scope_name, self.type_inferencer
@@ -102,9 +168,10 @@ class SemanticAnalyzer(ast.NodeVisitor):
         
         self.function_analyzer.finalize_function(func_name)
         
+        # A nested def returns to the enclosing function, not to module level
         self.scope_stack.pop()
         self.current_scope_name = self.scope_stack[-1]
-        self.current_function = None
+        self.current_function = outer_function
     
     def visit_Return(self, node: ast.Return):
         self.function_analyzer.handle_return(
@@ -116,6 +183,9 @@ class SemanticAnalyzer(ast.NodeVisitor):
         self.control_flow_analyzer.handle_for_loop(
             node, lambda: self.current_scope_name, self.type_inferencer
         )
+        self.function_analyzer.record_assignment(
+            [node.target], self.current_function, node.iter, iterated=True
+        )
         
         for stmt in node.body:
             self.visit(stmt)
@@ -124,22 +194,70 @@ class SemanticAnalyzer(ast.NodeVisitor):
     
     def visit_While(self, node: ast.While):
         self.control_flow_analyzer.handle_while_loop(node)
-        self.generic_visit(node)
+        self.visit_children(node)
         self.control_flow_analyzer.exit_loop()
     
     def visit_If(self, node: ast.If):
         self.generic_visit(node)
     
+    def visit_Import(self, node: ast.Import):
+        self.function_analyzer.handle_import(node)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        self.function_analyzer.handle_import(node)
+    
     def visit_Call(self, node: ast.Call):
         self.function_analyzer.handle_call(node, self.current_function)
         self.mutation_tracker.handle_method_call(node)
         self.generic_visit(node)
     
+    def _in_hot_code(self, line) -> bool:
+        hot_scopes = self.hot_scopes
+        if hot_scopes is None or line is None:
+            return True
+        for scope, (start, end) in self.scope_ranges.items():
+            if scope != "global" and start <= line <= end:
+                return scope in hot_scopes
+        return True
+    
     # PUBLIC API - These are the methods users call
+    def apply_profile(self, profile, coverage: float = 0.9):
+        """Limit the optional loop analyses to functions covering ``coverage``
+        of the profiled weight (run after visit, before the analyze_* passes).
+        Memory effects and purity still cover every scope."""
+        self.profile = profile
+        self.hot_functions[:] = profile.hot_functions(self.scope_ranges, coverage)
+        self.hot_scopes = {"global"} | {
+            f"function:{prof.name}" for prof in self.hot_functions
+        }
+    
     def analyze_memory_effects(self):
         """Analyze memory effects for all variables"""
         self.memory_analyzer.analyze_all()
     
+    def analyze_purity(self):
+        """Compute purity / memoizability for every function"""
+        self.purity_analyzer.analyze_all()
+    
+    def analyze_loops(self, ir_tree):
+        """Classify IR loops for parallelization (run after analyze_memory_effects)"""
+        should_analyze = None
+        if self.profile is not None:
+            annotate_ir(ir_tree, self.profile)
+            should_analyze = lambda loop: self._in_hot_code(loop.lineno)
+        self.loop_dependences[:] = self.loop_dependence_analyzer.analyze(ir_tree, should_analyze)
+        return self.loop_dependences
+    
+    def analyze_costs(self, ir_tree):
+        """Estimate allocations and work per function (run after analyze_memory_effects)"""
+        self.function_costs.clear()
+        self.function_costs.update(self.cost_model.analyze(ir_tree))
+        return self.function_costs
+    
     def generate_report(self) -> str:
         """Generate analysis report"""
-        return self.report_generator.generate_report()
\ No newline at end of file
+        return self.report_generator.generate_report()
+    
+    def build_query_index(self, ir_tree=None) -> QueryIndex:
+        """Build line/scope/type lookup tables over the analysis results"""
+        return QueryIndex(self.scoped_symbols, self.scope_ranges, ir_tree)
\ No newline at end of file
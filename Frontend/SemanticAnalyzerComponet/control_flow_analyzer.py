@@ -6,8 +6,9 @@ from Frontend.DataStructure import VariableInfo, VariableType
 class ControlFlowAnalyzer:
     """Analyzes control flow structures"""
     
-    def __init__(self, symbol_table, loop_variables):
+    def __init__(self, symbol_table, loop_variables, scoped_symbols=None):
         self.symbol_table = symbol_table
+        self.scoped_symbols = scoped_symbols if scoped_symbols is not None else {}
         self.loop_variables = loop_variables
         self.in_loop = False
     
@@ -30,6 +31,7 @@ class ControlFlowAnalyzer:
                 first_assignment_line=node.lineno
             )
             self.symbol_table[loop_var] = var_info
+            self.scoped_symbols.setdefault((var_info.scope, loop_var), var_info)
         
         return True  # Signal we're in loop
     
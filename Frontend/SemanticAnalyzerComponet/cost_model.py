@@ -0,0 +1,284 @@
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from Frontend.DataStructure import MemoryEffect, VariableType
+from Frontend.IR.Ir_nodes import *
+from .function_analyzer import CONTAINER_MUTATORS
+
+
+# Loops whose trip count cannot be read off the IR are assumed to run this often
+ASSUMED_TRIP_COUNT = 10
+
+# Relative cost of each event, in units of one simple IR operation
+ALLOCATION_COST = 20.0
+COPY_COST = 20.0
+REFCOUNT_COST = 2.0
+OP_COST = 1.0
+
+CONTAINER_TYPES = {VariableType.LIST, VariableType.DICT, VariableType.SET}
+SEQUENCE_TYPES = {VariableType.LIST, VariableType.STRING, VariableType.TUPLE}
+LITERAL_TYPES = {IRList: VariableType.LIST, IRDict: VariableType.DICT, IRSet: VariableType.SET}
+
+# Methods only containers have; calling one on a parameter makes it a container
+CONTAINER_METHODS = CONTAINER_MUTATORS | {'keys', 'values', 'items', 'get', 'copy'}
+
+ALLOCATING_BUILTINS = {'list', 'dict', 'set', 'sorted', 'tuple', 'str', 'repr', 'format', 'bytearray'}
+# Method calls that may (re)allocate: growth is counted as one allocation, an upper bound
+ALLOCATING_METHODS = {
+    'append', 'extend', 'insert', 'update', 'add', 'setdefault',
+    'copy', 'split', 'join', 'replace', 'strip', 'lower', 'upper', 'format',
+}
+
+
+@dataclass
+class FunctionCost:
+    """Static cost estimate of one function, weighted by loop trip counts"""
+    name: str
+    allocations: float = 0.0
+    loop_allocations: float = 0.0  # the part of allocations made inside loops
+    refcount_ops: float = 0.0
+    param_copies: int = 0  # container parameters passed by value, per call
+    work: float = 0.0
+    max_loop_depth: int = 0
+    sites: List[Tuple[Optional[int], str, float]] = field(default_factory=list)  # (line, what, weight)
+
+    @property
+    def score(self) -> float:
+        return (self.allocations * ALLOCATION_COST + self.param_copies * COPY_COST
+                + self.refcount_ops * REFCOUNT_COST + self.work * OP_COST)
+
+    def to_json(self) -> dict:
+        data = asdict(self)
+        data["score"] = self.score
+        data["sites"] = [list(site) for site in self.sites]
+        return data
+
+
+class CostModel:
+    """Estimates heap allocations, refcount traffic, parameter copies and
+    per-iteration work of each function from the IR and memory effects.
+
+    Everything inside an IRFor counts once per iteration, weighted by the
+    product of the trip counts of the enclosing loops: ``range()`` of
+    constants, constant literals, else ``ASSUMED_TRIP_COUNT``.
+
+    Parameters are containers when declared so, used as one in the body
+    (iterated, indexed, container methods) or passed a container at a call
+    site. Symbol lookups only use entries of the scope being costed.
+    """
+
+    def __init__(self, symbol_table, functions):
+        self.symbol_table = symbol_table
+        self.functions = functions
+        self._scope = "global"
+        self._container_args: Dict[str, set] = {}  # function -> params passed a container
+
+    def analyze(self, ir_module) -> Dict[str, FunctionCost]:
+        """FunctionCost per function; module-level code is ``<module>``"""
+        top_level = [stmt for stmt in ir_module.body if not isinstance(stmt, IRFunction)]
+        scopes = [("<module>", "global", top_level)] if top_level else []
+        scopes += [(stmt.func_name, f"function:{stmt.func_name}", stmt.body)
+                   for stmt in ir_module.body if isinstance(stmt, IRFunction)]
+
+        self._container_args = {}
+        for _, scope, body in scopes:
+            self._scope = scope
+            self._collect_container_args(body)
+
+        costs = {}
+        for name, scope, body in scopes:
+            self._scope = scope
+            costs[name] = self._function_cost(name, body)
+        self._scope = "global"
+        return costs
+
+    def _function_cost(self, name, body) -> FunctionCost:
+        cost = FunctionCost(name)
+        func_info = self.functions.get(name)
+        if func_info is not None:
+            containers = self._container_params(func_info, body)
+            for param in func_info.parameters:
+                # Mutated parameters are passed by reference
+                if param.name in containers and param.name not in func_info.modifies_params:
+                    cost.param_copies += 1
+                    cost.sites.append((param.first_assignment_line, f"copy of parameter {param.name}", 1.0))
+        self._stmts(body, cost, 1.0, 0)
+        cost.sites.sort(key=lambda site: (-site[2], site[0] or 0, site[1]))
+        return cost
+
+    def _container_params(self, func_info, body) -> set:
+        params = {p.name for p in func_info.parameters}
+        found = {p.name for p in func_info.parameters if p.var_type in CONTAINER_TYPES}
+        found |= self._container_args.get(func_info.name, set())
+        for node in self._nodes(body):
+            if isinstance(node, IRFor) and isinstance(node.it, IRVar):
+                found.add(node.it.name)
+            elif isinstance(node, IRSubscript) and isinstance(node.value, IRVar):
+                found.add(node.value.name)
+            elif (isinstance(node, IRCall) and isinstance(node.func, IRAttribute)
+                    and isinstance(node.func.value, IRVar) and node.func.attr in CONTAINER_METHODS):
+                found.add(node.func.value.name)
+        return found & params
+
+    def _collect_container_args(self, body):
+        """Record parameters of known functions that a call in body passes a container"""
+        for node in self._nodes(body):
+            if not (isinstance(node, IRCall) and isinstance(node.func, IRVar)
+                    and node.func.name in self.functions):
+                continue
+            callee = self.functions[node.func.name]
+            for param, arg in zip(callee.parameters, node.args):
+                if isinstance(arg, IRStarred):
+                    break
+                if self._type(arg) in CONTAINER_TYPES:
+                    self._container_args.setdefault(callee.name, set()).add(param.name)
+            for kw in node.keywords:
+                if kw.arg is not None and self._type(kw.value) in CONTAINER_TYPES:
+                    self._container_args.setdefault(callee.name, set()).add(kw.arg)
+
+    def _nodes(self, body):
+        """Every IR node in body, nested functions excluded"""
+        stack = [stmt for stmt in body if stmt is not None]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, IRFunction):
+                continue
+            yield node
+            for value in vars(node).values():
+                if isinstance(value, IRnode):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.extend(v for v in value if isinstance(v, IRnode))
+
+    def _info(self, name):
+        """Symbol table entry for name if it belongs to the scope being costed"""
+        var_info = self.symbol_table.get(name)
+        return var_info if var_info is not None and var_info.scope == self._scope else None
+
+    def _effect(self, name) -> Optional[MemoryEffect]:
+        return getattr(self._info(name), "memory_effect", None)
+
+    def _type(self, node) -> Optional[VariableType]:
+        if type(node) in LITERAL_TYPES:
+            return LITERAL_TYPES[type(node)]
+        if isinstance(node, IRConst) and isinstance(node.value, str):
+            return VariableType.STRING
+        if isinstance(node, IRVar):
+            var_info = self._info(node.name)
+            return var_info.var_type if var_info is not None else None
+        return None
+
+    # -------------------------
+    # Walk
+    # -------------------------
+    def _stmts(self, stmts, cost, weight, depth):
+        for stmt in stmts:
+            if stmt is None:
+                continue
+            cost.work += weight
+            if isinstance(stmt, IRFor):
+                self._expr(stmt.it, cost, weight, depth)
+                self._store(stmt.target, cost, weight, depth)
+                inner = depth + 1
+                cost.max_loop_depth = max(cost.max_loop_depth, inner)
+                self._stmts(stmt.body, cost, weight * self.trip_count(stmt), inner)
+            elif isinstance(stmt, IRIf):
+                self._expr(stmt.test, cost, weight, depth)
+                self._stmts(stmt.then_body, cost, weight, depth)
+                self._stmts(stmt.else_body, cost, weight, depth)
+            elif isinstance(stmt, (IRAssign, IRAugAssign)):
+                self._expr(stmt.value, cost, weight, depth)
+                self._store(stmt.target, cost, weight, depth)
+                if isinstance(stmt, IRAugAssign) and self._type(stmt.target) == VariableType.STRING:
+                    self._allocate(cost, stmt, "string concatenation", weight, depth)
+            elif isinstance(stmt, (IRExpr, IRReturn)):
+                if stmt.value is not None:
+                    self._expr(stmt.value, cost, weight, depth)
+
+    def trip_count(self, loop) -> float:
+        it = loop.it
+        if isinstance(it, (IRList, IRTuple, IRSet)):
+            return max(1, len(it.elements))
+        if (isinstance(it, IRCall) and isinstance(it.func, IRVar) and it.func.name == 'range'
+                and it.args and not it.keywords and all(isinstance(a, IRConst) and isinstance(a.value, int) for a in it.args)):
+            bounds = [a.value for a in it.args]
+            start, stop = (0, bounds[0]) if len(bounds) == 1 else (bounds[0], bounds[1])
+            step = bounds[2] if len(bounds) > 2 and bounds[2] else 1
+            return max(1, -(-(stop - start) // step))
+        return ASSUMED_TRIP_COUNT
+
+    def _store(self, target, cost, weight, depth):
+        if isinstance(target, IRVar):
+            self._refcount(target.name, cost, weight)
+        elif target is not None:
+            self._expr(target, cost, weight, depth)
+
+    def _refcount(self, name, cost, weight):
+        if self._effect(name) == MemoryEffect.HEAP_SHARED:
+            # increment on the new reference, decrement when it is dropped
+            cost.refcount_ops += 2 * weight
+
+    def _allocate(self, cost, node, what, weight, depth):
+        cost.allocations += weight
+        if depth:
+            cost.loop_allocations += weight
+        cost.sites.append((node.lineno, what, weight))
+
+    def _expr(self, node, cost, weight, depth):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            cost.work += weight
+
+            if isinstance(node, IRVar):
+                self._refcount(node.name, cost, weight)
+            elif isinstance(node, (IRList, IRSet, IRDict)):
+                self._allocate(cost, node, f"{node.__class__.__name__[2:].lower()} literal", weight, depth)
+            elif isinstance(node, IRBinary) and node.op in ('Add', 'Mult'):
+                operand_types = {self._type(node.left), self._type(node.right)}
+                if operand_types & SEQUENCE_TYPES:
+                    self._allocate(cost, node, f"{node.op.lower()} of sequences", weight, depth)
+            elif isinstance(node, IRCall):
+                self._call(node, cost, weight, depth)
+
+            for value in vars(node).values():
+                if isinstance(value, IRnode):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.extend(v for v in value if isinstance(v, IRnode))
+
+    def _call(self, node, cost, weight, depth):
+        func = node.func
+        if isinstance(func, IRVar):
+            if func.name in ALLOCATING_BUILTINS:
+                self._allocate(cost, node, f"{func.name}()", weight, depth)
+            elif func.name in self.functions:
+                callee = self.functions[func.name]
+                if callee.return_type in CONTAINER_TYPES:
+                    self._allocate(cost, node, f"{func.name}() result", weight, depth)
+        elif isinstance(func, IRAttribute) and func.attr in ALLOCATING_METHODS:
+            self._allocate(cost, node, f".{func.attr}()", weight, depth)
+
+
+# -------------------------
+# Machine-readable output
+# -------------------------
+def costs_to_json(costs: Dict[str, FunctionCost]) -> Dict[str, dict]:
+    return {name: cost.to_json() for name, cost in costs.items()}
+
+
+def find_regressions(baseline: Dict[str, dict], current: Dict[str, dict],
+                     metrics=("allocations", "loop_allocations", "param_copies"),
+                     tolerance: float = 0.0) -> List[Tuple[str, str, float, float]]:
+    """(function, metric, before, after) where current exceeds baseline by
+    more than ``tolerance`` (relative); new functions compare against zero"""
+    regressions = []
+    for name, after in sorted(current.items()):
+        before = baseline.get(name, {})
+        for metric in metrics:
+            old, new = before.get(metric, 0), after.get(metric, 0)
+            if new > old * (1 + tolerance) and new > old:
+                regressions.append((name, metric, old, new))
+    return regressions
@@ -1,15 +1,47 @@
 
 import ast
+import builtins
 from Frontend.DataStructure import FunctionInfo, VariableInfo, VariableType
+from .mutation_tracker import MUTATING_METHODS
+from .loop_dependence import NON_MUTATING_METHODS
+
+
+# Modules whose functions only compute values
+PURE_MODULES = {'math', 'cmath', 'operator'}
+
+# In-place mutators across the builtin containers
+CONTAINER_MUTATORS = set(MUTATING_METHODS) | {
+    'add', 'discard', 'insert', 'popitem', 'setdefault', 'update'
+}
+
+# Module-level values that cannot change without rebinding the name
+IMMUTABLE_TYPES = {VariableType.INT, VariableType.FLOAT, VariableType.STRING, VariableType.BOOL, VariableType.NONE}
+
+# Calls returning a new object (elements may still be shared)
+FRESH_BUILTINS = {'list', 'dict', 'set', 'tuple', 'sorted', 'bytearray', 'frozenset', 'str', 'range'}
+FRESH_METHODS = {'copy', 'split', 'rsplit', 'splitlines'}
+FRESH_NODES = (
+    ast.Constant, ast.List, ast.Tuple, ast.Set, ast.Dict, ast.ListComp, ast.SetComp,
+    ast.DictComp, ast.GeneratorExp, ast.BinOp, ast.UnaryOp, ast.Compare, ast.JoinedStr,
+)
 
 
 class FunctionAnalyzer:
     """Analyzes function definitions and calls"""
     
-    def __init__(self, symbol_table, functions, mutated_vars):
+    def __init__(self, symbol_table, functions, mutated_vars, imports=None,
+                 symbol_db=None, module_name=None, is_package=False, scoped_symbols=None):
         self.symbol_table = symbol_table
+        self.scoped_symbols = scoped_symbols if scoped_symbols is not None else {}
         self.functions = functions
         self.mutated_vars = mutated_vars
+        self.imports = imports if imports is not None else {}
+        self.symbol_db = symbol_db
+        self.module_name = module_name
+        self.is_package = is_package
+        # Module-level assignment targets, and those bound more than once
+        self.module_names = set()
+        self.rebound_module_names = set()
     
     def handle_function_def(self, node: ast.FunctionDef, current_scope, type_inferencer):
         """Process function definition"""
@@ -23,21 +55,46 @@ class FunctionAnalyzer:
                 var_type=VariableType.UNKNOWN,
                 scope=current_scope(),
                 is_parameter=True,
-                is_mutable=True
+                is_mutable=True,
+                first_assignment_line=arg.lineno
             )
             parameters.append(param_info)
             self.symbol_table[arg.arg] = param_info
+            self.scoped_symbols[(param_info.scope, arg.arg)] = param_info
         
         # Create function info
         func_info = FunctionInfo(
             name=func_name,
             parameters=parameters,
-            return_type=None
+            return_type=None,
+            local_names={p.name for p in parameters},
+            read_names=self._free_names(node.body)
         )
         self.functions[func_name] = func_info
         
         return func_info
     
+    def _free_names(self, nodes, bound=()):
+        """Names loaded in nodes and never bound there; nested defs are skipped
+        (their reads reach callers through calls), lambdas bind their args"""
+        loads, bound = set(), set(bound)
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                bound.add(node.name)
+                continue
+            if isinstance(node, ast.Lambda):
+                args = {a.arg for a in ast.walk(node.args) if isinstance(a, ast.arg)}
+                loads |= self._free_names([node.body], args)
+                continue
+            if isinstance(node, ast.Name):
+                (loads if isinstance(node.ctx, ast.Load) else bound).add(node.id)
+            elif isinstance(node, ast.ExceptHandler) and node.name:
+                bound.add(node.name)
+            stack.extend(ast.iter_child_nodes(node))
+        return loads - bound
+    
     def finalize_function(self, func_name):
         """Analyze which parameters were mutated"""
         if func_name in self.functions:
@@ -54,8 +111,192 @@ class FunctionAnalyzer:
     
     def handle_call(self, node: ast.Call, current_function):
         """Track function calls"""
-        if isinstance(node.func, ast.Name):
-            func_name = node.func.id
-            if current_function and current_function in self.functions:
-                self.functions[current_function].calls_functions.append(func_name)
+        callee, qualified_name = self._resolve(node)
+        
+        if current_function and current_function in self.functions:
+            if qualified_name:
+                self.functions[current_function].calls_functions.append(qualified_name)
+            elif isinstance(node.func, ast.Name):
+                self.functions[current_function].calls_functions.append(node.func.id)
+        
+        func_info = self.functions.get(current_function) if current_function else None
+        if func_info and isinstance(node.func, ast.Attribute) and not callee:
+            receiver = self._base_name(node.func.value)
+            method = node.func.attr
+            if method in CONTAINER_MUTATORS:
+                if receiver:
+                    func_info.mutated_names.add(receiver)
+            elif method not in NON_MUTATING_METHODS and not qualified_name:
+                func_info.impure_calls.append(f"{receiver or '<expr>'}.{method}")
+            elif qualified_name and qualified_name.split(".")[0] not in PURE_MODULES:
+                func_info.impure_calls.append(qualified_name)
+        
+        # Arguments passed to parameters the callee mutates are mutated too
+        if callee and callee.modifies_params:
+            mutated = []
+            for param, arg in zip(callee.parameters, node.args):
+                if isinstance(arg, ast.Starred):
+                    # Positions from *args on are unknown: its elements may be mutated
+                    mutated.append(arg.value)
+                    break
+                if param.name in callee.modifies_params:
+                    mutated.append(arg)
+            mutated.extend(kw.value for kw in node.keywords if kw.arg in callee.modifies_params)
+            for arg in mutated:
+                if isinstance(arg, ast.Name):
+                    self.mutated_vars.add(arg.id)
+                    if arg.id in self.symbol_table:
+                        self.symbol_table[arg.id].mutations.append(f"call:{qualified_name or callee.name}")
+    
+    def record_assignment(self, targets, current_function, value=None, iterated=False):
+        """Track local names, global rebinding and in-place stores per function.
+
+        ``value`` is the assigned expression, or the iterable when
+        ``iterated``; locals bound to objects the function did not create
+        (elements of a parameter, attributes, ...) are recorded as borrowed.
+        """
+        func_info = self.functions.get(current_function) if current_function else None
+        for target in targets:
+            if isinstance(target, ast.Name):
+                if func_info is None:
+                    if iterated or target.id in self.module_names:
+                        self.rebound_module_names.add(target.id)
+                    self.module_names.add(target.id)
+                elif target.id in func_info.global_names:
+                    func_info.mutated_names.add(target.id)
+                else:
+                    func_info.local_names.add(target.id)
+                    if self._borrows(value, iterated):
+                        func_info.borrowed_names.add(target.id)
+            elif isinstance(target, (ast.Tuple, ast.List)):
+                if (isinstance(value, (ast.Tuple, ast.List)) and not iterated
+                        and len(value.elts) == len(target.elts)):
+                    for element, element_value in zip(target.elts, value.elts):
+                        self.record_assignment([element], current_function, element_value)
+                else:
+                    self.record_assignment(target.elts, current_function, value, iterated)
+            elif isinstance(target, ast.Starred):
+                self.record_assignment([target.value], current_function, value, iterated)
+            elif func_info is not None:
+                # x[i] = ... / x.attr = ... mutate x
+                base = self._base_name(target)
+                if base:
+                    func_info.mutated_names.add(base)
+
+    def _borrows(self, value, iterated) -> bool:
+        """Whether a name bound from value may refer to an existing object"""
+        if value is None:
+            return False
+        if iterated:
+            # Elements of range() or of a literal of constants are fresh
+            if isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id == 'range':
+                return False
+            return not (isinstance(value, (ast.List, ast.Tuple, ast.Set))
+                        and all(isinstance(e, ast.Constant) for e in value.elts))
+        if isinstance(value, FRESH_NODES):
+            return False
+        if isinstance(value, ast.IfExp):
+            return self._borrows(value.body, False) or self._borrows(value.orelse, False)
+        if isinstance(value, ast.BoolOp):
+            return any(self._borrows(v, False) for v in value.values)
+        if isinstance(value, ast.Call):
+            func = value.func
+            if isinstance(func, ast.Name):
+                return func.id not in FRESH_BUILTINS
+            return not (isinstance(func, ast.Attribute) and func.attr in FRESH_METHODS)
+        # Names are tracked as aliases; subscripts and attributes share the container's objects
+        return not isinstance(value, ast.Name)
+    
+    def handle_global(self, node, current_function):
+        """Record global / nonlocal declarations"""
+        if current_function in self.functions:
+            self.functions[current_function].global_names.update(node.names)
+    
+    def is_constant_global(self, name) -> bool:
+        """Whether a free name read by a function always refers to the same value:
+        a builtin, import or function, or an immutable module-level value bound once"""
+        if name in self.module_names:
+            if name in self.rebound_module_names:
+                return False
+            if any(name in f.global_names and name in f.mutated_names for f in self.functions.values()):
+                return False
+            var_info = self.symbol_table.get(name)
+            return var_info is not None and var_info.scope == "global" and var_info.var_type in IMMUTABLE_TYPES
+        return name in self.functions or name in self.imports or hasattr(builtins, name)
+    
+    def lookup_qualified(self, qualified_name):
+        """FunctionInfo for an imported 'module.name', if indexed"""
+        module, _, name = qualified_name.rpartition(".")
+        return self._lookup(module, name) if module else None
+    
+    def _base_name(self, node):
+        while isinstance(node, (ast.Attribute, ast.Subscript)):
+            node = node.value
+        return node.id if isinstance(node, ast.Name) else None
+    
+    def handle_import(self, node):
+        """Record local names bound by import / from-import"""
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    self.imports[alias.asname] = (alias.name, None)
+                else:
+                    top = alias.name.split(".")[0]
+                    self.imports[top] = (top, None)
+        else:
+            module = self._absolute_module(node.module, node.level)
+            if module is None:
+                return
+            for alias in node.names:
+                if alias.name != "*":
+                    self.imports[alias.asname or alias.name] = (module, alias.name)
+    
+    def resolve_call(self, node: ast.Call):
+        """FunctionInfo of the callee, if it is known locally or project-wide"""
+        return self._resolve(node)[0]
+    
+    def _resolve(self, node: ast.Call):
+        """Return (FunctionInfo or None, qualified name for imported callees)"""
+        func = node.func
+        if isinstance(func, ast.Name):
+            if func.id in self.functions:
+                return self.functions[func.id], None
+            target = self.imports.get(func.id)
+            if target and target[1]:
+                module, name = target
+                return self._lookup(module, name), f"{module}.{name}"
+            return None, None
+        
+        # module.func(...) / package.module.func(...)
+        if isinstance(func, ast.Attribute):
+            parts = []
+            value = func.value
+            while isinstance(value, ast.Attribute):
+                parts.append(value.attr)
+                value = value.value
+            if isinstance(value, ast.Name) and value.id in self.imports:
+                module, name = self.imports[value.id]
+                dotted = ".".join([module] + ([name] if name else []) + parts[::-1])
+                return self._lookup(dotted, func.attr), f"{dotted}.{func.attr}"
+        return None, None
+    
+    def _lookup(self, module, name):
+        if self.symbol_db is None:
+            return None
+        return self.symbol_db.lookup_function(module, name)
+    
+    def _absolute_module(self, module, level):
+        """Turn a (possibly relative) from-import into an absolute module name"""
+        if not level:
+            return module
+        if not self.module_name:
+            return None
+        parts = self.module_name.split(".")
+        keep = len(parts) - level + (1 if self.is_package else 0)
+        if keep < 0:
+            return None
+        base = parts[:keep]
+        if module:
+            base.append(module)
+        return ".".join(base) or None
 
@@ -0,0 +1,444 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from Frontend.DataStructure import LoopDependence, LoopKind, MemoryEffect, VariableType
+from Frontend.IR.Ir_nodes import *
+from .mutation_tracker import MUTATING_METHODS
+
+
+# Operators whose partial results can be computed per chunk and combined.
+# Sub is folded into Add: `v = v - e` accumulates -e.
+REDUCTION_OPS = {'Add', 'Sub', 'Mult', 'BitOr', 'BitAnd', 'BitXor'}
+
+# Accumulator types whose reductions are associative with a known identity;
+# `s = s + x` on a str or list is an ordered, loop-carried dependence
+REDUCTION_TYPES = {VariableType.INT, VariableType.FLOAT, VariableType.BOOL}
+
+PURE_BUILTINS = {
+    'abs', 'all', 'any', 'bool', 'chr', 'divmod', 'float', 'hash', 'int',
+    'isinstance', 'len', 'max', 'min', 'ord', 'pow', 'range', 'round',
+    'sorted', 'str', 'sum', 'tuple'
+}
+
+NON_MUTATING_METHODS = {
+    'count', 'endswith', 'find', 'format', 'get', 'index', 'items', 'join',
+    'keys', 'lower', 'lstrip', 'replace', 'rstrip', 'split', 'startswith',
+    'strip', 'upper', 'values'
+}
+
+
+class _Uses:
+    """Reads, calls and writes collected from one loop body"""
+
+    def __init__(self):
+        self.reads: Dict[str, int] = {}                  # plain reads per name
+        self.indexed_reads: Dict[str, List] = {}         # name -> index exprs of name[...]
+        self.calls: List[IRCall] = []
+        self.writes: Dict[str, List] = {}                # name -> assigning statements
+        self.indexed_writes: Dict[str, List] = {}        # name -> index exprs of name[...] = ...
+        self.read_before_write: Set[str] = set()
+        self.problem: Optional[str] = None
+
+
+class LoopDependenceAnalyzer:
+    """Classifies IRFor loops as parallel, parallel-with-reduction or sequential"""
+
+    def __init__(self, symbol_table, mutated_vars, alias_checker, functions):
+        self.symbol_table = symbol_table
+        self.mutated_vars = mutated_vars
+        self.alias_checker = alias_checker
+        self.functions = functions
+
+    def analyze(self, ir_module, should_analyze=None) -> List[Tuple[IRFor, LoopDependence]]:
+        """Classify every loop; the result is also stored as loop.dependence"""
+        results = []
+        # _loops does not enter function bodies; _reads_outside sees what they read
+        scopes = [("global", ir_module.body)] + [
+            (f"function:{f.func_name}", f.body) for f in ir_module.body if isinstance(f, IRFunction)
+        ]
+
+        for scope, body in scopes:
+            for loop in self._loops(body):
+                if should_analyze is not None and not should_analyze(loop):
+                    continue
+                dependence = self.classify(loop, self._reads_outside(body, loop), scope)
+                dependence.hoistable_calls = self.hoistable_calls(loop)
+                loop.dependence = dependence
+                results.append((loop, dependence))
+        return results
+
+    def classify(self, loop: IRFor, outside_reads: Set[str], scope: Optional[str] = None) -> LoopDependence:
+        """Classify one loop given the names read outside it in its scope"""
+        if not isinstance(loop.target, IRVar):
+            return self._sequential("loop target is not a simple name")
+        target = loop.target.name
+
+        uses = _Uses()
+        self._walk(loop.body, {target}, uses)
+        if uses.problem:
+            return self._sequential(uses.problem)
+
+        # The iterable must not change while we iterate it
+        iter_uses = _Uses()
+        self._collect(loop.it, iter_uses, set())
+        for name in list(iter_uses.reads) + list(iter_uses.indexed_reads):
+            if name in uses.writes or name in uses.indexed_writes:
+                return self._sequential(f"iterable {name} is modified in the loop")
+
+        # Only a target no statement rebinds takes a distinct value per iteration
+        if target in uses.writes:
+            return self._sequential(f"loop variable {target} is reassigned in the body")
+
+        reductions: Dict[str, str] = {}
+        reduction_types: Dict[str, VariableType] = {}
+        private_vars: Set[str] = set()
+        for name, stmts in uses.writes.items():
+            op = self._reduction_op(name, stmts, uses)
+            var_type = self._var_type(name, scope)
+            if op and var_type in REDUCTION_TYPES:
+                reductions[name] = op
+                reduction_types[name] = var_type
+            elif op:
+                return self._sequential(f"{name} accumulates a value not known to be numeric")
+            elif name in outside_reads:
+                return self._sequential(f"{name} is used after the loop")
+            elif name in uses.read_before_write:
+                return self._sequential(f"{name} carries a value between iterations")
+            else:
+                private_vars.add(name)
+
+        if target in outside_reads:
+            return self._sequential(f"loop variable {target} is used after the loop")
+
+        for name in list(reductions) + list(private_vars):
+            if self._is_shared(name):
+                return self._sequential(f"{name} is aliased")
+
+        reason = self._check_calls(uses, private_vars | {target})
+        if reason:
+            return self._sequential(reason)
+
+        reason = self._check_indexed_writes(loop, target, uses, private_vars)
+        if reason:
+            return self._sequential(reason)
+
+        local = private_vars | set(reductions) | {target}
+        shared_reads = {
+            name for name in list(uses.reads) + list(uses.indexed_reads)
+            if name not in local and name in self.symbol_table
+        }
+
+        return LoopDependence(
+            kind=LoopKind.PARALLEL_REDUCTION if reductions else LoopKind.PARALLEL,
+            reductions=reductions,
+            reduction_types=reduction_types,
+            private_vars=private_vars,
+            shared_reads=shared_reads,
+            shared_writes=set(uses.indexed_writes) - private_vars
+        )
+
+    def _sequential(self, reason):
+        return LoopDependence(kind=LoopKind.SEQUENTIAL, reason=reason)
+
+    def _var_type(self, name, scope) -> Optional[VariableType]:
+        """Type of name, if the symbol table entry belongs to scope"""
+        var_info = self.symbol_table.get(name)
+        if var_info is None or (scope is not None and var_info.scope != scope):
+            return None
+        return var_info.var_type
+
+    def _is_shared(self, name):
+        if self.alias_checker(name):
+            return True
+        var_info = self.symbol_table.get(name)
+        return getattr(var_info, "memory_effect", None) == MemoryEffect.HEAP_SHARED
+
+    # -------------------------
+    # Body walk
+    # -------------------------
+    def _walk(self, stmts, defined: Set[str], uses: _Uses):
+        """Collect uses in statement order, tracking names already assigned this iteration"""
+        for stmt in stmts:
+            if uses.problem:
+                return
+
+            if isinstance(stmt, IRAssign):
+                self._collect(stmt.value, uses, defined)
+                self._write_target(stmt, stmt.target, uses, defined)
+                if isinstance(stmt.target, IRVar):
+                    defined.add(stmt.target.name)
+
+            elif isinstance(stmt, IRAugAssign):
+                self._collect(stmt.value, uses, defined)
+                self._collect(stmt.target, uses, defined)
+                self._write_target(stmt, stmt.target, uses, defined)
+
+            elif isinstance(stmt, IRExpr):
+                self._collect(stmt.value, uses, defined)
+
+            elif isinstance(stmt, IRIf):
+                self._collect(stmt.test, uses, defined)
+                then_defined, else_defined = set(defined), set(defined)
+                self._walk(stmt.then_body, then_defined, uses)
+                self._walk(stmt.else_body, else_defined, uses)
+                defined |= then_defined & else_defined
+
+            elif isinstance(stmt, IRFor):
+                self._collect(stmt.it, uses, defined)
+                if not isinstance(stmt.target, IRVar):
+                    uses.problem = "inner loop target is not a simple name"
+                    return
+                uses.writes.setdefault(stmt.target.name, []).append(stmt)
+                # The inner body may run zero times, so its assignments stay local
+                self._walk(stmt.body, defined | {stmt.target.name}, uses)
+
+            elif isinstance(stmt, IRReturn):
+                uses.problem = "loop body returns early"
+
+            else:
+                uses.problem = "loop body contains a statement the IR does not model"
+
+    def _write_target(self, stmt, target, uses, defined):
+        if isinstance(target, IRVar):
+            uses.writes.setdefault(target.name, []).append(stmt)
+        elif isinstance(target, IRSubscript) and isinstance(target.value, IRVar):
+            self._collect(target.index, uses, defined)
+            uses.indexed_writes.setdefault(target.value.name, []).append(target.index)
+        else:
+            uses.problem = "loop body assigns to a complex target"
+
+    def _collect(self, expr, uses: _Uses, defined: Set[str]):
+        """Record reads and calls inside an expression"""
+        if expr is None:
+            uses.problem = uses.problem or "loop body contains an expression the IR does not model"
+        elif isinstance(expr, IRVar):
+            uses.reads[expr.name] = uses.reads.get(expr.name, 0) + 1
+            if expr.name not in defined:
+                uses.read_before_write.add(expr.name)
+        elif isinstance(expr, IRSubscript) and isinstance(expr.value, IRVar):
+            name = expr.value.name
+            uses.indexed_reads.setdefault(name, []).append(expr.index)
+            if name not in defined:
+                uses.read_before_write.add(name)
+            self._collect(expr.index, uses, defined)
+        elif isinstance(expr, IRCall):
+            uses.calls.append(expr)
+            if isinstance(expr.func, IRAttribute):
+                self._collect(expr.func.value, uses, defined)
+            for arg in expr.args + expr.keywords:
+                self._collect(arg, uses, defined)
+        else:
+            for child in self._children(expr):
+                self._collect(child, uses, defined)
+
+    def _children(self, node):
+        for value in vars(node).values():
+            if isinstance(value, IRnode):
+                yield value
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, IRnode):
+                        yield item
+
+    # -------------------------
+    # Checks
+    # -------------------------
+    def _reduction_op(self, name, stmts, uses: _Uses) -> Optional[str]:
+        """Reduction operator if every write of name is `name = name op e`"""
+        ops = set()
+        for stmt in stmts:
+            if isinstance(stmt, IRAugAssign) and stmt.op in REDUCTION_OPS:
+                if name in self._names(stmt.value):
+                    return None
+                ops.add(stmt.op)
+            elif isinstance(stmt, IRAssign) and isinstance(stmt.value, IRBinary):
+                op = stmt.value.op
+                if op not in REDUCTION_OPS:
+                    return None
+                leaves = self._flatten(stmt.value, op)
+                own = [sign for leaf, sign in leaves
+                       if isinstance(leaf, IRVar) and leaf.name == name]
+                others = [leaf for leaf, _ in leaves
+                          if not (isinstance(leaf, IRVar) and leaf.name == name)]
+                if own != [1] or any(name in self._names(leaf) for leaf in others):
+                    return None
+                ops.add(op)
+            else:
+                return None
+
+        ops = {'Add' if op == 'Sub' else op for op in ops}
+        # The only reads of name must be the one inside each update
+        if len(ops) != 1 or uses.reads.get(name, 0) != len(stmts) or name in uses.indexed_reads:
+            return None
+        return ops.pop()
+
+    def _flatten(self, expr, op):
+        """Leaves of an op chain with their sign (+1/-1 for additive chains)"""
+        family = {'Add', 'Sub'} if op in ('Add', 'Sub') else {op}
+        leaves = []
+        stack = [(expr, 1)]
+        while stack:
+            node, sign = stack.pop()
+            if isinstance(node, IRBinary) and node.op in family:
+                stack.append((node.right, -sign if node.op == 'Sub' else sign))
+                stack.append((node.left, sign))
+            else:
+                leaves.append((node, sign))
+        return leaves
+
+    def _check_calls(self, uses: _Uses, private: Set[str]) -> Optional[str]:
+        for call in uses.calls:
+            func = call.func
+            if isinstance(func, IRVar):
+                if func.name in uses.writes:
+                    return f"calls {func.name}, which is reassigned in the loop"
+                if not self._is_safe_function(func.name):
+                    return f"calls {func.name}, which may have side effects"
+                written = sorted(self._global_reads(func.name) & set(uses.writes))
+                if written:
+                    return f"calls {func.name}, which reads {written[0]} written in the loop"
+            elif isinstance(func, IRAttribute) and isinstance(func.value, IRVar):
+                receiver, method = func.value.name, func.attr
+                if method in MUTATING_METHODS:
+                    if receiver not in private:
+                        return f"mutates shared {receiver} via {method}()"
+                elif method not in NON_MUTATING_METHODS:
+                    return f"calls {receiver}.{method}(), which may have side effects"
+            else:
+                return "calls an unknown function"
+        return None
+
+    def _is_safe_function(self, func_name) -> bool:
+        """Calls that cannot carry state between iterations"""
+        if func_name in self.functions:
+            return bool(self.functions[func_name].is_pure)
+        return func_name in PURE_BUILTINS
+
+    def _global_reads(self, func_name) -> Set[str]:
+        func_info = self.functions.get(func_name)
+        return func_info.global_reads if func_info is not None else set()
+
+    def hoistable_calls(self, loop: IRFor) -> List[IRCall]:
+        """Pure calls in the body whose arguments do not change across iterations"""
+        uses = _Uses()
+        self._walk(loop.body, set(), uses)
+        if uses.problem:
+            # Writes after the statement that stopped the walk are unknown
+            return []
+        varying = set(uses.writes) | set(uses.indexed_writes)
+        if isinstance(loop.target, IRVar):
+            varying.add(loop.target.name)
+        for call in uses.calls:
+            func = call.func
+            if isinstance(func, IRAttribute) and isinstance(func.value, IRVar):
+                if func.attr not in NON_MUTATING_METHODS:
+                    varying.add(func.value.name)
+
+        hoistable = []
+        for call in uses.calls:
+            if not isinstance(call.func, IRVar) or call.func.name in varying:
+                continue
+            if not self._is_safe_function(call.func.name) or self._global_reads(call.func.name) & varying:
+                continue
+            inner = _Uses()
+            for arg in call.args + call.keywords:
+                self._collect(arg, inner, set())
+            names = set(inner.reads) | set(inner.indexed_reads)
+            if inner.problem or names & varying:
+                continue
+            if any(not (isinstance(c.func, IRVar) and self._is_safe_function(c.func.name))
+                   or self._global_reads(c.func.name) & varying for c in inner.calls):
+                continue
+            hoistable.append(call)
+        return hoistable
+
+    def _check_indexed_writes(self, loop, target, uses: _Uses, private_vars) -> Optional[str]:
+        """`a[i] = ...` is independent only when i takes a distinct value per iteration"""
+        for name, indices in uses.indexed_writes.items():
+            if name in private_vars:
+                continue
+            distinct = (isinstance(loop.it, IRCall) and isinstance(loop.it.func, IRVar)
+                        and loop.it.func.name == 'range')
+            if not distinct:
+                return f"writes {name}[...] while iterating a sequence that may repeat"
+            if name in uses.writes or self._is_shared(name):
+                return f"{name} is reassigned or aliased"
+            if uses.reads.get(name):
+                return f"{name} is read whole while its elements are written"
+            for index in indices + uses.indexed_reads.get(name, []):
+                if not (isinstance(index, IRVar) and index.name == target):
+                    return f"{name} is indexed by something other than {target}"
+        return None
+
+    # -------------------------
+    # Scope helpers
+    # -------------------------
+    def _loops(self, stmts):
+        for stmt in stmts:
+            if isinstance(stmt, IRFor):
+                yield stmt
+                yield from self._loops(stmt.body)
+            elif isinstance(stmt, IRIf):
+                yield from self._loops(stmt.then_body)
+                yield from self._loops(stmt.else_body)
+
+    def _reads_outside(self, stmts, loop) -> Set[str]:
+        """Names read anywhere in the scope except inside loop, including
+        the free names of nested defs (they may run after the loop)"""
+        names = set()
+        stack = list(stmts)
+        while stack:
+            node = stack.pop()
+            if node is loop or node is None:
+                continue
+            if isinstance(node, IRFunction):
+                names |= self._free_reads(node)
+                stack.extend(self._header(node))
+            elif isinstance(node, IRVar):
+                names.add(node.name)
+            elif isinstance(node, IRAssign) and isinstance(node.target, IRVar):
+                stack.append(node.value)
+            elif isinstance(node, IRFor) and isinstance(node.target, IRVar):
+                stack.append(node.it)
+                stack.extend(node.body)
+            else:
+                stack.extend(self._children(node))
+        return names
+
+    def _free_reads(self, func: IRFunction) -> Set[str]:
+        """Names func (or a def nested in it) reads without binding them"""
+        reads = set()
+        bound = set(func.params) | set(func.kwonly) | {n for n in (func.vararg, func.kwarg) if n}
+        stack = [stmt for stmt in func.body if stmt is not None]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, IRFunction):
+                bound.add(node.func_name)
+                reads |= self._free_reads(node)
+                stack.extend(self._header(node))
+                continue
+            if (isinstance(node, (IRAssign, IRAugAssign, IRFor))
+                    and isinstance(node.target, (IRVar, IRTuple, IRList))):
+                bound |= self._names(node.target)
+            elif isinstance(node, IRImport):
+                bound |= import_bindings(node)
+            if isinstance(node, IRVar):
+                reads.add(node.name)
+            elif isinstance(node, IRnode):
+                stack.extend(self._children(node))
+        return reads - bound
+
+    def _header(self, func: IRFunction) -> List:
+        """Decorators and defaults of func, evaluated where it is defined"""
+        return [node for node in func.decorators + func.defaults + list(func.kw_defaults.values())
+                if node is not None]
+
+    def _names(self, expr) -> Set[str]:
+        names = set()
+        stack = [expr]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, IRVar):
+                names.add(node.name)
+            elif isinstance(node, IRnode):
+                stack.extend(self._children(node))
+        return names
@@ -3,6 +3,10 @@ import ast
 from typing import Dict, Set
 
 
+# List methods that modify their receiver in place
+MUTATING_METHODS = ['append', 'extend', 'remove', 'pop', 'sort', 'reverse', 'clear']
+
+
 class MutationTracker:
     """Tracks mutations and aliasing"""
     
@@ -36,7 +40,7 @@ class MutationTracker:
             method = node.func.attr
             
             # Mutating methods
-            if method in ['append', 'extend', 'remove', 'pop', 'sort', 'reverse', 'clear']:
+            if method in MUTATING_METHODS:
                 if isinstance(node.func.value, ast.Name):
                     var_name = node.func.value.id
                     self.mutated_vars.add(var_name)
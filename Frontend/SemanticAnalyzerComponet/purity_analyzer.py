@@ -0,0 +1,143 @@
+from typing import Dict, List, Optional, Tuple
+
+from Frontend.DataStructure import FunctionInfo, VariableType
+from Frontend.IR.Ir_nodes import *
+from .loop_dependence import PURE_BUILTINS
+from .function_analyzer import PURE_MODULES
+
+
+# Types that cannot be memo table keys, or would be shared between callers
+# if a cached result were handed out twice
+UNHASHABLE_TYPES = {VariableType.LIST, VariableType.DICT, VariableType.SET}
+
+
+def _scalar_const(node) -> bool:
+    return isinstance(node, IRConst) and type(node.value) in (int, float, bool)
+
+
+class PurityAnalyzer:
+    """Computes side-effect freedom per function and propagates it through callees"""
+
+    def __init__(self, functions, aliases, lookup_qualified, is_constant_global=None):
+        self.functions = functions
+        self.aliases = aliases
+        self.lookup_qualified = lookup_qualified
+        self.is_constant_global = is_constant_global or (lambda name: False)
+        self.reasons: Dict[str, str] = {}
+
+    def analyze_all(self):
+        """Set is_pure / has_side_effects / is_memoizable on every function"""
+        self.reasons.clear()
+        for func_name, func_info in self.functions.items():
+            reason = self._local_effect(func_info)
+            if reason:
+                self.reasons[func_name] = reason
+
+        # Greatest fixpoint: a function stays pure while all its callees do,
+        # so (mutually) recursive pure functions remain pure
+        changed = True
+        while changed:
+            changed = False
+            for func_name, func_info in self.functions.items():
+                if func_name in self.reasons:
+                    continue
+                for callee in func_info.calls_functions:
+                    reason = self._callee_effect(callee)
+                    if reason:
+                        self.reasons[func_name] = reason
+                        changed = True
+                        break
+
+        self._global_reads()
+        for func_name, func_info in self.functions.items():
+            func_info.is_pure = func_name not in self.reasons
+            func_info.has_side_effects = not func_info.is_pure
+            func_info.is_memoizable = func_info.is_pure and self._memoizable(func_info)
+
+    def _global_reads(self):
+        """Set global_reads: free names that may change between calls, through local callees"""
+        for func_info in self.functions.values():
+            func_info.global_reads = {
+                name for name in func_info.read_names - func_info.local_names
+                if not self.is_constant_global(name)
+            }
+        changed = True
+        while changed:
+            changed = False
+            for func_info in self.functions.values():
+                for callee in func_info.calls_functions:
+                    if callee in self.functions and callee != func_info.name:
+                        missing = self.functions[callee].global_reads - func_info.global_reads
+                        if missing:
+                            func_info.global_reads |= missing
+                            changed = True
+
+    def _local_effect(self, func_info: FunctionInfo) -> Optional[str]:
+        """Side effect visible in the function's own body, if any"""
+        if func_info.modifies_params:
+            return f"mutates parameter {sorted(func_info.modifies_params)[0]}"
+
+        params = {p.name for p in func_info.parameters}
+        owned = func_info.local_names - params - func_info.global_names - func_info.borrowed_names
+        for name in sorted(func_info.mutated_names):
+            if name in func_info.global_names:
+                return f"writes global {name}"
+            if name in func_info.borrowed_names:
+                return f"mutates {name}, which refers to an object it did not create"
+            if name not in owned:
+                return f"mutates {name}, which it does not own"
+            escaped = self.aliases.get(name, {name}) - owned
+            if escaped:
+                return f"mutates {name}, an alias of {sorted(escaped)[0]}"
+
+        if func_info.impure_calls:
+            return f"calls {func_info.impure_calls[0]}"
+        return None
+
+    def _callee_effect(self, callee: str) -> Optional[str]:
+        if callee in self.functions:
+            if callee in self.reasons:
+                return f"calls impure {callee}"
+            return None
+        if "." in callee:
+            if callee.split(".")[0] in PURE_MODULES:
+                return None
+            info = self.lookup_qualified(callee)
+            if info is None or not info.is_pure:
+                return f"calls {callee}"
+            return None
+        if callee in PURE_BUILTINS:
+            return None
+        return f"calls {callee}"
+
+    def _memoizable(self, func_info: FunctionInfo) -> bool:
+        """Pure, reads no changing global, returns an immutable value, and no
+        parameter is known to be unhashable. Parameters may still be mutable
+        objects the function dereferences, so memo tables must only key on
+        immutable arguments (see ``Backend.python_emitter.MEMO_HELPER``)"""
+        if func_info.global_reads:
+            return False
+        if func_info.return_type in (None, VariableType.NONE) or func_info.return_type in UNHASHABLE_TYPES:
+            return False
+        return all(p.var_type not in UNHASHABLE_TYPES for p in func_info.parameters)
+
+    def constant_calls(self, ir_module, scalar_only=False) -> List[Tuple[str, Optional[int]]]:
+        """(function, line) of pure calls whose arguments are all constants;
+        with ``scalar_only`` the constants must be ints, floats or bools"""
+        constant = _scalar_const if scalar_only else (lambda arg: isinstance(arg, IRConst))
+        found = []
+        stack = [ir_module]
+        while stack:
+            node = stack.pop()
+            if (isinstance(node, IRCall) and isinstance(node.func, IRVar)
+                    and node.func.name in self.functions
+                    and self.functions[node.func.name].is_pure
+                    and all(constant(arg) for arg in node.args)
+                    and all(constant(kw.value) for kw in node.keywords)):
+                found.append((node.func.name, node.lineno))
+            for value in vars(node).values():
+                if isinstance(value, IRnode):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.extend(v for v in value if isinstance(v, IRnode))
+        return sorted(found, key=lambda call: (call[1] or 0, call[0]))
@@ -7,9 +7,11 @@ from Frontend.DataStructure import VariableType
 class TypeInferencer:
     """Handles all type inference logic"""
     
-    def __init__(self, symbol_table, mutated_vars):
+    def __init__(self, symbol_table, mutated_vars, call_resolver=None):
         self.symbol_table = symbol_table
         self.mutated_vars = mutated_vars
+        # node -> FunctionInfo for user-defined / imported callees
+        self.call_resolver = call_resolver
     
     def infer_type(self, node: ast.AST) -> Tuple[VariableType, Optional[VariableType]]:
         """
@@ -85,14 +87,27 @@ class TypeInferencer:
                 'range': (VariableType.LIST, VariableType.INT),
             }
             
-            return builtin_types.get(func_name, (VariableType.UNKNOWN, None))
+            if func_name in builtin_types:
+                return builtin_types[func_name]
+            return self._infer_resolved_call_type(node)
         
         # Method calls
         elif isinstance(node.func, ast.Attribute):
+            result = self._infer_resolved_call_type(node)
+            if result[0] != VariableType.UNKNOWN:
+                return result
             return self._infer_method_type(node)
         
         return VariableType.UNKNOWN, None
     
+    def _infer_resolved_call_type(self, node: ast.Call) -> Tuple[VariableType, Optional[VariableType]]:
+        """Return type recorded for a known function"""
+        if self.call_resolver:
+            callee = self.call_resolver(node)
+            if callee and callee.return_type:
+                return callee.return_type, None
+        return VariableType.UNKNOWN, None
+    
     def _infer_method_type(self, node: ast.Call) -> Tuple[VariableType, Optional[VariableType]]:
         """Infer return type of method calls"""
         method = node.func.attr
@@ -7,8 +7,12 @@ from Frontend.DataStructure import VariableInfo, TypeConstraint, VariableType
 class VariableTracker:
     """Tracks variable assignments and usage"""
     
-    def __init__(self, symbol_table, type_constraints, current_scope, type_inferencer):
+    def __init__(self, symbol_table, type_constraints, current_scope, type_inferencer,
+                 scoped_symbols=None):
         self.symbol_table = symbol_table
+        # (scope, name) -> VariableInfo; shares the symbol_table entry in the
+        # scope that first bound the name
+        self.scoped_symbols = scoped_symbols if scoped_symbols is not None else {}
         self.type_constraints = type_constraints
         self.current_scope = current_scope
         self.type_inferencer = type_inferencer
@@ -29,7 +33,8 @@ class VariableTracker:
                     # Update existing variable
                     var_info = self.symbol_table[var_name]
                     
-                    if var_info.var_type != var_type:
+                    # Another function's variable of the same name keeps its type
+                    if var_info.scope == self.current_scope() and var_info.var_type != var_type:
                         var_info.is_reassigned = True
                         var_info.var_type = var_type
                 else:
@@ -43,6 +48,8 @@ class VariableTracker:
                     )
                     self.symbol_table[var_name] = var_info
                 
+                self._record_scoped(var_info, var_type, element_type, node.lineno)
+                
                 # Track aliasing
                 if is_alias:
                     source_var = node.value.id
@@ -55,11 +62,36 @@ class VariableTracker:
                     reason=f"assigned at line {node.lineno}"
                 ))
     
+    def _record_scoped(self, var_info, var_type, element_type, line):
+        """Keep a per-scope entry for an assigned name"""
+        scope = self.current_scope()
+        scoped = self.scoped_symbols.get((scope, var_info.name))
+        if scoped is None:
+            if var_info.scope != scope:
+                var_info = VariableInfo(
+                    name=var_info.name,
+                    var_type=var_type,
+                    element_type=element_type,
+                    scope=scope,
+                    first_assignment_line=line
+                )
+            self.scoped_symbols[(scope, var_info.name)] = var_info
+        elif scoped is not var_info and scoped.var_type != var_type:
+            scoped.is_reassigned = True
+            scoped.var_type = var_type
+    
     def handle_name_usage(self, node: ast.Name):
         """Track variable usage"""
         var_name = node.id
-        if var_name in self.symbol_table:
-            self.symbol_table[var_name].usage_lines.append(node.lineno)
+        var_info = self.symbol_table.get(var_name)
+        if var_info is not None:
+            var_info.usage_lines.append(node.lineno)
+        
+        # Names not bound in the current scope resolve to the module
+        scoped = (self.scoped_symbols.get((self.current_scope(), var_name))
+                  or self.scoped_symbols.get(("global", var_name)))
+        if scoped is not None and scoped is not var_info:
+            scoped.usage_lines.append(node.lineno)
     
     def handle_aug_assign(self, node: ast.AugAssign, mutated_vars):
         """Handle augmented assignment (+=, -=, etc.)"""
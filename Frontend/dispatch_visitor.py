@@ -0,0 +1,94 @@
+import ast
+
+
+class DispatchVisitor:
+    """Visitor base with a per-class dispatch table.
+
+    Handlers are looked up by name (``visit_<ClassName>``) only the first
+    time a node type is seen; after that every visit is one dict lookup on
+    ``type(node)`` and a direct call of the unbound handler.
+
+    Extra handler families (e.g. ``expr_<ClassName>``) are listed in
+    ``dispatch_prefixes`` and resolved through ``handler_for``.
+
+    Setting ``iterative = True`` makes ``generic_visit`` schedule children on
+    an explicit work list instead of recursing, so traversal depth no longer
+    follows expression nesting. Handlers that must run code *after* their
+    children should visit them with ``visit_children`` (or explicit
+    ``self.visit`` calls), which always completes before returning. The
+    work list costs about 10% over recursive traversal
+    (benchmarks/bench_visitor.py), so use it only for very deep trees.
+    """
+
+    iterative = False
+    dispatch_prefixes = ("visit_",)
+    _tables = {}
+    _visit_table = {}
+    _pending = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._tables = {prefix: {} for prefix in cls.dispatch_prefixes}
+        cls._visit_table = cls._tables.setdefault("visit_", {})
+
+    @classmethod
+    def handler_for(cls, node_type, prefix="visit_", default="generic_visit"):
+        """Return the unbound handler for node_type, resolving it once"""
+        table = cls._tables.get(prefix)
+        if table is None:
+            table = cls._tables[prefix] = {}
+
+        handler = table.get(node_type)
+        if handler is None:
+            handler = getattr(cls, prefix + node_type.__name__, None)
+            if handler is None:
+                handler = getattr(cls, default)
+            table[node_type] = handler
+        return handler
+
+    def visit(self, node):
+        handler = self._visit_table.get(type(node))
+        if handler is None:
+            handler = self.handler_for(type(node))
+
+        if not self.iterative:
+            return handler(self, node)
+
+        pending = self._pending
+        if pending is None:
+            pending = self._pending = []
+        base = len(pending)
+
+        result = handler(self, node)
+
+        table = self._visit_table
+        while len(pending) > base:
+            child = pending.pop()
+            child_handler = table.get(type(child))
+            if child_handler is None:
+                child_handler = self.handler_for(type(child))
+            child_handler(self, child)
+        return result
+
+    def children(self, node):
+        """Child nodes of node, in visiting order"""
+        return ()
+
+    def generic_visit(self, node):
+        if self.iterative and self._pending is not None:
+            self._pending.extend(reversed([*self.children(node)]))
+        else:
+            for child in self.children(node):
+                self.visit(child)
+
+    def visit_children(self, node):
+        """Visit all children of node before returning, in either mode"""
+        for child in self.children(node):
+            self.visit(child)
+
+
+class ASTDispatchVisitor(DispatchVisitor):
+    """DispatchVisitor over Python ``ast`` trees"""
+
+    def children(self, node):
+        return ast.iter_child_nodes(node)
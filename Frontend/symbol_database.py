@@ -0,0 +1,295 @@
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from Frontend.DataStructure import FunctionInfo, VariableInfo, VariableType
+from Frontend.Python_ast import parse_python
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    module TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    module TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    var_type TEXT,
+    line INTEGER,
+    PRIMARY KEY (module, name)
+);
+CREATE TABLE IF NOT EXISTS functions (
+    module TEXT NOT NULL,
+    name TEXT NOT NULL,
+    params TEXT NOT NULL,
+    return_type TEXT,
+    modifies_params TEXT NOT NULL,
+    has_side_effects INTEGER NOT NULL,
+    is_pure INTEGER,
+    calls TEXT NOT NULL,
+    PRIMARY KEY (module, name)
+);
+CREATE TABLE IF NOT EXISTS imports (
+    module TEXT NOT NULL,
+    local_name TEXT NOT NULL,
+    target_module TEXT NOT NULL,
+    target_name TEXT
+);
+CREATE INDEX IF NOT EXISTS imports_by_target ON imports (target_module);
+"""
+
+
+def module_name_for(path: str, root: str) -> Tuple[str, bool]:
+    """Dotted module name of path relative to root, and whether it is a package"""
+    rel = os.path.splitext(os.path.relpath(path, root))[0]
+    parts = [p for p in rel.split(os.sep) if p not in ("", ".")]
+    is_package = bool(parts) and parts[-1] == "__init__"
+    if is_package:
+        parts = parts[:-1]
+    return ".".join(parts), is_package
+
+
+class SymbolDatabase:
+    """Project-wide index of module symbols, function summaries and imports.
+
+    Files are re-analyzed only when their mtime and content hash change.
+    When a module's function summaries change, modules importing it are
+    re-analyzed too, so mutation and return-type facts flow across imports.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self._function_cache: Dict[Tuple[str, str], Optional[FunctionInfo]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Bumped whenever indexed facts change, so callers can key caches on it
+        self.generation = 0
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    # -------------------------
+    # Updates
+    # -------------------------
+    def update_project(self, root: str) -> List[str]:
+        """Index every .py file under root; return modules that were re-analyzed
+        or removed, importers re-analyzed because of them included"""
+        paths = []
+        for dirpath, dirs, files in os.walk(root):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            paths.extend(os.path.join(dirpath, f) for f in sorted(files) if f.endswith(".py"))
+
+        changed = []
+        known = {row[0] for row in self.conn.execute("SELECT path FROM files")}
+        root_abs = os.path.abspath(root)
+        for stale in sorted(known - {os.path.abspath(p) for p in paths}):
+            if stale.startswith(root_abs + os.sep):
+                module = self.remove_file(stale)
+                if module is not None:
+                    # importers must drop facts taken from the removed module
+                    changed.append(module)
+
+        for path in paths:
+            module = self.update_file(path, root)
+            if module is not None:
+                changed.append(module)
+
+        changed += [m for m in self._propagate(changed, root) if m not in changed]
+        self.conn.commit()
+        return changed
+
+    def update_file(self, path: str, root: str, force: bool = False) -> Optional[str]:
+        """Re-index path if it changed; return its module name when re-analyzed"""
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+        row = self.conn.execute(
+            "SELECT mtime, hash FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row and row[0] == mtime and not force:
+            return None
+
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha1(content).hexdigest()
+        module, is_package = module_name_for(path, root)
+
+        if row and row[1] == digest and not force:
+            self.conn.execute("UPDATE files SET mtime = ? WHERE path = ?", (mtime, path))
+            return None
+
+        try:
+            tree = parse_python(content.decode("utf-8"))
+        except (SyntaxError, UnicodeDecodeError):
+            tree = None
+
+        self._clear_module(module)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, module, mtime, hash) VALUES (?, ?, ?, ?)",
+            (path, module, mtime, digest)
+        )
+        if tree is not None:
+            self._store_module(module, is_package, tree)
+        return module
+
+    def remove_file(self, path: str) -> Optional[str]:
+        """Forget a file that no longer exists; return its module name"""
+        row = self.conn.execute("SELECT module FROM files WHERE path = ?", (path,)).fetchone()
+        if row:
+            self._clear_module(row[0])
+        self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        return row[0] if row else None
+
+    def _propagate(self, changed: Iterable[str], root: str) -> List[str]:
+        """Re-analyze importers of changed modules until summaries settle;
+        return the importers re-analyzed, in order"""
+        pending = list(changed)
+        visits: Dict[str, int] = {}
+        limit = max(1, len(self.conn.execute("SELECT 1 FROM files").fetchall()))
+
+        while pending:
+            module = pending.pop()
+            for importer, path in self.conn.execute(
+                "SELECT DISTINCT i.module, f.path FROM imports i JOIN files f "
+                "ON f.module = i.module WHERE i.target_module = ? "
+                "OR ? LIKE i.target_module || '.%'", (module, module)
+            ).fetchall():
+                if importer == module or visits.get(importer, 0) >= limit:
+                    continue
+                visits[importer] = visits.get(importer, 0) + 1
+
+                before = self._summaries(importer)
+                self.update_file(path, root, force=True)
+                if self._summaries(importer) != before:
+                    pending.append(importer)
+        return list(visits)
+
+    def _summaries(self, module):
+        return self.conn.execute(
+            "SELECT name, return_type, modifies_params, has_side_effects, is_pure "
+            "FROM functions WHERE module = ? ORDER BY name", (module,)
+        ).fetchall()
+
+    def _clear_module(self, module):
+        for table in ("symbols", "functions", "imports"):
+            self.conn.execute(f"DELETE FROM {table} WHERE module = ?", (module,))
+        self._function_cache.clear()
+        self.generation += 1
+
+    def _store_module(self, module, is_package, tree):
+        from Frontend.SemanticAnalyzerComponet import SemanticAnalyzer
+
+        analyzer = SemanticAnalyzer(symbol_db=self, module_name=module, is_package=is_package)
+        analyzer.visit(tree)
+        analyzer.analyze_purity()
+
+        for var_name, var_info in analyzer.symbol_table.items():
+            if var_info.scope == "global":
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO symbols VALUES (?, ?, 'variable', ?, ?)",
+                    (module, var_name, var_info.var_type.value, var_info.first_assignment_line)
+                )
+
+        for stmt in tree.body:
+            if hasattr(stmt, "name") and stmt.name in analyzer.functions:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO symbols VALUES (?, ?, 'function', ?, ?)",
+                    (module, stmt.name, VariableType.FUNCTION.value, stmt.lineno)
+                )
+
+        for func_name, func_info in analyzer.functions.items():
+            self.conn.execute(
+                "INSERT OR REPLACE INTO functions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    module, func_name,
+                    json.dumps([[p.name, p.var_type.value] for p in func_info.parameters]),
+                    func_info.return_type.value if func_info.return_type else None,
+                    json.dumps(sorted(func_info.modifies_params)),
+                    int(func_info.has_side_effects),
+                    None if func_info.is_pure is None else int(func_info.is_pure),
+                    json.dumps(func_info.calls_functions)
+                )
+            )
+
+        self.conn.executemany(
+            "INSERT INTO imports VALUES (?, ?, ?, ?)",
+            [(module, local, target, name) for local, (target, name) in analyzer.imports.items()]
+        )
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def lookup_function(self, module: str, name: str) -> Optional[FunctionInfo]:
+        """Summary of module.name, or None if it is not indexed"""
+        key = (module, name)
+        if key in self._function_cache:
+            self.cache_hits += 1
+            return self._function_cache[key]
+        self.cache_misses += 1
+
+        row = self.conn.execute(
+            "SELECT params, return_type, modifies_params, has_side_effects, is_pure, calls "
+            "FROM functions WHERE module = ? AND name = ?", key
+        ).fetchone()
+
+        func_info = None
+        if row is None:
+            # `from pkg import name` may re-export name from a submodule
+            target = self.conn.execute(
+                "SELECT target_module, target_name FROM imports "
+                "WHERE module = ? AND local_name = ?", key
+            ).fetchone()
+            if target and target[1] and (target[0], target[1]) != key:
+                self._function_cache[key] = None
+                func_info = self.lookup_function(target[0], target[1])
+        else:
+            params, return_type, modifies, side_effects, is_pure, calls = row
+            func_info = FunctionInfo(
+                name=name,
+                parameters=[
+                    VariableInfo(name=p, var_type=VariableType(t), scope=f"function:{name}",
+                                 is_parameter=True)
+                    for p, t in json.loads(params)
+                ],
+                return_type=VariableType(return_type) if return_type else None,
+                modifies_params=set(json.loads(modifies)),
+                has_side_effects=bool(side_effects),
+                calls_functions=json.loads(calls),
+                is_pure=None if is_pure is None else bool(is_pure)
+            )
+
+        self._function_cache[key] = func_info
+        return func_info
+
+    def module_symbols(self, module: str) -> List[Tuple[str, str, Optional[str], Optional[int]]]:
+        """(name, kind, type, line) for module-level symbols"""
+        return self.conn.execute(
+            "SELECT name, kind, var_type, line FROM symbols WHERE module = ? ORDER BY line",
+            (module,)
+        ).fetchall()
+
+    def imports_of(self, module: str) -> List[Tuple[str, str, Optional[str]]]:
+        """(local_name, target_module, target_name) import edges out of module"""
+        return self.conn.execute(
+            "SELECT local_name, target_module, target_name FROM imports WHERE module = ?",
+            (module,)
+        ).fetchall()
+
+    def importers_of(self, module: str) -> Set[str]:
+        """Modules with an import edge into module"""
+        return {row[0] for row in self.conn.execute(
+            "SELECT DISTINCT module FROM imports WHERE target_module = ?", (module,)
+        )}
+
+    def module_for_path(self, path: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT module FROM files WHERE path = ?", (os.path.abspath(path),)
+        ).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,154 @@
+"""Before/after timing of table-driven visitor dispatch on a large AST.
+
+"Before" re-creates the old name-based dispatch (``ast.NodeVisitor.visit``
+and a ``getattr``-per-node ``IRPrinter.visit`` / ``expr``) on top of the
+current visitor classes, so both sides run identical handlers.
+
+Before and after runs are interleaved with the garbage collector off and
+the median is reported; differences of a few percent are still within the
+run-to-run noise of a shared machine.
+
+    python benchmarks/bench_visitor.py [functions]
+"""
+import ast
+import contextlib
+import gc
+import io
+import statistics
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from Frontend.Python_ast import parse_python
+from Frontend.SemanticAnalyzerComponet import SemanticAnalyzer
+from Frontend.IR.Ir_builder import IRBuilder
+from Frontend.IR.Ir_printer import IRPrinter
+from Frontend.dispatch_visitor import ASTDispatchVisitor
+
+
+FUNCTION_TEMPLATE = """
+def f{i}(nums, scale):
+    total = 0
+    items = []
+    for x in nums:
+        if x > {i}:
+            total = total + x * scale + {i}
+            items.append(x)
+    alias = items
+    return total
+"""
+
+
+def make_source(functions):
+    return "".join(FUNCTION_TEMPLATE.format(i=i) for i in range(functions))
+
+
+def _legacy_printer_visit(self, node):
+    if node is None:
+        return
+    method = "visit_" + node.__class__.__name__
+    visitor = getattr(self, method, self.generic_visit)
+    visitor(node)
+
+
+def _legacy_printer_expr(self, node):
+    method = "expr_" + node.__class__.__name__
+    return getattr(self, method, self.expr_unknown)(node)
+
+
+def _legacy_builder_visit(self, node):
+    # Same span bookkeeping as IRBuilder.visit, name-based dispatch underneath
+    ir = ast.NodeVisitor.visit(self, node)
+    if hasattr(node, "lineno") and hasattr(ir, "lineno"):
+        ir.lineno = node.lineno
+        ir.end_lineno = node.end_lineno
+        ir.col_offset = node.col_offset
+        ir.end_col_offset = node.end_col_offset
+    return ir
+
+
+LegacySemanticAnalyzer = type("LegacySemanticAnalyzer", (SemanticAnalyzer,), {
+    "visit": ast.NodeVisitor.visit,
+    "generic_visit": ast.NodeVisitor.generic_visit,
+    "visit_children": ast.NodeVisitor.generic_visit,
+})
+LegacyIRBuilder = type("LegacyIRBuilder", (IRBuilder,), {
+    "visit": _legacy_builder_visit,
+    "generic_visit": ast.NodeVisitor.generic_visit,
+})
+LegacyIRPrinter = type("LegacyIRPrinter", (IRPrinter,), {
+    "visit": _legacy_printer_visit,
+    "expr": _legacy_printer_expr,
+})
+
+
+class NameCounter(ASTDispatchVisitor):
+    """Dispatch-bound traversal: almost no work per node"""
+
+    def __init__(self):
+        self.names = 0
+
+    def visit_Name(self, node):
+        self.names += 1
+
+
+LegacyNameCounter = type("LegacyNameCounter", (NameCounter,), {
+    "visit": ast.NodeVisitor.visit,
+    "generic_visit": ast.NodeVisitor.generic_visit,
+})
+IterativeSemanticAnalyzer = type("IterativeSemanticAnalyzer", (SemanticAnalyzer,), {
+    "iterative": True,
+})
+
+
+def compare(before, after, repeat=21):
+    """Median seconds of before and after, run alternately with gc off"""
+    times = ([], [])
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for fn, samples in zip((before, after), times):
+                start = time.perf_counter()
+                fn()
+                samples.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return statistics.median(times[0]), statistics.median(times[1])
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    tree = parse_python(make_source(functions))
+    nodes = sum(1 for _ in ast.walk(tree))
+    ir_tree = IRBuilder().build(tree)
+
+    def analyze(cls):
+        return lambda: cls().visit(tree)
+
+    def build(cls):
+        return lambda: cls().build(tree)
+
+    def render(cls):
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                cls().visit(ir_tree)
+        return run
+
+    print(f"{functions} functions, {nodes} AST nodes (median of 21)")
+    print(f"{'traversal':<20}{'before':>10}{'after':>10}{'speedup':>10}")
+    for label, before, after in [
+        ("dispatch only", analyze(LegacyNameCounter), analyze(NameCounter)),
+        ("SemanticAnalyzer", analyze(LegacySemanticAnalyzer), analyze(SemanticAnalyzer)),
+        ("  iterative", analyze(LegacySemanticAnalyzer), analyze(IterativeSemanticAnalyzer)),
+        ("IRBuilder", build(LegacyIRBuilder), build(IRBuilder)),
+        ("IRPrinter", render(LegacyIRPrinter), render(IRPrinter)),
+    ]:
+        old, new = compare(before, after)
+        print(f"{label:<20}{old * 1000:>8.1f}ms{new * 1000:>8.1f}ms{old / new:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,11 +16,15 @@ print(ast.dump(tree, indent=4))
 analyzer = SemanticAnalyzer()
 analyzer.visit(tree)
 analyzer.analyze_memory_effects()
+analyzer.analyze_purity()
+
+ir_tree= IRBuilder().build(tree) 
+analyzer.analyze_loops(ir_tree)
+analyzer.analyze_costs(ir_tree)
 
 report = analyzer.generate_report()
 print(report)
 
-ir_tree= IRBuilder().build(tree) 
 printer = IRPrinter()
 print("============IR============")
 printer.visit(ir_tree)
\ No newline at end of file
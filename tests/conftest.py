@@ -0,0 +1,24 @@
+import pytest
+
+from Frontend.IR.Ir_builder import IRBuilder
+from Frontend.Python_ast import parse_python
+from Frontend.SemanticAnalyzerComponet import SemanticAnalyzer
+
+
+def run_frontend(source, profile=None):
+    """Run the analyses in main.py order; return (SemanticAnalyzer, IRModule)"""
+    tree = parse_python(source)
+    analyzer = SemanticAnalyzer()
+    analyzer.visit(tree)
+    if profile is not None:
+        analyzer.apply_profile(profile)
+    analyzer.analyze_memory_effects()
+    analyzer.analyze_purity()
+    ir = IRBuilder().build(tree)
+    analyzer.analyze_loops(ir)
+    return analyzer, ir
+
+
+@pytest.fixture
+def frontend():
+    return run_frontend
@@ -0,0 +1,32 @@
+import json
+
+from Driver.cost_gate import collect_costs, main
+
+
+def write(directory, name, source):
+    path = directory / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+    return path
+
+
+def test_keys_are_relative_to_the_root(tmp_path):
+    for checkout in ("a", "b"):
+        write(tmp_path / checkout, "pkg/mod.py", "def f(n):\n    return [n]\n")
+    before, _ = collect_costs([str(tmp_path / "a")])
+    after, errors = collect_costs([str(tmp_path / "b")])
+    assert list(before) == ["pkg/mod.py::f"]
+    assert before == after and not errors
+
+
+def test_unparsable_file_fails_the_gate(tmp_path, capsys):
+    write(tmp_path, "ok.py", "def f(n):\n    return n\n")
+    baseline = tmp_path / "baseline.json"
+    assert main([str(tmp_path), "--output", str(baseline)]) == 0
+    assert json.loads(baseline.read_text())
+
+    write(tmp_path, "broken.py", "def f(:\n")
+    costs, errors = collect_costs([str(tmp_path)])
+    assert list(errors) == ["broken.py"]
+    assert main([str(tmp_path), "--baseline", str(baseline)]) == 1
+    assert "1 files failed" in capsys.readouterr().out
@@ -0,0 +1,54 @@
+import pytest
+
+
+@pytest.fixture
+def costs(frontend):
+    def run(source):
+        analyzer, ir = frontend(source)
+        return analyzer.analyze_costs(ir)
+    return run
+
+
+def test_container_parameters_are_counted_as_copies(costs):
+    result = costs(
+        "def total(values):\n"
+        "    t = 0\n"
+        "    for v in values:\n"
+        "        t += v\n"
+        "    return t\n"
+        "def first(table, key):\n"
+        "    return table.get(key)\n"
+        "def grow(items):\n"
+        "    items.append(1)\n"
+        "def scalar(n):\n"
+        "    return n + 1\n"
+    )
+    assert result["total"].param_copies == 1
+    assert result["first"].param_copies == 1
+    # mutated parameters are passed by reference, not copied
+    assert result["grow"].param_copies == 0
+    assert result["scalar"].param_copies == 0
+
+
+def test_call_site_argument_marks_parameter_as_container(costs):
+    result = costs(
+        "def size(data):\n"
+        "    return len(data)\n"
+        "xs = [1, 2, 3]\n"
+        "n = size(xs)\n"
+    )
+    assert result["size"].param_copies == 1
+
+
+def test_refcounts_do_not_leak_across_functions(costs):
+    result = costs(
+        "def g():\n"
+        "    xs = [1]\n"
+        "    ys = xs\n"
+        "    return ys\n"
+        "def f(n):\n"
+        "    xs = n + 1\n"
+        "    return xs\n"
+    )
+    assert result["g"].refcount_ops > 0
+    assert result["f"].refcount_ops == 0
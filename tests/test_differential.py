@@ -0,0 +1,62 @@
+from Driver.differential import DifferentialHarness
+
+
+SOURCE = """
+def countdown(n):
+    while n > 0:
+        n -= 1
+    return n
+
+def total(xs):
+    t = 0
+    for x in xs:
+        t += x
+    return sorted(xs, reverse=True) + [t]
+"""
+
+
+def test_uncompilable_function_is_skipped_not_fatal():
+    results = {r.function: r for r in DifferentialHarness(SOURCE, count=5, repeat=1).run()}
+    assert "ir" in results["countdown"].skipped
+    assert "ir" not in results["countdown"].timings
+    assert not results["total"].skipped
+    assert not results["total"].mismatches
+    assert "ir" in results["total"].timings
+
+
+def test_module_statement_raising_under_the_ir_is_recorded():
+    harness = DifferentialHarness(
+        "def countdown(n):\n"
+        "    while n > 0:\n"
+        "        n -= 1\n"
+        "    return n\n"
+        "start = countdown(3)\n"
+        "def double(x):\n"
+        "    return x * 2\n",
+        count=3, repeat=1,
+    )
+    assert "NameError" in harness.skipped["ir"]["<module statement 1>"]
+    [result] = harness.run(["double"])
+    assert not result.mismatches and "ir" in result.timings
+
+
+def test_nested_def_stays_local_to_its_function():
+    harness = DifferentialHarness(
+        "def helper(x):\n"
+        "    return x + 100\n"
+        "def f(x):\n"
+        "    def helper(y):\n"
+        "        return y * 2\n"
+        "    return helper(x)\n"
+        "def g(x):\n"
+        "    return helper(x)\n"
+        "def adder(n):\n"
+        "    def add(x):\n"
+        "        return x + n\n"
+        "    return add(1)\n",
+        count=5, repeat=1,
+    )
+    results = {r.function: r for r in harness.run()}
+    assert not results["f"].mismatches and not results["g"].mismatches
+    assert harness.runners["ir"]["g"](1) == 101
+    assert "closure over n" in results["adder"].skipped["ir"]
@@ -0,0 +1,101 @@
+import contextlib
+import io
+
+from Backend import PythonEmitter
+from Frontend.IR.Ir_builder import IRBuilder
+from Frontend.IR.Ir_interpreter import compile_ir
+from Frontend.IR.Ir_nodes import *
+from Frontend.IR.Ir_printer import IRPrinter
+from Frontend.Python_ast import parse_python
+
+
+SOURCE = """
+def merge(a, b):
+    return {**a, 'k': 1, **b}
+
+def ordered(xs):
+    return sorted(xs, reverse=True)
+
+def spread(xs, opts):
+    return max(*xs, **opts)
+
+def joined(xs):
+    return [0, *xs], (*xs,)
+"""
+
+
+def build(source):
+    return IRBuilder().build(parse_python(source))
+
+
+def run_source(source):
+    namespace = {}
+    exec(source, namespace)
+    return namespace
+
+
+def test_dict_unpacking_keeps_none_keys():
+    ir = build("d = {**base, 'k': 1}")
+    node = ir.body[0].value
+    assert isinstance(node, IRDict)
+    assert node.keys[0] is None
+    assert isinstance(node.values[0], IRVar) and node.values[0].name == "base"
+
+
+def test_call_carries_keywords_and_starred():
+    call = build("f(*xs, y, key=k, **opts)").body[0].value
+    assert isinstance(call.args[0], IRStarred)
+    assert [(kw.arg, kw.value.name) for kw in call.keywords] == [("key", "k"), (None, "opts")]
+
+
+def test_printer_shows_unpacking():
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        IRPrinter().visit(build(SOURCE))
+    text = output.getvalue()
+    assert "{**a, 'k': 1, **b}" in text
+    assert "sorted(xs, reverse=True)" in text
+    assert "max(*xs, **opts)" in text
+
+
+def test_interpreter_and_emitter_match_python():
+    ir = build(SOURCE)
+    runners = [run_source(SOURCE), compile_ir(ir), run_source(PythonEmitter().emit(ir))]
+    for env in runners:
+        assert env["merge"]({"a": 1, "k": 0}, {"b": 2}) == {"a": 1, "k": 1, "b": 2}
+        assert env["ordered"]([2, 3, 1]) == [3, 2, 1]
+        assert env["spread"]([1, 5, 3], {"key": lambda v: -v}) == 1
+        assert env["joined"]([1, 2]) == ([0, 1, 2], (1, 2))
+
+
+def test_bare_return_differs_from_unmodeled_return_value():
+    bare, unmodeled = build(
+        "def f():\n"
+        "    return\n"
+        "def g(xs):\n"
+        "    return [x + 1 for x in xs]\n"
+    ).body
+    assert isinstance(bare.body[0].value, IRConst) and bare.body[0].value.value is None
+    assert unmodeled.body[0].value is None
+
+
+def test_interpreter_applies_defaults_and_decorators():
+    env = compile_ir(build(
+        "def tag(f):\n"
+        "    f.tagged = True\n"
+        "    return f\n"
+        "@tag\n"
+        "def scale(x, factor=2):\n"
+        "    return x * factor\n"
+    ))
+    assert env["scale"](3) == 6 and env["scale"](3, 3) == 9
+    assert env["scale"].tagged
+
+
+def test_imports_are_lowered_and_run():
+    module = build("import os.path\nfrom math import sqrt as root\nimport json as j\n")
+    assert [type(stmt) for stmt in module.body] == [IRImport] * 3
+    env = compile_ir(module)
+    assert env["os"].path.join("a", "b") == "a/b"
+    assert env["root"](4) == 2.0
+    assert env["j"].dumps(1) == "1"
@@ -0,0 +1,60 @@
+import pytest
+
+from Frontend.DataStructure import LoopKind
+
+
+@pytest.fixture
+def classify(frontend):
+    def run(source):
+        analyzer, _ = frontend(source)
+        return {loop.lineno: dependence for loop, dependence in analyzer.loop_dependences}
+    return run
+
+
+def test_numeric_accumulator_is_a_reduction(classify):
+    loops = classify(
+        "def f(xs):\n"
+        "    total = 0\n"
+        "    for x in xs:\n"
+        "        total += x\n"
+        "    return total\n"
+    )
+    assert loops[3].kind == LoopKind.PARALLEL_REDUCTION
+    assert loops[3].reductions == {"total": "Add"}
+
+
+def test_string_accumulator_is_loop_carried(classify):
+    loops = classify(
+        "def f(xs):\n"
+        "    s = ''\n"
+        "    for x in xs:\n"
+        "        s = s + x\n"
+        "    return s\n"
+    )
+    assert loops[3].kind == LoopKind.SEQUENTIAL
+    assert not loops[3].reductions
+
+
+def test_rebinding_the_loop_variable_is_sequential(classify):
+    loops = classify(
+        "def f(a, n):\n"
+        "    for i in range(n):\n"
+        "        i = i // 2\n"
+        "        a[i] = a[i] + 1\n"
+        "    return a\n"
+    )
+    assert loops[2].kind == LoopKind.SEQUENTIAL
+    assert "reassigned" in loops[2].reason
+
+
+def test_loop_local_read_by_a_later_closure_is_live_out(classify):
+    loops = classify(
+        "def f(xs):\n"
+        "    for x in xs:\n"
+        "        y = x * 2\n"
+        "    def show():\n"
+        "        return y\n"
+        "    return show\n"
+    )
+    assert loops[2].kind == LoopKind.SEQUENTIAL
+    assert loops[2].reason == "y is used after the loop"
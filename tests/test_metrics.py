@@ -0,0 +1,50 @@
+import threading
+import time
+
+from Driver.metrics import MetricsExporter, MetricsRegistry, instrument_components
+from Frontend.SemanticAnalyzerComponet import SemanticAnalyzer
+from Frontend.Python_ast import parse_python
+
+
+def test_new_labels_wait_for_a_running_export():
+    registry = MetricsRegistry()
+    counter = registry.counter("files_total", "Files", ("status",))
+    counter.inc(1.0, ("ok",))
+    writer = threading.Thread(target=counter.inc, args=(1.0, ("failed",)))
+    with registry.lock:
+        writer.start()
+        writer.join(0.05)
+        assert writer.is_alive()
+        counter.inc(1.0, ("ok",))
+    writer.join()
+    assert registry.snapshot()["files_total"] == {"failed": 1.0, "ok": 2.0}
+
+
+def test_exporter_thread_survives_a_failed_write(tmp_path):
+    registry = MetricsRegistry()
+    calls = []
+
+    def flaky():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("callback failed")
+        return {(): 1.0}
+
+    registry.gauge("flaky", "Fails on the first export", callback=flaky)
+    exporter = MetricsExporter(registry, str(tmp_path), interval=0.01)
+    exporter.start()
+    deadline = time.monotonic() + 5
+    while len(calls) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(calls) >= 3
+    exporter.stop()
+    assert (tmp_path / "metrics.prom").read_text().count("flaky 1.0") == 1
+
+
+def test_callbacks_bound_before_instrumenting_are_timed():
+    analyzer = SemanticAnalyzer()
+    totals = {}
+    instrument_components(analyzer, totals)
+    call = parse_python("f(1)\n").body[0].value
+    analyzer.type_inferencer.call_resolver(call)
+    assert "function_analyzer" in totals
@@ -0,0 +1,26 @@
+from Frontend.DataStructure import LoopKind, MemoryEffect
+from Frontend.Profile import FunctionProfile, ProfileData
+
+
+SOURCE = """
+def hot(xs):
+    total = 0
+    for x in xs:
+        total += x
+    return total
+
+def cold(items):
+    items.append(1)
+    for item in items:
+        print(item)
+"""
+
+
+def test_cold_code_keeps_memory_effects_but_skips_loop_analysis(frontend):
+    profile = ProfileData(functions={"hot": FunctionProfile("hot", calls=100)})
+    analyzer, _ = frontend(SOURCE, profile)
+    loops = analyzer.loop_dependences
+
+    assert [f.name for f in analyzer.hot_functions] == ["hot"]
+    assert analyzer.symbol_table["items"].memory_effect == MemoryEffect.REFERENCE
+    assert [(loop.lineno, dependence.kind) for loop, dependence in loops] == [(4, LoopKind.PARALLEL_REDUCTION)]
@@ -0,0 +1,91 @@
+import pytest
+
+from Backend import function_specifier
+
+
+@pytest.fixture
+def analyze(frontend):
+    return lambda source: frontend(source)[0]
+
+
+def test_reading_a_rebound_global_blocks_memoization(analyze):
+    functions = analyze(
+        "K = 2\n"
+        "LIMIT = 10\n"
+        "def g(x):\n"
+        "    return x * K\n"
+        "def h(x):\n"
+        "    return x + LIMIT\n"
+        "a = g(1)\n"
+        "K = 6\n"
+    ).functions
+    assert functions["g"].is_pure and not functions["g"].is_memoizable
+    assert functions["g"].global_reads == {"K"}
+    assert functions["h"].is_memoizable
+
+
+def test_mutating_elements_of_a_parameter_is_impure(analyze):
+    analyzer = analyze(
+        "def f(rows):\n"
+        "    for r in rows:\n"
+        "        r.append(0)\n"
+        "    return len(rows)\n"
+        "def fresh(n):\n"
+        "    out = []\n"
+        "    for i in range(n):\n"
+        "        out.append(i)\n"
+        "    return len(out)\n"
+    )
+    assert not analyzer.functions["f"].is_pure
+    assert "r" in analyzer.purity_analyzer.reasons["f"]
+    assert analyzer.functions["fresh"].is_pure
+
+
+def test_side_effect_after_nested_def_is_attributed_to_outer(analyze):
+    functions = analyze(
+        "def f(x):\n"
+        "    def inner(y):\n"
+        "        return y\n"
+        "    print(x)\n"
+        "    return inner(x)\n"
+    ).functions
+    assert functions["inner"].is_pure
+    assert not functions["f"].is_pure
+
+
+def test_no_hoisting_past_unmodeled_statements(analyze):
+    analyzer = analyze(
+        "def g(v):\n"
+        "    return v + 1\n"
+        "def f(xs):\n"
+        "    k = 0\n"
+        "    t = 0\n"
+        "    for i in xs:\n"
+        "        t = t + g(k)\n"
+        "        if i:\n"
+        "            break\n"
+        "        k = i\n"
+        "    return t\n"
+    )
+    [(loop, dependence)] = analyzer.loop_dependences
+    assert dependence.hoistable_calls == []
+
+
+def test_constexpr_follows_constant_scalar_call_sites(frontend):
+    source = (
+        "def sq(n):\n"
+        "    return n * n\n"
+        "def shout(s):\n"
+        "    return s\n"
+        "def unused(n):\n"
+        "    return n + 1\n"
+        "x = sq(4)\n"
+        "y = shout('a')\n"
+    )
+    analyzer, ir = frontend(source)
+    calls = analyzer.purity_analyzer.constant_calls(ir, scalar_only=True)
+    assert calls == [("sq", 7)]
+    functions = analyzer.functions
+    assert function_specifier(functions["sq"], calls) == "constexpr"
+    assert function_specifier(functions["shout"], calls) is None
+    assert function_specifier(functions["unused"], calls) is None
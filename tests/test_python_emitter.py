@@ -0,0 +1,142 @@
+import pytest
+
+from Backend import PythonEmitter
+
+
+@pytest.fixture
+def emit(frontend):
+    def run(source, **options):
+        analyzer, ir = frontend(source)
+        emitter = PythonEmitter(functions=analyzer.functions, **options)
+        namespace = {}
+        exec(emitter.emit(ir), namespace)
+        return emitter, namespace
+    return run
+
+
+def test_parallel_loop_receives_unpacked_locals(emit):
+    _, namespace = emit(
+        "def f(xs):\n"
+        "    a, b = 2, 3\n"
+        "    total = 0\n"
+        "    for x in xs:\n"
+        "        total += x * a + b\n"
+        "    return total\n",
+        parallel=True, executor="ThreadPoolExecutor"
+    )
+    assert namespace["f"]([1, 2, 3]) == 21
+
+
+def test_unmodeled_function_is_refused(emit):
+    emitter, namespace = emit(
+        "def w(n):\n"
+        "    while n:\n"
+        "        n -= 1\n"
+        "    return n\n"
+        "\n"
+        "def g(x):\n"
+        "    return x + 1\n"
+    )
+    assert set(emitter.skipped) == {"w"}
+    assert namespace["g"](1) == 2
+    with pytest.raises(NotImplementedError):
+        namespace["w"](3)
+
+
+def test_closure_over_a_loop_local_keeps_the_loop_sequential(emit):
+    _, namespace = emit(
+        "def f(xs):\n"
+        "    for x in xs:\n"
+        "        y = x * 2\n"
+        "    def show():\n"
+        "        return y\n"
+        "    return show\n",
+        parallel=True, executor="ThreadPoolExecutor"
+    )
+    assert namespace["f"]([1, 2, 3])() == 6
+
+
+def test_unmodeled_return_value_is_refused(emit):
+    emitter, namespace = emit(
+        "def inc(xs):\n"
+        "    return [x + 1 for x in xs]\n"
+        "def stop(x):\n"
+        "    if x:\n"
+        "        return\n"
+        "    return x\n"
+    )
+    assert set(emitter.skipped) == {"inc"}
+    assert namespace["stop"](1) is None
+    assert namespace["stop"](0) == 0
+
+
+SIGNATURES = """
+def tag(f):
+    f.tagged = True
+    return f
+
+def scale(x, factor=2):
+    return x * factor
+
+@tag
+def pick(a, /, b=1, *rest, key=None, flag, **extra):
+    return (a, b, rest, key, flag, extra)
+
+def named(*, n):
+    return n
+"""
+
+
+def test_signatures_keep_defaults_and_variadics(emit):
+    emitter, namespace = emit(SIGNATURES)
+    assert not emitter.skipped
+    assert namespace["scale"](3) == 6
+    assert namespace["pick"](1, 2, 3, flag=0, z=4) == (1, 2, (3,), None, 0, {"z": 4})
+    assert namespace["pick"].tagged
+    assert namespace["named"](n=5) == 5
+
+
+def test_unsupported_module_statements_are_skipped(emit):
+    emitter, namespace = emit(
+        "import math\n"
+        "from os import path as p\n"
+        "class Box:\n"
+        "    pass\n"
+        "def root(x):\n"
+        "    return math.sqrt(x)\n"
+        "while False:\n"
+        "    pass\n"
+    )
+    assert set(emitter.skipped) == {"<module statement 3>", "<module statement 5>"}
+    assert namespace["root"](9) == 3.0
+    assert namespace["p"].join("a", "b") == "a/b"
+    assert "Box" not in namespace
+
+
+def test_future_imports_stay_first(emit):
+    emitter, namespace = emit(
+        "from __future__ import annotations\n"
+        "def sq(n):\n"
+        "    return n * n\n"
+    )
+    assert namespace["sq"](3) == 9
+    assert emitter.uses_memo
+
+
+def test_memo_table_skips_mutable_arguments_and_accepts_keywords(emit):
+    emitter, namespace = emit(
+        "def get(o):\n"
+        "    return o.count\n"
+        "def scale(x, factor=2):\n"
+        "    return x * factor\n"
+    )
+    assert emitter.uses_memo
+
+    class Counter:
+        count = 1
+    counter = Counter()
+    assert namespace["get"](counter) == 1
+    counter.count = 5
+    assert namespace["get"](counter) == 5
+    assert namespace["scale"](3, factor=4) == 12
+    assert namespace["scale"](3) == 6
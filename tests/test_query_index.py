@@ -0,0 +1,61 @@
+import random
+
+from Frontend.DataStructure import VariableType
+from Frontend.Query import IntervalTree
+
+
+SOURCE = """
+def f(n):
+    cache = 1
+    total = n + cache
+    return total
+
+def g(n):
+    cache = {}
+    cache[n] = n
+    return cache
+
+limit = 3
+"""
+
+
+def test_names_reused_across_functions_are_indexed_per_scope(frontend):
+    analyzer, ir = frontend(SOURCE)
+    index = analyzer.build_query_index(ir)
+    assert index.symbols_of_type(VariableType.DICT, "function:g") == ["cache"]
+    assert index.symbols_of_type(VariableType.DICT, "function:f") == []
+    assert index.symbols_of_type(VariableType.INT, "function:f") == ["cache"]
+    assert index.definition_of("cache", "function:f") == 3
+    assert index.definition_of("cache", "function:g") == 8
+    assert index.hover("cache", "function:g").var_type == VariableType.DICT
+    # Parameters and module-level names resolve from any scope
+    assert index.definition_of("n", "function:g") == 7
+    assert index.definition_of("limit", "function:f") == 12
+
+
+def test_live_ranges_stay_inside_their_function(frontend):
+    analyzer, ir = frontend(SOURCE)
+    index = analyzer.build_query_index(ir)
+    assert "total" in index.live_at(4)
+    assert "cache" in index.live_at(9)
+    assert "total" not in index.live_at(9)
+    assert index.scope_at(9) == "function:g"
+    assert index.usages_at(9) == ["cache", "n"]
+
+
+def test_interval_tree_matches_linear_scan():
+    rng = random.Random(0)
+    intervals = []
+    for i in range(200):
+        start = rng.randint(0, 100)
+        intervals.append((start, start + rng.randint(0, 30), i))
+    tree = IntervalTree(intervals)
+    for point in range(-5, 140):
+        expected = {payload for start, end, payload in intervals if start <= point <= end}
+        assert sorted(tree.at(point)) == sorted(expected)
+
+
+def test_interval_tree_drops_empty_ranges():
+    tree = IntervalTree([(5, 3, "empty"), (1, 1, "point")])
+    assert tree.at(1) == ["point"]
+    assert tree.at(4) == []
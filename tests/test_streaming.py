@@ -0,0 +1,97 @@
+import pytest
+
+from Driver import MemoryCeilingExceeded, MemoryWatchdog, StreamingPipeline
+from Frontend.symbol_database import SymbolDatabase
+
+
+SOURCE = """
+from helpers import scale
+
+def f(xs):
+    total = 0
+    for x in xs:
+        total += scale(x)
+    return total
+"""
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path)
+
+
+def test_bad_file_does_not_stop_the_run(tmp_path):
+    paths = [write(tmp_path / "a.py", SOURCE), write(tmp_path / "b.py", "def (:\n"),
+             str(tmp_path / "missing.py"), write(tmp_path / "c.py", "x = 1\n")]
+    results = list(StreamingPipeline().run(paths))
+    assert [r.path for r in results] == paths
+    assert results[0].error is None and "f" in results[0].functions
+    assert results[1].error.startswith("SyntaxError")
+    assert results[2].error.startswith("FileNotFoundError")
+    assert results[3].error is None
+
+
+def test_identical_sources_hit_the_cache_with_copies(tmp_path):
+    paths = [write(tmp_path / "a.py", SOURCE), write(tmp_path / "b.py", SOURCE)]
+    first, second = StreamingPipeline().run(paths)
+    assert not first.cached and second.cached
+    assert second.path == paths[1]
+    assert second.functions["f"] is not first.functions["f"]
+
+
+def test_cache_key_includes_module_and_database_state(tmp_path):
+    write(tmp_path / "helpers.py", "def scale(x):\n    return x * 2\n")
+    a = write(tmp_path / "a.py", SOURCE)
+    b = write(tmp_path / "pkg" / "b.py", SOURCE)
+    db = SymbolDatabase()
+    db.update_project(str(tmp_path))
+    pipeline = StreamingPipeline(symbol_db=db)
+    assert [r.cached for r in pipeline.run([a, b, a])] == [False, False, True]
+    assert db.lookup_function("helpers", "scale").is_pure
+
+    # helpers changes: reports resolved against the old summary are stale
+    write(tmp_path / "helpers.py", "def scale(x):\n    print(x)\n    return x\n")
+    db.update_project(str(tmp_path))
+    [result] = pipeline.run([a])
+    assert not result.cached
+    assert not result.functions["f"].is_pure
+
+
+class FakeWatchdog(MemoryWatchdog):
+    def __init__(self, limit, readings):
+        super().__init__(limit)
+        self.readings = list(readings)
+
+    def current(self):
+        return self.readings.pop(0)
+
+
+def test_watchdog_sheds_in_order_until_under_the_ceiling():
+    calls = []
+    watchdog = FakeWatchdog(100, [150, 120, 90])
+    watchdog.add_shedder(lambda: calls.append("cache"))
+    watchdog.add_shedder(lambda: calls.append("summaries"))
+    watchdog.add_shedder(lambda: calls.append("unused"))
+    watchdog.enforce()
+    assert calls == ["cache", "summaries"]
+    assert watchdog.sheds == 2 and watchdog.peak == 150
+
+
+def test_watchdog_raises_when_shedding_is_not_enough():
+    watchdog = FakeWatchdog(100, [150, 140])
+    watchdog.add_shedder(lambda: None)
+    with pytest.raises(MemoryCeilingExceeded):
+        watchdog.enforce()
+    with pytest.raises(ValueError):
+        MemoryWatchdog(100, "swap")
+
+
+def test_memory_limit_sheds_the_report_cache(tmp_path):
+    pipeline = StreamingPipeline(memory_limit=1)
+    pipeline.watchdog = FakeWatchdog(100, [150, 150, 90])
+    pipeline.watchdog.add_shedder(pipeline.clear_cache)
+    pipeline.watchdog.add_shedder(pipeline._enable_summaries)
+    [result] = pipeline.run([write(tmp_path / "a.py", SOURCE)])
+    assert not pipeline._cache
+    assert pipeline.summarize
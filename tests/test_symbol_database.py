@@ -0,0 +1,59 @@
+import os
+
+from Frontend.symbol_database import SymbolDatabase
+
+
+def write(root, name, text):
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def project(tmp_path):
+    write(tmp_path, "util.py", "def grow(xs):\n    return len(xs)\n")
+    write(tmp_path, "mid.py", "from util import grow\n\ndef add(xs):\n    return grow(xs)\n")
+    write(tmp_path, "top.py", "from mid import add\n\ndef run(xs):\n    return add(xs)\n")
+    write(tmp_path, "other.py", "def alone():\n    return 1\n")
+    db = SymbolDatabase()
+    assert sorted(db.update_project(str(tmp_path))) == ["mid", "other", "top", "util"]
+    return db
+
+
+def test_unchanged_files_are_not_reanalyzed(tmp_path):
+    db = project(tmp_path)
+    assert db.update_project(str(tmp_path)) == []
+    # A new mtime with the same content is not a change either
+    path = tmp_path / "util.py"
+    os.utime(path, (1, 1))
+    assert db.update_project(str(tmp_path)) == []
+
+
+def test_changes_propagate_to_importers(tmp_path):
+    db = project(tmp_path)
+    assert db.lookup_function("top", "run").modifies_params == set()
+
+    write(tmp_path, "util.py", "def grow(xs):\n    xs.append(1)\n    return len(xs)\n")
+    os.utime(tmp_path / "util.py", (2, 2))
+    assert db.update_project(str(tmp_path)) == ["util", "mid", "top"]
+    assert db.lookup_function("mid", "add").modifies_params == {"xs"}
+    assert db.lookup_function("top", "run").modifies_params == {"xs"}
+
+
+def test_removed_module_invalidates_importers(tmp_path):
+    db = project(tmp_path)
+    os.remove(tmp_path / "util.py")
+    assert db.update_project(str(tmp_path)) == ["util", "mid", "top"]
+    assert db.lookup_function("util", "grow") is None
+    assert db.module_for_path(str(tmp_path / "util.py")) is None
+    assert db.importers_of("util") == {"mid"}
+
+
+def test_close_keeps_the_index(tmp_path):
+    db_path = str(tmp_path / "index.sqlite")
+    db = SymbolDatabase(db_path)
+    write(tmp_path / "src", "m.py", "def f():\n    return 1\n")
+    db.update_file(str(tmp_path / "src" / "m.py"), str(tmp_path / "src"))
+    db.close()
+    reopened = SymbolDatabase(db_path)
+    assert reopened.lookup_function("m", "f") is not None